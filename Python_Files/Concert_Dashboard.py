@@ -3,9 +3,31 @@ import pandas as pd
 import plotly.express as px # type: ignore
 import plotly.graph_objects as go  # type: ignore
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from scipy.cluster.hierarchy import linkage
+from result_cache import disk_cached, file_fingerprint
+from artist_store import ArtistStore
+from chart_ingest import ChartIngestWorker
+from momentum import MomentumIndex
+from snapshot_diff import diff_snapshots, summarize, top_movers
+from artist_search import ArtistSearchIndex
+from leaderboard import LeaderboardPager, SORTABLE_COLUMNS
+from song_catalog import SongCatalog
+from setlist import plan_show
+from collab_graph import CollaborationGraph
+from fee_index import FeeIndex
+from normalization import ScoreNormalizer
+from formula import FormulaError, rank_by_formula
+from bootstrap import bootstrap_scores
+from audience_overlap import LISTENERS_PATH, load_or_build
+from distinct_counts import EVENTS_PATH, load_or_build as load_or_build_segment_counts
+from attendance_simulator import ARENA_CAPACITY, TICKET_PRICE, expected_demand, simulate_lineups
+from ticket_pricing import SEATING_TIERS, artist_fee_table, price_lineups
+from data_bundle import read_spotify_features, build_genre_index, cached_similarity_index, cached_similarity_layout
+from decision_matrix import DECISION_CRITERIA, build_decision_matrix
+from timeline import load_milestones, milestones_for, timeline_figure
+from album_sales import AlbumSales
+from sklearn.neighbors import NearestNeighbors
 
 # Set page configuration
 st.set_page_config(
@@ -52,33 +74,6 @@ st.markdown("""Early October 2025: Bridging the gap between Gracie Abrams' 'The
 # Function to load data
 @st.cache_data
 def load_data():
-    # Songs data
-    sabrina_songs_data = {
-        'song_title': ['Espresso', 'Please Please Please', 'Feather', 'Nonsense', 'Skin', 
-                      'Because I Liked A Boy', 'Emails I Can\'t Send', 'Fast Times', 'Read Your Mind', 'Vicious'],
-        'streams': [1200000000, 750000000, 650000000, 900000000, 450000000, 
-                   350000000, 550000000, 480000000, 320000000, 380000000],
-        'chart_position': [1, 3, 5, 2, 12, 18, 8, 15, 21, 16],
-        'release_year': [2023, 2023, 2023, 2022, 2021, 2022, 2022, 2022, 2023, 2022],
-        'album': ['Short n\' Sweet', 'Emails I Can\'t Send', 'Emails I Can\'t Send', 'Emails I Can\'t Send', 'Singular: Act I', 
-                 'Emails I Can\'t Send', 'Emails I Can\'t Send', 'Emails I Can\'t Send', 'Short n\' Sweet', 'Emails I Can\'t Send'],
-        'grammy_nominations': [1, 1, 0, 1, 0, 0, 1, 0, 0, 0]
-    }
-
-    gracie_songs_data = {
-        'song_title': ['I miss you, I\'m sorry', 'Risk', 'Block me out', 'Where do we go now?', 
-                    'Difficult', 'Feels Like', 'Close to you', 'Amelie', 'That Much', 'Right Now'],
-        'streams': [220000000, 185000000, 75000000, 130000000, 105000000, 
-                90000000, 65000000, 180000000, 48000000, 95000000],
-        'chart_position': [35, 25, 62, 45, 50, 
-                        55, 70, 30, 85, 52],
-        'release_year': [2020, 2021, 2023, 2022, 2023, 
-                        2020, 2021, 2023, 2020, 2022],
-        'album': ['minor', 'This Is What It Feels Like', 'Good Riddance', 'This Is What It Feels Like', 'Good Riddance',
-                'minor', 'This Is What It Feels Like', 'Good Riddance', 'minor', 'This Is What It Feels Like'],
-        'grammy_nominations': [0, 0, 0, 0, 0, 0, 0, 1, 0, 0]
-    }
-
     # Concert demographics data
     age_data = {
         'age_group': ['13-17', '18-24', '25-34', '35-44', '45-54', '55+'],
@@ -98,10 +93,184 @@ def load_data():
         'social_media_followers': [46100000, 5000000]
     }
     
-    return pd.DataFrame(sabrina_songs_data), pd.DataFrame(gracie_songs_data), pd.DataFrame(age_data), pd.DataFrame(artists_data)
+    # Music genre preference scores (0-100) by age group
+    music_prefs_data = {
+        'Age_Group': ['13-17', '18-24', '25-34', '35-44', '45-54', '55+'],
+        'Pop': [85, 78, 65, 52, 45, 30],
+        'Rock': [45, 50, 60, 70, 75, 65],
+        'Hip_Hop': [80, 75, 60, 45, 30, 15],
+        'Country': [30, 35, 40, 45, 55, 60],
+        'Electronic': [65, 70, 55, 35, 20, 10],
+        'Classical': [25, 30, 35, 40, 50, 65]
+    }
+    
+    return pd.DataFrame(age_data), pd.DataFrame(artists_data), pd.DataFrame(music_prefs_data)
 
 # Load data
-sabrina_songs_df, gracie_songs_df, age_df, artists_df = load_data()
+age_df, artists_df, music_prefs = load_data()
+
+# Expensive computations memoized in the disk cache, keyed on their inputs, so every dashboard process
+# and restart reuses one result
+cached_bootstrap_scores = disk_cached()(bootstrap_scores)
+cached_simulate_lineups = disk_cached()(simulate_lineups)
+
+# HyperLogLog distinct-attendee sketches per segment, persisted next to the result cache
+@st.cache_resource(max_entries=1)
+def load_segment_counts(source_hash):
+    return load_or_build_segment_counts()
+
+# Song catalog with precomputed top-N indexes for the hit-song views
+@st.cache_resource(max_entries=1)
+def load_song_catalog(path, source_hash):
+    return SongCatalog.from_csv(path)
+
+song_catalog = load_song_catalog('Python_Files/songs.csv', file_fingerprint('Python_Files/songs.csv'))
+
+# Sparse co-billing graph behind the sub performing artist views
+@st.cache_resource(max_entries=1)
+def load_collaboration_graph(path, source_hash):
+    return CollaborationGraph.from_csv(path)
+
+collab_graph = load_collaboration_graph('Python_Files/co_billings.csv', file_fingerprint('Python_Files/co_billings.csv'))
+
+# Sorted fee-range endpoints for budget queries over the supporting artist pool
+@st.cache_resource(max_entries=1)
+def load_fee_index(path, source_hash):
+    return FeeIndex.from_csv(path)
+
+fee_index = load_fee_index('Python_Files/supporting_artists.csv', file_fingerprint('Python_Files/supporting_artists.csv'))
+
+# Genre bitsets for headliner candidates and supporting artists
+@st.cache_resource(max_entries=1)
+def load_genre_index(path, source_hash, fee_source_hash):
+    return build_genre_index(fee_index, path)
+
+genre_index = load_genre_index('Python_Files/artist_genres.csv', file_fingerprint('Python_Files/artist_genres.csv'),
+                               file_fingerprint('Python_Files/supporting_artists.csv'))
+
+# Embedded store that the views query for their top-N and filtered rows
+@st.cache_resource
+def get_artist_store():
+    return ArtistStore()
+
+# Background worker folding chart files dropped into Python_Files/incoming into the store
+@st.cache_resource
+def start_chart_ingest():
+    worker = ChartIngestWorker(get_artist_store(), 'Python_Files/incoming')
+    worker.start()
+    return worker
+
+# Function to load Spotify music features data (similar to the KNN analysis in the notebook)
+@st.cache_data
+def load_spotify_features(source_hash):
+    try:
+        # Per-artist feature means, variances and track counts aggregated from the per-track file
+        return read_spotify_features('Python_Files/track_features.csv')
+        
+    except Exception as e:
+        st.error(f"Error loading Spotify features data: {e}")
+        return pd.DataFrame()  # Return empty frame on error
+
+artist_store = get_artist_store()
+artist_store.sync_scores('Python_Files/artist_scores.csv')
+# Synced before any view reads the store, so feature-only artists are searchable from the first run
+spotify_features = load_spotify_features(file_fingerprint('Python_Files/track_features.csv'))
+if not spotify_features.empty:
+    artist_store.sync_features(spotify_features)
+start_chart_ingest()
+
+# Current data version; cached views take it as an argument so they refresh after an ingest
+data_version = artist_store.data_version()
+
+# Prefix-sum index over the ingested daily chart history, rebuilt once per data version
+@st.cache_resource(max_entries=2)
+def load_momentum_index(data_version):
+    return MomentumIndex.from_entries(artist_store.chart_entries())
+
+# Ranking changes between the current and the previous data version
+@st.cache_data(max_entries=2)
+def load_ranking_diff(data_version):
+    previous = artist_store.score_snapshot()
+    if previous is None:
+        return None
+    return diff_snapshots(previous, artist_store.current_scores())
+
+# Prefix/trigram search index over every known artist name. sync_features does not bump the data
+# version, so the index is also keyed on the synced features source.
+@st.cache_resource(max_entries=2)
+def load_artist_search(data_version, features_source):
+    return ArtistSearchIndex(artist_store.artist_names())
+
+# Sort permutations for paging through the full leaderboard
+@st.cache_resource(max_entries=2)
+def load_leaderboard_pager(data_version):
+    return LeaderboardPager(artist_store.current_scores())
+
+# Bootstrap score and rank intervals over the daily chart history, per data version and setting.
+# Runs serially: a process pool started from inside the Streamlit server is not worth it for a few blocks.
+@st.cache_data(max_entries=4)
+def load_score_bootstrap(data_version, n_resamples, top_n):
+    entries = artist_store.chart_entries()
+    if entries.empty:
+        return None
+    return cached_bootstrap_scores(entries, n_resamples, top_n)
+
+FORMULA_SORTABLE_COLUMNS = ['formula_rank', 'formula_score', 'rank_change'] + SORTABLE_COLUMNS
+
+# Leaderboard re-ranked by an analyst's formula, cached per data version and formula
+@st.cache_resource(max_entries=8)
+def load_formula_pager(data_version, formula):
+    return LeaderboardPager(rank_by_formula(artist_store.current_scores(), formula), FORMULA_SORTABLE_COLUMNS)
+
+# Nearest neighbours in normalized score space over the full scored universe
+@st.cache_resource(max_entries=2)
+def load_score_neighbors(data_version):
+    scores = artist_store.current_scores()
+    neighbors = NearestNeighbors(n_neighbors=min(11, len(scores)))
+    neighbors.fit(scores[['frequency_normalized', 'rank_sum_normalized']].values)
+    return scores, neighbors
+
+# Single-pass statistics over the scored universe for re-scaling score columns
+@st.cache_resource(max_entries=2)
+def load_score_normalizer(data_version):
+    columns = ['ranking_score', 'frequency', 'rank_sum']
+    return ScoreNormalizer.fit(artist_store.iter_scores(columns), columns)
+
+# Current scores of the decision-matrix candidates
+@st.cache_data(max_entries=2)
+def load_candidate_scores(data_version):
+    return artist_store.artist_scores(DECISION_CRITERIA['Artist'])
+
+# Acts of (name, acts) lineup tuples, as a sorted hashable tuple
+def lineup_artists(lineups):
+    return tuple(sorted({artist for _, acts in lineups for artist in acts}))
+
+# Chart popularity (ranking_score min-max scaled over the scored universe) and genres of lineup acts
+@st.cache_data(max_entries=8)
+def load_lineup_inputs(data_version, artists):
+    chart_scores = artist_store.artist_scores(list(artists))
+    popularity = dict(zip(chart_scores['artists'], load_score_normalizer(data_version).normalize(
+        'ranking_score', chart_scores['ranking_score'], 'min_max')))
+    artist_genres = {artist: genre_index.genres_of(artist) for artist in artists if artist in genre_index}
+    return popularity, artist_genres
+
+# Attendance and gross per lineup; lineups are passed as hashable (name, acts) tuples.
+# Runs serially: 200k scenarios take about half a second, less than starting a process pool.
+@st.cache_data(max_entries=8)
+def run_attendance_simulation(lineups, popularity, artist_genres, age_df, music_prefs, capacity, ticket_price,
+                              n_scenarios):
+    return cached_simulate_lineups(dict((name, list(acts)) for name, acts in lineups), popularity, artist_genres,
+                                   age_df, music_prefs, capacity=capacity, ticket_price=ticket_price,
+                                   n_scenarios=n_scenarios)
+
+# Revenue-maximizing tier prices and net margin per lineup, from the same demand model as the simulator
+@st.cache_data(max_entries=8)
+def run_ticket_pricing(lineups, popularity, artist_genres, age_df, music_prefs, fees, capacity):
+    expected = expected_demand([list(acts) for _, acts in lineups], popularity, artist_genres, age_df, music_prefs)
+    return price_lineups(dict((name, list(acts)) for name, acts in lineups), expected, music_prefs, fees,
+                         capacity=capacity)
+
+SCALING_OPTIONS = {'Min-max': 'min_max', 'Rank percentile': 'rank_percentile', 'Robust (median/IQR)': 'robust'}
 
 # Create tabs for different sections
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
@@ -120,7 +289,7 @@ with tab1:
     # Create a dropdown to select which visualization to display
     viz_option = st.selectbox(
         "Select Visualization:",
-        ["Age Distribution", "DC Area Universities", "Music Genre Preferences"],
+        ["Age Distribution", "DC Area Universities", "Music Genre Preferences", "Distinct Fan Counts"],
         index=0
     )
     
@@ -313,6 +482,9 @@ with tab1:
             # Total student count
             total_students = dc_universities['Students'].sum()
             gen_z_students = int(sum(dc_universities['Students'] * dc_universities['Gen_Z_Percentage'] / 100))
+            # Deduplicated students seen at our events, from the campus sketches
+            segment_counts = load_segment_counts(file_fingerprint(EVENTS_PATH))
+            student_attendees = segment_counts.count({'campus': segment_counts.values('campus')})
             
             # Create stats visualization
             fig_stats = go.Figure()
@@ -332,8 +504,16 @@ with tab1:
                 domain = {'row': 0, 'column': 1}
             ))
             
+            fig_stats.add_trace(go.Indicator(
+                mode = "number",
+                value = student_attendees,
+                number = {'valueformat': ',.0f'},
+                title = {"text": "Distinct Student Attendees"},
+                domain = {'row': 0, 'column': 2}
+            ))
+            
             fig_stats.update_layout(
-                grid = {'rows': 1, 'columns': 2, 'pattern': "independent"},
+                grid = {'rows': 1, 'columns': 3, 'pattern': "independent"},
                 height = 200
             )
             
@@ -353,17 +533,6 @@ with tab1:
     elif viz_option == "Music Genre Preferences":
         st.subheader("Music Genre Preferences by Age Group")
         
-        # Sample data for music preferences
-        music_prefs = pd.DataFrame({
-            'Age_Group': ['13-17', '18-24', '25-34', '35-44', '45-54', '55+'],
-            'Pop': [85, 78, 65, 52, 45, 30],
-            'Rock': [45, 50, 60, 70, 75, 65],
-            'Hip_Hop': [80, 75, 60, 45, 30, 15],
-            'Country': [30, 35, 40, 45, 55, 60],
-            'Electronic': [65, 70, 55, 35, 20, 10],
-            'Classical': [25, 30, 35, 40, 50, 65]
-        })
-        
         # Add tabs for different music preference visualizations
         music_tabs = st.tabs(["Gen Z Focus", "All Age Groups", "Trend Analysis"])
         
@@ -480,36 +649,81 @@ with tab1:
             decision to feature her as the headliner.</p>
         </div>
         """, unsafe_allow_html=True)
+    
+    # Display deduplicated attendee counts per segment, estimated from HyperLogLog sketches
+    elif viz_option == "Distinct Fan Counts":
+        st.subheader("Distinct Fans by Segment")
+        
+        segment_counts = load_segment_counts(file_fingerprint(EVENTS_PATH))
+        st.metric(
+            "Distinct Attendees in Event Logs",
+            f"{segment_counts.count():,.0f}",
+            delta=f"± {segment_counts.relative_error():.1%} (one standard error)",
+            delta_color="off"
+        )
+        
+        segment_labels = {'age_group': 'Age Group', 'campus': 'Campus', 'genre': 'Genre Preference'}
+        segment_tabs = st.tabs(list(segment_labels.values()))
+        for segment_tab, dimension in zip(segment_tabs, segment_labels):
+            with segment_tab:
+                segment_df = segment_counts.breakdown(dimension)
+                if dimension == 'age_group':
+                    segment_df = segment_df.sort_values(dimension)
+                fig_segment = px.bar(
+                    segment_df,
+                    x=dimension,
+                    y='distinct_attendees',
+                    color='distinct_attendees',
+                    color_continuous_scale='Agsunset',
+                    labels={dimension: segment_labels[dimension], 'distinct_attendees': 'Distinct Attendees'},
+                    title=f"Distinct Attendees by {segment_labels[dimension]}",
+                    height=450
+                )
+                fig_segment.update_traces(texttemplate='%{y:,.0f}', textposition='outside')
+                fig_segment.update_layout(coloraxis_showscale=False, xaxis_tickangle=-30)
+                st.plotly_chart(fig_segment, use_container_width=True)
+        
+        # Any union of segments is estimated by merging their sketches
+        st.markdown("### Segment Union")
+        union_selections = {}
+        union_cols = st.columns(3)
+        for union_col, dimension in zip(union_cols, segment_labels):
+            with union_col:
+                union_selections[dimension] = st.multiselect(
+                    f"{segment_labels[dimension]}:",
+                    sorted(segment_counts.values(dimension)),
+                    default=['18-24'] if dimension == 'age_group' else [],
+                    key=f"union_{dimension}"
+                )
+        st.metric("Distinct Attendees in Any Selected Segment", f"{segment_counts.count(union_selections):,.0f}")
+        
+        st.markdown("""
+        <div class="insight-card">
+            <p>Counts are deduplicated: an attendee who came to several events, or who belongs to several
+            selected segments, is counted once. Each segment keeps a fixed-size HyperLogLog sketch, so any
+            combination of segments is estimated without rescanning the raw event logs.</p>
+        </div>
+        """, unsafe_allow_html=True)
 
 # Tab 2: Artist Selection Process
 with tab2:
     st.markdown("<div class='section-header'>Artist Selection Process</div>", unsafe_allow_html=True)
     
-    # Load artist data
-    @st.cache_data
-    def load_artist_data():
-        df = pd.read_csv('Python_Files/artist_scores.csv')
-        # Ensure proper data types
-        df['frequency'] = df['frequency'].astype(int)
-        df['ranking_score'] = df['ranking_score'].astype(float)
-        df['rank_sum'] = df['rank_sum'].astype(float)
-        return df
-    
-    artist_df = load_artist_data()
-    
     # Create a dropdown to select which visualization to display
     artist_viz_option = st.selectbox(
         "Select Artist Analysis View:",
-        ["Ranking Overview", "Artist Comparison", "Selection Criteria", "Final Decision Matrix"],
+        ["Ranking Overview", "Artist Comparison", "Selection Criteria", "Final Decision Matrix", "Artist Search", "Full Leaderboard",
+         "Attendance Simulator", "Ticket Pricing"],
         index=0
     )
     
     # Display the Ranking Overview visualization
     if artist_viz_option == "Ranking Overview":
         st.subheader("Top 20 Artists by Ranking Score")
+        st.caption(f"Leaderboard data version {data_version}")
         
-        # Filter to top 20 artists
-        top_artists = artist_df.sort_values('ranking_score', ascending=False).head(20).copy()
+        # Query the top 20 artists from the store
+        top_artists = artist_store.top_artists(20)
         
         # Create columns for explanation and chart
         col1, col2 = st.columns([1, 3])
@@ -569,12 +783,115 @@ with tab2:
             
             st.plotly_chart(fig, use_container_width=True)
             
+            # How stable the scores and ranks are when the chart days are resampled
+            st.markdown("### Score Stability")
+            stability_col1, stability_col2 = st.columns(2)
+            with stability_col1:
+                n_resamples = st.select_slider("Bootstrap Resamples:", options=[500, 1000, 2000, 5000], value=2000,
+                                               key="bootstrap_resamples")
+            with stability_col2:
+                stability_top_n = st.slider("Artists:", min_value=5, max_value=20, value=10, key="bootstrap_top_n")
+            bootstrap_result = load_score_bootstrap(data_version, n_resamples, stability_top_n)
+            
+            if bootstrap_result is None:
+                st.info("No daily chart history has been ingested yet. Drop daily chart CSVs (date, position, artists) "
+                        "into Python_Files/incoming to estimate score intervals.")
+            else:
+                stability_df, lead = bootstrap_result
+                if lead is not None:
+                    st.metric(
+                        label=f"{lead['leader']}'s Lead over {lead['runner_up']} (95% interval)",
+                        value=f"{lead['lead_pct']:.1f}%",
+                        delta=f"{lead['lead_low']:.1f}% to {lead['lead_high']:.1f}%, "
+                              f"ahead in {lead['lead_positive_share']:.0%} of resamples",
+                        delta_color="off"
+                    )
+                
+                fig_stability = go.Figure(go.Bar(
+                    y=stability_df['artists'],
+                    x=stability_df['ranking_score'],
+                    orientation='h',
+                    marker_color='#FF78C4',
+                    error_x=dict(
+                        type='data',
+                        symmetric=False,
+                        array=stability_df['score_high'] - stability_df['ranking_score'],
+                        arrayminus=stability_df['ranking_score'] - stability_df['score_low']
+                    ),
+                    customdata=stability_df[['score_low', 'score_high', 'rank_low', 'rank_high']].to_numpy(),
+                    hovertemplate="%{y}<br>Score: %{x:.1f} (%{customdata[0]:.1f}-%{customdata[1]:.1f})"
+                                  "<br>Rank range: %{customdata[2]}-%{customdata[3]}<extra></extra>"
+                ))
+                fig_stability.update_layout(
+                    title=f'Ranking Score with 95% Bootstrap Intervals ({n_resamples:,} chart-day resamples)',
+                    xaxis_title="Ranking Score (ingested chart history)",
+                    yaxis=dict(autorange='reversed'),
+                    height=max(350, 30 * len(stability_df))
+                )
+                st.plotly_chart(fig_stability, use_container_width=True)
+                
+                st.dataframe(
+                    stability_df.assign(
+                        score_interval=stability_df['score_low'].map('{:.1f}'.format) + " - "
+                                       + stability_df['score_high'].map('{:.1f}'.format),
+                        rank_interval=stability_df['rank_low'].astype(str) + " - " + stability_df['rank_high'].astype(str)
+                    )[['artists', 'ranking_score', 'score_interval', 'rank', 'rank_interval', 'top_rank_share']].rename(columns={
+                        'artists': 'Artist', 'ranking_score': 'Ranking Score', 'score_interval': '95% Score Interval',
+                        'rank': 'Rank', 'rank_interval': '95% Rank Interval', 'top_rank_share': 'Share of Resamples at #1'
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            # Show who moved since the previous data version
+            st.markdown("### Movers Since Previous Data Version")
+            ranking_diff = load_ranking_diff(data_version)
+            
+            if ranking_diff is None:
+                st.info("No earlier data version to compare against yet.")
+            else:
+                diff_counts = summarize(ranking_diff)
+                
+                metric1, metric2, metric3, metric4 = st.columns(4)
+                with metric1:
+                    st.metric("Moved Up", diff_counts['up'])
+                with metric2:
+                    st.metric("Moved Down", diff_counts['down'])
+                with metric3:
+                    st.metric("New Entries", diff_counts['new'])
+                with metric4:
+                    st.metric("Dropouts", diff_counts['dropped'])
+                
+                movers_df = top_movers(ranking_diff, n=15, within_rank=50)
+                
+                fig_movers = px.bar(
+                    movers_df,
+                    y='artists',
+                    x='rank_delta',
+                    color='status',
+                    color_discrete_map={'up': '#8eb535', 'down': '#FF78C4'},
+                    hover_data=['old_rank', 'new_rank', 'score_delta'],
+                    labels={'artists': 'Artist', 'rank_delta': 'Rank Change (positions)', 'status': 'Direction',
+                            'old_rank': 'Previous Rank', 'new_rank': 'Current Rank', 'score_delta': 'Score Change'},
+                    title='Biggest Rank Movers in the Top 50',
+                    orientation='h',
+                    height=500
+                )
+                
+                fig_movers.update_layout(yaxis={'categoryorder': 'total ascending'})
+                
+                st.plotly_chart(fig_movers, use_container_width=True)
+                
+                new_entries = ranking_diff[ranking_diff['status'] == 'new'].head(10)
+                if not new_entries.empty:
+                    st.write("New entries: " + ", ".join(new_entries['artists']))
+            
     # Display the Artist Comparison visualization
     elif artist_viz_option == "Artist Comparison":
         st.subheader("Comparative Analysis of Top 10 Artists")
         
-        # Filter to top 10 artists for comparison
-        top10_artists = artist_df.sort_values('ranking_score', ascending=False).head(10).copy()
+        # Query the top 10 artists from the store for comparison
+        top10_artists = artist_store.top_artists(10)
         
         # Create tabs for different comparison views
         comparison_tabs = st.tabs(["Score Breakdown", "Frequency vs. Rank", "Normalized Metrics"])
@@ -657,8 +974,12 @@ with tab2:
             st.plotly_chart(fig_scatter, use_container_width=True)
             
         with comparison_tabs[2]:
+            # Re-scale against the whole scored universe with the selected method
+            radar_scaling = st.selectbox("Scaling", list(SCALING_OPTIONS), key="radar_scaling")
+            radar_data = load_score_normalizer(data_version).transform(top10_artists, SCALING_OPTIONS[radar_scaling])
+
             # Create a normalized metrics radar chart
-            radar_data = top10_artists[['artists', 'frequency_normalized', 'rank_sum_normalized']].copy()
+            radar_data = radar_data[['artists', 'frequency_normalized', 'rank_sum_normalized']].copy()
             radar_data = pd.melt(
                 radar_data,
                 id_vars=['artists'],
@@ -732,9 +1053,9 @@ with tab2:
             
             # Add a simple genre match visualization
             genre_match = pd.DataFrame({
-                'Artist': ['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Zach Bryan', 'Morgan Wallen'],
-                'Genre_Match': [95, 90, 85, 60, 55]
+                'Artist': ['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Zach Bryan', 'Morgan Wallen']
             })
+            genre_match['Genre_Match'] = genre_index.target_match(genre_match['Artist'])
             
             fig_genre = px.bar(
                 genre_match,
@@ -759,7 +1080,7 @@ with tab2:
             selection_data = pd.DataFrame({
                 'Artist': ['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Billie Eilish', 'Zach Bryan'],
                 'Chart_Performance': [95, 90, 75, 70, 65],
-                'Genre_Match': [95, 90, 85, 80, 60],
+                'Genre_Match': genre_index.target_match(['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Billie Eilish', 'Zach Bryan']),
                 'Age_Demo_Match': [90, 85, 90, 85, 70],
                 'Social_Media': [95, 90, 85, 90, 70],
                 'Current_Momentum': [98, 85, 90, 75, 80]
@@ -807,41 +1128,51 @@ with tab2:
                 scores above 90 in all categories.</p>
             </div>
             """, unsafe_allow_html=True)
+        
+        # Current momentum computed from the daily chart history
+        st.markdown("### Current Momentum")
+        momentum_index = load_momentum_index(data_version)
+        
+        if momentum_index is None:
+            st.info("No daily chart history has been ingested yet. Drop daily chart CSVs (date, position, artists) "
+                    "into Python_Files/incoming to enable momentum scores.")
+        else:
+            window_days = st.select_slider(
+                "Momentum Window (days):",
+                options=[7, 14, 30, 60, 90, 180, 365],
+                value=30,
+                key="momentum_window"
+            )
+            
+            momentum_df = momentum_index.momentum(days=window_days).head(20)
+            
+            fig_momentum = px.bar(
+                momentum_df,
+                y='artists',
+                x='ranking_score',
+                color='score_change',
+                color_continuous_scale='Agsunset',
+                hover_data=['frequency', 'rank_sum', 'previous_rank'],
+                labels={'artists': 'Artist', 'ranking_score': 'Window Ranking Score',
+                        'score_change': 'Change vs. Previous Window', 'previous_rank': 'Previous Rank'},
+                title=f"Top 20 Artists over the Last {window_days} Days "
+                      f"(through {momentum_index.end_date:%Y-%m-%d})",
+                height=600
+            )
+            
+            fig_momentum.update_layout(yaxis={'categoryorder': 'total ascending'})
+            
+            st.plotly_chart(fig_momentum, use_container_width=True)
     
     # Display the Final Decision Matrix visualization
     elif artist_viz_option == "Final Decision Matrix":
         st.subheader("Headliner Selection Decision Matrix")
         
-        # Create a dataframe for the final decision matrix
-        decision_matrix = pd.DataFrame({
-            'Artist': ['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Billie Eilish', 'Zach Bryan'],
-            'Ranking_Score': [814.86, 719.34, 565.93, 489.15, 547.12],
-            'Genre_Match': [95, 90, 85, 80, 60],
-            'Target_Demo_Match': [95, 85, 90, 90, 70],
-            'Tour_Availability': [90, 60, 85, 70, 80],
-            'Cost_Effectiveness': [85, 50, 90, 75, 80],
-            'Social_Engagement': [95, 90, 85, 90, 75]
-        })
-        
-        # Calculate weighted scores
-        weights = {
-            'Ranking_Score': 0.3,
-            'Genre_Match': 0.2,
-            'Target_Demo_Match': 0.2,
-            'Tour_Availability': 0.1,
-            'Cost_Effectiveness': 0.1,
-            'Social_Engagement': 0.1
-        }
-        
-        # Normalize ranking score to 0-100 scale for fair comparison
-        max_score = decision_matrix['Ranking_Score'].max()
-        decision_matrix['Ranking_Score'] = decision_matrix['Ranking_Score'] / max_score * 100
-        
-        # Calculate weighted total
-        for column, weight in weights.items():
-            decision_matrix[f'{column}_weighted'] = decision_matrix[column] * weight
-        
-        decision_matrix['Total_Score'] = sum(decision_matrix[f'{column}_weighted'] for column in weights.keys())
+        # Create the final decision matrix with weighted criteria and totals
+        matrix_scaling = st.selectbox("Chart performance scaling", list(SCALING_OPTIONS), key="matrix_scaling")
+        decision_matrix = build_decision_matrix(genre_index, load_score_normalizer(data_version),
+                                                SCALING_OPTIONS[matrix_scaling],
+                                                scores=load_candidate_scores(data_version))
         
         # Create columns for visualization and explanation
         col1, col2 = st.columns([3, 1])
@@ -957,6 +1288,348 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
             
+    # Display the Artist Search view
+    elif artist_viz_option == "Artist Search":
+        st.subheader("Search the Full Artist Universe")
+        
+        search_index = load_artist_search(data_version, artist_store.get_meta('source:spotify_features'))
+        search_query = st.text_input(
+            f"Search {len(search_index):,} artists by name (typos are fine):",
+            key="artist_search_query"
+        )
+        
+        if search_query:
+            matches = search_index.search(search_query, limit=10)
+            
+            if not matches:
+                st.warning(f"No artists match '{search_query}'.")
+            else:
+                selected_artist = st.selectbox(
+                    "Matching Artists:",
+                    [name for name, _ in matches],
+                    key="artist_search_match"
+                )
+                selected_scores = artist_store.artist_scores([selected_artist])
+                
+                if selected_scores.empty:
+                    st.info(f"{selected_artist} has Spotify features but no chart appearances in the ranking data.")
+                else:
+                    selected_row = selected_scores.iloc[0]
+                    
+                    # Score breakdown
+                    metric1, metric2, metric3, metric4 = st.columns(4)
+                    with metric1:
+                        st.metric("Rank", f"#{selected_row['rank']:.0f}")
+                    with metric2:
+                        st.metric("Ranking Score", f"{selected_row['ranking_score']:.2f}")
+                    with metric3:
+                        st.metric("Frequency", f"{selected_row['frequency']:,}")
+                    with metric4:
+                        st.metric("Rank Sum", f"{selected_row['rank_sum']:.2f}")
+                    
+                    # Nearest neighbours in normalized score space
+                    all_scores, score_neighbors = load_score_neighbors(data_version)
+                    distances, indices = score_neighbors.kneighbors(
+                        selected_scores[['frequency_normalized', 'rank_sum_normalized']].values
+                    )
+                    neighbours_df = all_scores.iloc[indices[0]].copy()
+                    neighbours_df['distance'] = distances[0]
+                    neighbours_df = neighbours_df[neighbours_df['artists'] != selected_artist]
+                    
+                    fig_neighbours = px.scatter(
+                        pd.concat([selected_scores.assign(role='Selected'), neighbours_df.assign(role='Nearest Neighbour')]),
+                        x='frequency_normalized',
+                        y='rank_sum_normalized',
+                        color='role',
+                        text='artists',
+                        color_discrete_map={'Selected': '#FF78C4', 'Nearest Neighbour': '#9D76C1'},
+                        labels={'frequency_normalized': 'Normalized Frequency', 'rank_sum_normalized': 'Normalized Rank Sum',
+                                'role': ''},
+                        title=f"Artists with the Closest Score Profile to {selected_artist}",
+                        height=500
+                    )
+                    fig_neighbours.update_traces(textposition='top center')
+                    
+                    st.plotly_chart(fig_neighbours, use_container_width=True)
+                    
+                    st.dataframe(
+                        neighbours_df[['artists', 'rank', 'ranking_score', 'frequency', 'rank_sum', 'distance']],
+                        use_container_width=True,
+                        hide_index=True
+                    )
+    
+    # Display the Full Leaderboard view, paged server-side
+    elif artist_viz_option == "Full Leaderboard":
+        st.subheader("Full Artist Leaderboard")
+        
+        pager = load_leaderboard_pager(data_version)
+        sortable_columns = SORTABLE_COLUMNS
+        column_labels = {
+            'rank': 'Rank', 'ranking_score': 'Ranking Score', 'frequency': 'Frequency', 'rank_sum': 'Rank Sum',
+            'frequency_normalized': 'Frequency Normalized', 'rank_sum_normalized': 'Rank Sum Normalized',
+            'artists': 'Artist', 'formula_rank': 'Formula Rank', 'formula_score': 'Formula Score',
+            'rank_change': 'Rank Change'
+        }
+        
+        # Optional re-ranking by an analyst-defined formula over the score columns
+        formula = st.text_input(
+            "Ranking Formula (optional):",
+            placeholder="0.6*frequency_normalized + 0.4*rank_sum_normalized",
+            help="Arithmetic over frequency, rank_sum, ranking_score, rank, frequency_normalized and "
+                 "rank_sum_normalized, with abs, sqrt, log, log1p, exp, min and max.",
+            key="leaderboard_formula"
+        ).strip()
+        if formula:
+            try:
+                pager = load_formula_pager(data_version, formula)
+                sortable_columns = FORMULA_SORTABLE_COLUMNS
+            except FormulaError as e:
+                st.error(f"Could not use this formula: {e}")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_by = st.selectbox("Sort By:", sortable_columns, format_func=column_labels.get,
+                                   key=f"leaderboard_sort_{len(sortable_columns)}")
+            ascending = st.toggle("Ascending", value=(sort_by in ['rank', 'artists', 'formula_rank']),
+                                  key=f"leaderboard_ascending_{sort_by}")
+        with col2:
+            filter_column = st.selectbox(
+                "Filter Column:",
+                [None] + [column for column in sortable_columns if column != 'artists'],
+                format_func=lambda column: "No Filter" if column is None else column_labels[column],
+                key=f"leaderboard_filter_{len(sortable_columns)}"
+            )
+            low = high = None
+            if filter_column is not None:
+                min_value, max_value = pager.value_range(filter_column)
+                if min_value is not None and min_value < max_value:
+                    low, high = st.slider(
+                        f"{column_labels[filter_column]} Range:",
+                        min_value=float(min_value),
+                        max_value=float(max_value),
+                        value=(float(min_value), float(max_value)),
+                        key=f"leaderboard_range_{filter_column}"
+                    )
+                else:
+                    # A single value leaves nothing to filter on (and a slider needs min < max)
+                    if min_value is None:
+                        st.caption(f"No artist has a {column_labels[filter_column]}")
+                    else:
+                        st.caption(f"Every artist has {column_labels[filter_column]} = {float(min_value):g}")
+                    filter_column = None
+        with col3:
+            page_size = st.selectbox("Rows per Page:", [25, 50, 100], index=1, key="leaderboard_page_size")
+            _, matching_rows = pager.page(0, 1, sort_by, ascending, filter_column, low, high)
+            page_count = max(1, -(-matching_rows // page_size))
+            # A narrower filter can leave the remembered page past the last one
+            if st.session_state.get("leaderboard_page", 1) > page_count:
+                st.session_state["leaderboard_page"] = page_count
+            page_number = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count,
+                                          key="leaderboard_page")
+        
+        page_df, matching_rows = pager.page(page_number - 1, page_size, sort_by, ascending, filter_column, low, high)
+        first_row = (page_number - 1) * page_size + 1
+        st.caption(f"Rows {first_row:,}-{first_row + len(page_df) - 1:,} of {matching_rows:,} matching "
+                   f"({len(pager):,} artists in total)")
+        
+        st.dataframe(
+            page_df[sortable_columns[-1:] + sortable_columns[:-1]].rename(columns=column_labels),
+            use_container_width=True,
+            hide_index=True,
+            height=min(38 + 35 * len(page_df), 900)
+        )
+    
+    # Display Monte Carlo attendance and gross projections for candidate lineups
+    elif artist_viz_option == "Attendance Simulator":
+        st.subheader("Projected Attendance and Gross by Lineup")
+        
+        sim_col1, sim_col2 = st.columns(2)
+        with sim_col1:
+            sim_headliners = st.multiselect("Headliners to Compare:", DECISION_CRITERIA['Artist'],
+                                            default=DECISION_CRITERIA['Artist'][:3], key="sim_headliners")
+            support_options = ["No support act", "Gracie Abrams"] + [
+                artist for artist in fee_index.artists['artist'] if artist != "Gracie Abrams"]
+            sim_support = st.selectbox("Support Act:", support_options, index=1, key="sim_support")
+        with sim_col2:
+            sim_capacity = st.number_input("Venue Capacity:", min_value=1000, max_value=100000, value=ARENA_CAPACITY,
+                                           step=500, key="sim_capacity")
+            sim_price = st.slider("Average Ticket Price ($):", min_value=50, max_value=400, value=int(TICKET_PRICE),
+                                  step=10, key="sim_price")
+            sim_scenarios = st.select_slider("Scenarios:", options=[10_000, 50_000, 100_000, 200_000], value=100_000,
+                                             format_func="{:,}".format, key="sim_scenarios")
+        
+        if not sim_headliners:
+            st.info("Select at least one headliner to simulate.")
+        else:
+            support = [] if sim_support == "No support act" else [sim_support]
+            sim_lineups = tuple(
+                (" + ".join([headliner] + support), tuple([headliner] + support)) for headliner in sim_headliners
+            )
+            sim_popularity, sim_genres = load_lineup_inputs(data_version, lineup_artists(sim_lineups))
+            sim_summary, sim_attendance, sim_gross = run_attendance_simulation(
+                sim_lineups, sim_popularity, sim_genres, age_df, music_prefs,
+                int(sim_capacity), float(sim_price), int(sim_scenarios))
+            
+            # Attendance distributions on shared bins, one line per lineup
+            bins = np.linspace(0, sim_capacity, 41)
+            fig_attendance = go.Figure()
+            for i, lineup_name in enumerate(sim_summary['lineup']):
+                counts, _ = np.histogram(sim_attendance[:, i], bins=bins)
+                fig_attendance.add_trace(go.Scatter(
+                    x=(bins[:-1] + bins[1:]) / 2,
+                    y=counts / len(sim_attendance),
+                    mode='lines',
+                    line_shape='hvh',
+                    name=lineup_name
+                ))
+            fig_attendance.update_layout(
+                title=f"Attendance Distribution over {sim_scenarios:,} Scenarios (capacity {sim_capacity:,})",
+                xaxis_title="Attendance",
+                yaxis_title="Share of Scenarios",
+                yaxis_tickformat='.0%',
+                height=450
+            )
+            st.plotly_chart(fig_attendance, use_container_width=True)
+            
+            fig_gross = go.Figure(go.Bar(
+                x=sim_summary['lineup'],
+                y=sim_summary['gross_mean'],
+                marker_color='#FF78C4',
+                error_y=dict(
+                    type='data',
+                    symmetric=False,
+                    array=sim_summary['gross_p95'] - sim_summary['gross_mean'],
+                    arrayminus=sim_summary['gross_mean'] - sim_summary['gross_p5']
+                ),
+                hovertemplate="%{x}<br>Mean gross: $%{y:,.0f}<extra></extra>"
+            ))
+            fig_gross.update_layout(
+                title="Projected Gross (mean with 5th-95th percentile range)",
+                yaxis_title="Gross ($)",
+                height=400
+            )
+            st.plotly_chart(fig_gross, use_container_width=True)
+            
+            st.dataframe(
+                sim_summary.assign(
+                    attendance_range=sim_summary['attendance_p5'].map('{:,.0f}'.format) + " - "
+                                     + sim_summary['attendance_p95'].map('{:,.0f}'.format),
+                    gross_range=sim_summary['gross_p5'].map('${:,.0f}'.format) + " - "
+                                + sim_summary['gross_p95'].map('${:,.0f}'.format)
+                )[['lineup', 'expected_demand', 'attendance_mean', 'attendance_range', 'sellout_probability',
+                   'gross_mean', 'gross_range']].rename(columns={
+                    'lineup': 'Lineup', 'expected_demand': 'Expected Demand', 'attendance_mean': 'Mean Attendance',
+                    'attendance_range': 'Attendance (5th-95th pct)', 'sellout_probability': 'Sellout Probability',
+                    'gross_mean': 'Mean Gross ($)', 'gross_range': 'Gross (5th-95th pct)'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            st.markdown("""
+            <div class="info-card">
+                <p>Demand per age group combines the audience age mix, each age group's genre preferences and the
+                acts' chart popularity. Every scenario draws market-wide, per-age-group and ticket-price shocks,
+                and all lineups share the same draws, so differences between them come from the lineup itself.</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    elif artist_viz_option == "Ticket Pricing":
+        st.subheader("Revenue-Maximizing Ticket Prices by Seating Tier")
+        
+        pricing_col1, pricing_col2 = st.columns(2)
+        with pricing_col1:
+            pricing_headliners = st.multiselect("Headliners to Price:", DECISION_CRITERIA['Artist'],
+                                                default=DECISION_CRITERIA['Artist'][:3], key="pricing_headliners")
+        with pricing_col2:
+            pricing_support_options = ["No support act", "Gracie Abrams"] + [
+                artist for artist in fee_index.artists['artist'] if artist != "Gracie Abrams"]
+            pricing_support = st.selectbox("Support Act:", pricing_support_options, index=1, key="pricing_support")
+            pricing_capacity = st.number_input("Venue Capacity:", min_value=1000, max_value=100000,
+                                               value=ARENA_CAPACITY, step=500, key="pricing_capacity")
+        
+        if not pricing_headliners:
+            st.info("Select at least one headliner to price.")
+        else:
+            support = [] if pricing_support == "No support act" else [pricing_support]
+            pricing_lineups = tuple(
+                (" + ".join([headliner] + support), tuple([headliner] + support)) for headliner in pricing_headliners
+            )
+            pricing_popularity, pricing_genres = load_lineup_inputs(data_version, lineup_artists(pricing_lineups))
+            pricing_summary, pricing_tiers = run_ticket_pricing(
+                pricing_lineups, pricing_popularity, pricing_genres, age_df, music_prefs,
+                artist_fee_table(fee_index, lineup_artists(pricing_lineups)), int(pricing_capacity))
+            
+            fig_prices = px.bar(
+                pricing_tiers,
+                x='tier',
+                y='price',
+                color='lineup',
+                barmode='group',
+                category_orders={'tier': list(SEATING_TIERS)},
+                labels={'tier': 'Seating Tier', 'price': 'Optimal Price ($)', 'lineup': 'Lineup'},
+                title="Optimal Ticket Price per Seating Tier"
+            )
+            fig_prices.update_layout(height=400, yaxis_tickprefix='$')
+            st.plotly_chart(fig_prices, use_container_width=True)
+            
+            # Net margin range runs from the maximum to the minimum booking fee; unknown fees leave no bar
+            margin_known = pricing_summary['net_margin_high'].notna()
+            fig_margin = go.Figure(go.Bar(
+                x=pricing_summary['lineup'][margin_known],
+                y=pricing_summary['net_margin_high'][margin_known],
+                marker_color='#FF78C4',
+                error_y=dict(
+                    type='data',
+                    symmetric=False,
+                    array=np.zeros(int(margin_known.sum())),
+                    arrayminus=(pricing_summary['net_margin_high'] - pricing_summary['net_margin_low'])[margin_known]
+                ),
+                hovertemplate="%{x}<br>Net margin at minimum fee: $%{y:,.0f}<extra></extra>"
+            ))
+            fig_margin.update_layout(
+                title="Net Margin after Booking Fees (bar at minimum fee, whisker down to maximum fee)",
+                yaxis_title="Net Margin ($)",
+                height=400
+            )
+            st.plotly_chart(fig_margin, use_container_width=True)
+            
+            unknown_fees = pricing_summary['lineup'][~margin_known].tolist()
+            if unknown_fees:
+                st.caption(f"No booking fee on file for: {', '.join(unknown_fees)}")
+            
+            st.dataframe(
+                pricing_summary.assign(
+                    uplift=pricing_summary['expected_revenue'] / pricing_summary['reference_revenue'] - 1,
+                    fee_range=(pricing_summary['fee_min'].map('${:,.0f}'.format) + " - "
+                               + pricing_summary['fee_max'].map('${:,.0f}'.format)).where(margin_known, "Unknown")
+                )[['lineup', 'expected_tickets', 'expected_revenue', 'uplift', 'fee_range', 'net_margin_low',
+                   'net_margin_high']].rename(columns={
+                    'lineup': 'Lineup', 'expected_tickets': 'Expected Tickets', 'expected_revenue': 'Expected Revenue ($)',
+                    'uplift': 'Uplift vs Reference Prices', 'fee_range': 'Booking Fees',
+                    'net_margin_low': 'Net Margin Low ($)', 'net_margin_high': 'Net Margin High ($)'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.dataframe(
+                pricing_tiers.rename(columns={
+                    'lineup': 'Lineup', 'tier': 'Tier', 'seats': 'Seats', 'elasticity': 'Fitted Elasticity',
+                    'price': 'Price ($)', 'expected_sold': 'Expected Sold', 'sellout_probability': 'Sellout Probability',
+                    'expected_revenue': 'Expected Revenue ($)'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            st.markdown("""
+            <div class="info-card">
+                <p>Each seating tier gets a demand curve fitted from the age groups that want it, with younger fans
+                more price-sensitive. Prices for all tiers are searched together, keeping better tiers at least as
+                expensive, to maximize revenue expected over uncertain demand within each tier's seats.</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
     # Add a concluding section visible regardless of the visualization selected
     st.markdown("""
     <div class="conclusion-card" style="margin-top: 30px; padding: 20px; background-color: rgba(255, 120, 196, 0.1); border-radius: 10px; border-left: 5px solid #FF78C4;">
@@ -986,33 +1659,32 @@ with tab3:
         # Create a dropdown to select which visualization to display
         viz_option = st.selectbox(
             "Select Visualization:",
-            ["Cluster Analysis", "Artist Similarity Network"],
+            ["Cluster Analysis", "Artist Similarity Network", "Audience Overlap"],
             index=0
         )
         
+        # Cluster assignment, shared by all dashboard processes through the disk cache
+        @disk_cached()
+        def compute_artist_clusters(top_artists):
+            top_artists = top_artists.copy()
+            
+            # Assign clusters
+            top_artists['cluster'] = 3  # Default to cluster 3
+            top_artists.loc[
+                (top_artists['frequency_normalized'] > 0.7) & 
+                (top_artists['rank_sum_normalized'] > 0.4), 'cluster'] = 1  # High performers
+            top_artists.loc[
+                (top_artists['frequency_normalized'] > 0.3) & 
+                (top_artists['cluster'] == 3), 'cluster'] = 2  # Medium popularity
+            
+            return top_artists
+        
         # Load artist data
         @st.cache_data
-        def load_artist_data():
+        def load_artist_data(data_version):
             try:
-                # This is a placeholder - in a real app, you would load from a CSV
-                artist_data = pd.read_csv('Python_Files/artist_scores.csv')
-                
                 # Get top 30 artists by rank plus Gracie
-                top_artists = artist_data[
-                    (artist_data['rank'] <= 30) | 
-                    (artist_data['artists'] == "Gracie Abrams")
-                ].sort_values('rank')
-                
-                # Assign clusters
-                top_artists['cluster'] = 3  # Default to cluster 3
-                top_artists.loc[
-                    (top_artists['frequency_normalized'] > 0.7) & 
-                    (top_artists['rank_sum_normalized'] > 0.4), 'cluster'] = 1  # High performers
-                top_artists.loc[
-                    (top_artists['frequency_normalized'] > 0.3) & 
-                    (top_artists['cluster'] == 3), 'cluster'] = 2  # Medium popularity
-                
-                return top_artists
+                return compute_artist_clusters(artist_store.artists_by_rank(30, include=["Gracie Abrams"]))
             except Exception as e:
                 st.error(f"Error loading artist data: {e}")
                 # Return sample data if file can't be loaded
@@ -1047,41 +1719,7 @@ with tab3:
             return df
         
         # Load or create artist data
-        artist_df = load_artist_data()
-        
-        # Function to load Spotify music features data (similar to the KNN analysis in the notebook)
-        @st.cache_data
-        def load_spotify_features():
-            try:
-                # Sample data from the Dataset
-                artists = ['Sabrina Carpenter', 'Gracie Abrams', 'Olivia Rodrigo', 'Ariana Grande', 'Dua Lipa', 'Taylor Swift']
-                
-                # Create sample features data
-                features_data = {
-                    'Artists': artists,
-                    'danceability': [0.72, 0.68, 0.65, 0.71, 0.75, 0.63],
-                    'energy': [0.65, 0.61, 0.67, 0.68, 0.80, 0.62],
-                    'speechiness': [0.12, 0.11, 0.14, 0.10, 0.08, 0.15],
-                    'acousticness': [0.25, 0.35, 0.20, 0.15, 0.10, 0.30],
-                    'liveness': [0.15, 0.14, 0.20, 0.18, 0.16, 0.12],
-                    'valence': [0.70, 0.65, 0.55, 0.68, 0.72, 0.60],
-                    'tempo': [118, 115, 120, 125, 122, 110],
-                    'popularity': [85, 80, 92, 90, 88, 95],
-                    'daily_rank': [10, 28, 5, 8, 7, 3],
-                    'daily_movement': [1, 2, 0, -1, 1, 0],
-                    'weekly_movement': [3, 5, -1, 0, 2, -2],
-                    'Minimum Fees (in Dollars)': [500000, 150000, 450000, 650000, 550000, 800000]
-                }
-                
-                features_df = pd.DataFrame(features_data)
-                return features_df
-                
-            except Exception as e:
-                st.error(f"Error loading Spotify features data: {e}")
-                return pd.DataFrame()  # Return empty frame on error
-        
-        # Load Spotify features
-        spotify_features = load_spotify_features()
+        artist_df = load_artist_data(data_version)
         
         # Display Cluster Analysis visualization when selected
         if viz_option == "Cluster Analysis":
@@ -1230,104 +1868,93 @@ with tab3:
                     """)
                 
                 # Create KNN analysis similar to the notebook
-                # Select features for analysis
-                features_for_knn = ['danceability', 'energy', 'speechiness', 'acousticness', 'liveness', 'valence', 'tempo', 'popularity']
-                X = spotify_features[features_for_knn]
+                # Standardized track features for batch KNN queries. The fit lives in the disk cache, keyed on
+                # the track file's fingerprint; this process only holds the loaded index.
+                @st.cache_resource(max_entries=2)
+                def load_similarity_index(source_hash):
+                    return cached_similarity_index()
+                
+                similarity_index = load_similarity_index(file_fingerprint('Python_Files/track_features.csv'))
+                
+                # Network layout over the top-5 similarity graph, computed once per version of the track file
+                # and shared with other processes through the disk cache
+                @st.cache_data(max_entries=2)
+                def load_similarity_layout(source_hash, k=5):
+                    return cached_similarity_layout(k)
                 
                 # Check if we have enough data
-                if len(X) >= 2:
-                    # Standardize features
-                    from sklearn.preprocessing import StandardScaler
-                    scaler = StandardScaler()
-                    X_scaled = scaler.fit_transform(X)
-                    
-                    # KNN model
-                    from sklearn.neighbors import NearestNeighbors
-                    knn_model = NearestNeighbors(n_neighbors=len(X), metric='euclidean')
-                    knn_model.fit(X_scaled)
-                    
+                if len(similarity_index) >= 2:
                     # Find Sabrina Carpenter
                     try:
-                        sabrina_index = spotify_features[spotify_features['Artists'] == 'Sabrina Carpenter'].index[0]
-                        distances, indices = knn_model.kneighbors(X_scaled[sabrina_index].reshape(1, -1))
-                        
-                        # Create network graph showing artist similarities (similar to the notebook)
-                        fig = go.Figure()
+                        sabrina_index = similarity_index.row('Sabrina Carpenter')
+                        sabrina_neighbors = similarity_index.neighbors(['Sabrina Carpenter'], k=5)
                         
-                        # Create a circle layout for the network
-                        num_nodes = min(6, len(indices[0]))  # Limit to 6 artists for clarity
-                        angles = np.linspace(0, 2*np.pi, num_nodes, endpoint=False).tolist()
+                        # Force-directed layout of the top-k similarity graph over every artist
+                        edge_source, edge_target, edge_similarity, node_positions = load_similarity_layout(
+                            file_fingerprint('Python_Files/track_features.csv'))
                         
-                        # Central node (Sabrina)
-                        center_x, center_y = 0, 0
-                        radius = 1
+                        # All edges as one WebGL line trace, separated by gaps
+                        edge_x = np.column_stack([node_positions[edge_source, 0], node_positions[edge_target, 0],
+                                                  np.full(len(edge_source), np.nan)]).ravel()
+                        edge_y = np.column_stack([node_positions[edge_source, 1], node_positions[edge_target, 1],
+                                                  np.full(len(edge_source), np.nan)]).ravel()
                         
-                        # Add edges from center to each artist
-                        for i in range(1, num_nodes):
-                            idx = indices[0][i]
-                            angle = angles[i]
-                            x = radius * np.cos(angle)
-                            y = radius * np.sin(angle)
-                            
-                            # Add edge
-                            edge_width = 5 * (1 - distances[0][i] / distances[0].max())  # Scale width by similarity
-                            
-                            fig.add_trace(go.Scatter(
-                                x=[center_x, x, None], 
-                                y=[center_y, y, None],
-                                mode='lines',
-                                line=dict(width=edge_width, color='gray'),
-                                hoverinfo='none',
-                                showlegend=False
-                            ))
-                            
-                            # Add node for this artist
-                            artist_name = spotify_features.iloc[idx]['Artists']
-                            fee = spotify_features.iloc[idx]['Minimum Fees (in Dollars)']
-                            
-                            # Use different color/size for Gracie
-                            color = 'purple' if artist_name == 'Gracie Abrams' else '#43afe0'
-                            size = 20 if artist_name == 'Gracie Abrams' else 15
-                            
-                            fig.add_trace(go.Scatter(
-                                x=[x], 
-                                y=[y],
-                                mode='markers+text',
-                                marker=dict(size=size, color=color),
-                                text=artist_name,
-                                textposition="top left",
-                                hovertemplate=f"{artist_name}<br>Fee: ${fee:,.0f}<extra></extra>",
-                                showlegend=False
-                            ))
-                            
-                            # Add special annotation for Gracie Abrams
-                            if artist_name == 'Gracie Abrams':
-                                fig.add_annotation(
-                                    x=x,
-                                    y=y+0.15,
-                                    text="Best Choice",
-                                    showarrow=True,
-                                    arrowhead=2,
-                                    ax=0,
-                                    ay=-30,
-                                    font=dict(color='purple')
-                                )
+                        # Highlight Sabrina, Gracie and Sabrina's nearest neighbours
+                        neighbor_rows = [similarity_index.row(artist) for artist in sabrina_neighbors['artist']]
+                        node_colors = np.full(len(similarity_index), 'lightgray', dtype=object)
+                        node_sizes = np.full(len(similarity_index), 8)
+                        node_colors[neighbor_rows] = '#43afe0'
+                        node_sizes[neighbor_rows] = 15
+                        node_labels = np.full(len(similarity_index), '', dtype=object)
+                        node_labels[neighbor_rows] = sabrina_neighbors['artist'].to_numpy()
+                        node_labels[sabrina_index] = 'Sabrina Carpenter'
+                        node_colors[sabrina_index] = '#1db949'
+                        node_sizes[sabrina_index] = 25
+                        if 'Gracie Abrams' in similarity_index:
+                            gracie_row = similarity_index.row('Gracie Abrams')
+                            node_colors[gracie_row] = 'purple'
+                            node_sizes[gracie_row] = 20
+                            node_labels[gracie_row] = 'Gracie Abrams'
+                        node_fees = similarity_index.fees
                         
-                        # Add center node (Sabrina)
-                        fig.add_trace(go.Scatter(
-                            x=[center_x], 
-                            y=[center_y],
+                        fig = go.Figure()
+                        fig.add_trace(go.Scattergl(
+                            x=edge_x,
+                            y=edge_y,
+                            mode='lines',
+                            line=dict(width=1, color='gray'),
+                            opacity=0.5,
+                            hoverinfo='none',
+                            showlegend=False
+                        ))
+                        fig.add_trace(go.Scattergl(
+                            x=node_positions[:, 0],
+                            y=node_positions[:, 1],
                             mode='markers+text',
-                            marker=dict(size=25, color='#1db949'),
-                            text='Sabrina Carpenter',
-                            textposition="bottom right",
-                            hovertemplate=f"Sabrina Carpenter<br>Fee: ${spotify_features.iloc[sabrina_index]['Minimum Fees (in Dollars)']:,.0f}<extra></extra>",
+                            marker=dict(size=node_sizes, color=node_colors),
+                            text=node_labels,
+                            textposition="top center",
+                            customdata=np.column_stack([similarity_index.names, node_fees]),
+                            hovertemplate="%{customdata[0]}<br>Fee: $%{customdata[1]:,.0f}<extra></extra>",
                             showlegend=False
                         ))
                         
+                        # Add special annotation for Gracie Abrams
+                        if 'Gracie Abrams' in similarity_index:
+                            fig.add_annotation(
+                                x=node_positions[gracie_row, 0],
+                                y=node_positions[gracie_row, 1],
+                                text="Best Choice",
+                                showarrow=True,
+                                arrowhead=2,
+                                ax=0,
+                                ay=-30,
+                                font=dict(color='purple')
+                            )
+                        
                         # Update layout
                         fig.update_layout(
-                            title="Artists Similar to Sabrina Carpenter (Based on Music Features)",
+                            title="Artist Similarity Network (Based on Music Features)",
                             xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
                             yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
                             height=600,
@@ -1375,31 +2002,15 @@ with tab3:
                         st.plotly_chart(radar_fig, use_container_width=True)
                         
                         # Display similarity and fee comparison table
-                        similar_artists = ['Sabrina Carpenter']
-                        
-                        # Ensure we don't get out of bounds with indices
-                        similar_indices = indices[0][1:min(6, len(indices[0]))]
-                        for idx in similar_indices:
-                            similar_artists.append(spotify_features.iloc[idx]['Artists'])
+                        similar_artists = ['Sabrina Carpenter'] + sabrina_neighbors['artist'].tolist()
                         
                         # Extract data for these artists
-                        compare_df = spotify_features[spotify_features['Artists'].isin(similar_artists)].copy()
-                        
-                        # Add similarity score (1 - normalized distance)
-                        # Calculate for all artists except Sabrina (who has similarity 1.0 to herself)
-                        similarity_scores = [1.0]  # Sabrina's self-similarity
-                        max_dist = distances[0][1:].max()  # Max distance excluding self
+                        compare_df = artist_store.features_for(similar_artists)
                         
-                        for i in range(1, len(distances[0])):
-                            if i < len(compare_df):
-                                similarity = 1 - (distances[0][i] / max_dist)
-                                similarity_scores.append(round(similarity, 2))
-                        
-                        # Ensure we have scores for all rows
-                        while len(similarity_scores) < len(compare_df):
-                            similarity_scores.append(0)
-                            
-                        compare_df['Similarity Score'] = similarity_scores
+                        # Add similarity score (1 - distance / farthest distance); Sabrina has similarity 1.0 to herself
+                        similarity_scores = dict(zip(sabrina_neighbors['artist'], sabrina_neighbors['similarity'].round(2)))
+                        similarity_scores['Sabrina Carpenter'] = 1.0
+                        compare_df['Similarity Score'] = compare_df['Artists'].map(similarity_scores).fillna(0)
                         
                         # Format the fee column for display
                         compare_df['Fee'] = compare_df['Minimum Fees (in Dollars)'].apply(lambda x: f"${x:,.0f}")
@@ -1421,6 +2032,33 @@ with tab3:
                             height=250
                         )
                         
+                        # Neighbour lists for several headliners in one batch query
+                        st.write("### Similar Artists for Several Headliners")
+                        col_seeds, col_k = st.columns([3, 1])
+                        with col_seeds:
+                            seed_artists = st.multiselect(
+                                "Headliners:",
+                                similarity_index.names.tolist(),
+                                default=['Sabrina Carpenter', 'Gracie Abrams'],
+                                key="similarity_seeds"
+                            )
+                        with col_k:
+                            neighbor_count = st.number_input(
+                                "Neighbours each:", min_value=1, max_value=max(len(similarity_index) - 1, 1),
+                                value=min(3, len(similarity_index) - 1), key="similarity_k"
+                            )
+                        if seed_artists:
+                            batch_df = similarity_index.neighbors(seed_artists, k=int(neighbor_count))
+                            batch_df['fee'] = batch_df['fee'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "n/a")
+                            st.dataframe(
+                                batch_df.rename(columns={
+                                    'seed': 'Headliner', 'neighbor_rank': 'Rank', 'artist': 'Similar Artist',
+                                    'distance': 'Distance', 'similarity': 'Similarity Score', 'fee': 'Fee'
+                                }).round({'Distance': 2, 'Similarity Score': 2}),
+                                use_container_width=True,
+                                hide_index=True
+                            )
+                        
                         # Add explanation
                         st.markdown("""
                         <div class="bio-card mt-4">
@@ -1442,12 +2080,64 @@ with tab3:
                         </div>
                         """, unsafe_allow_html=True)
                     
-                    except IndexError:
+                    except KeyError:
                         st.error("Sabrina Carpenter not found in the dataset")
                 else:
                     st.error("Not enough data for KNN analysis")
             else:
                 st.error("Could not load Spotify features data")
+        
+        # Display the Audience Overlap visualization
+        elif viz_option == "Audience Overlap":
+            # MinHash sketches of every artist's listeners, persisted next to the result cache
+            @st.cache_resource(max_entries=1)
+            def load_audience_sketches(source_hash):
+                return load_or_build()
+            
+            audience_sketches = load_audience_sketches(file_fingerprint(LISTENERS_PATH))
+            overlap_artists = sorted(audience_sketches.artists, key=lambda artist: artist != 'Sabrina Carpenter')
+            
+            st.markdown("### Estimated Audience Overlap (Jaccard)")
+            overlap_matrix = audience_sketches.pairwise(overlap_artists)
+            fig_overlap = px.imshow(
+                overlap_matrix,
+                color_continuous_scale='Agsunset',
+                zmin=0,
+                zmax=float(np.nanmax(np.where(np.eye(len(overlap_matrix), dtype=bool), np.nan, overlap_matrix.values)))
+                     if len(overlap_matrix) > 1 else 1,
+                text_auto='.2f',
+                labels={'color': 'Jaccard'},
+                height=600
+            )
+            fig_overlap.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig_overlap, use_container_width=True)
+            
+            pair_col1, pair_col2 = st.columns(2)
+            with pair_col1:
+                overlap_a = st.selectbox("Artist:", overlap_artists, index=0, key="overlap_artist_a")
+            with pair_col2:
+                overlap_b = st.selectbox("Compared With:", overlap_artists,
+                                         index=overlap_artists.index('Gracie Abrams') if 'Gracie Abrams' in overlap_artists else 0,
+                                         key="overlap_artist_b")
+            pair_jaccard = audience_sketches.jaccard(overlap_a, overlap_b)
+            pair_error = np.sqrt(pair_jaccard * (1 - pair_jaccard) / audience_sketches.num_perm)
+            st.metric(f"{overlap_a} / {overlap_b} Audience Overlap", f"{pair_jaccard:.1%}",
+                      delta=f"± {pair_error:.1%} (one standard error)", delta_color="off")
+            
+            closest_audiences = audience_sketches.most_overlapping(overlap_a, n=10)
+            fig_closest = px.bar(
+                closest_audiences,
+                x='jaccard',
+                y='artist',
+                orientation='h',
+                color='jaccard',
+                color_continuous_scale='Agsunset',
+                labels={'jaccard': 'Estimated Jaccard Overlap', 'artist': 'Artist'},
+                title=f"Artists Whose Audiences Overlap Most with {overlap_a}",
+                height=450
+            )
+            fig_closest.update_layout(yaxis={'categoryorder': 'total ascending'}, coloraxis_showscale=False)
+            st.plotly_chart(fig_closest, use_container_width=True)
     
     with col2:
         st.markdown("""
@@ -1511,20 +2201,54 @@ with tab4:
     # Create nested tabs within tab2
     nested_tab1, nested_tab2 = st.tabs(["Sabrina Carpenter", "Gracie Abrams"])
 
-    # Timeline data with USA sales figures added
-    timeline_data = {
-        'Year': [2015, 2016, 2018, 2019, 2021, 2022, 2023, 2024],
-        'Album/Milestone': ['Eyes Wide Open', 'EVOLution', 'Singular: Act I', 'Singular: Act II', 
-                        'Skin (Breakthrough Single)', 'Emails I Can\'t Send', 'Nonsense (Viral Hit)', 'Short n\' Sweet & Espresso'],
-        'USA_Sales': [30000, 35000, 25000, 20000, None, 35000, None, 135000],
-        'Global_Sales': [40000, 45000, 40000, 35000, None, 75000, None, 315000] 
-    }
-
-    # Create DataFrame
-    timeline_df = pd.DataFrame(timeline_data)
+    # Release and milestone table for every artist, with USA and global sales
+    @st.cache_data
+    def load_milestone_table(path, source_hash):
+        return load_milestones(path)
+
+    milestones = load_milestone_table('Python_Files/milestones.csv', file_fingerprint('Python_Files/milestones.csv'))
+
+    # Weekly album sales with precomputed week/month/year rollups
+    @st.cache_resource(max_entries=1)
+    def load_album_sales(path, source_hash):
+        return AlbumSales.from_csv(path)
+
+    album_sales = load_album_sales('Python_Files/album_sales.csv', file_fingerprint('Python_Files/album_sales.csv'))
+
+    # Sales trajectory chart for one artist from the precomputed rollups
+    def sales_trajectory_chart(artist, key_prefix):
+        col_rollup, col_view, col_region = st.columns(3)
+        with col_rollup:
+            rollup = st.radio("Period:", ["Week", "Month", "Year"], index=1, horizontal=True, key=f"{key_prefix}_sales_rollup")
+        with col_view:
+            cumulative = st.checkbox("Cumulative", value=True, key=f"{key_prefix}_sales_cumulative")
+        with col_region:
+            region = st.radio("Region:", ["Global", "USA"], horizontal=True, key=f"{key_prefix}_sales_region")
+        
+        units_column = f"{region.lower()}_units"
+        if cumulative:
+            units_column = f"cumulative_{units_column}"
+        sales_series = album_sales.series(artist, rollup.lower())
+        
+        fig_trajectory = px.line(
+            sales_series,
+            x='period',
+            y=units_column,
+            color='album',
+            category_orders={'album': album_sales.albums(artist)},
+            color_discrete_sequence=px.colors.qualitative.Pastel,
+            render_mode='webgl',
+            labels={'period': '', units_column: 'Units Sold', 'album': 'Album'}
+        )
+        fig_trajectory.update_layout(
+            title=f"{region} Sales Trajectory by Album ({'Cumulative' if cumulative else 'Per ' + rollup})",
+            height=400,
+            legend=dict(orientation="h", yanchor="top", y=-0.15, xanchor="left", x=0)
+        )
+        st.plotly_chart(fig_trajectory, use_container_width=True)
 
-    # Add End_Year for timeline visualization
-    timeline_df['End_Year'] = timeline_df['Year'] + 1
+    # Timeline data with USA sales figures added (End_Year marks the end of each timeline bar)
+    timeline_df = milestones_for(milestones, "Sabrina Carpenter")
 
     with nested_tab1:
         col1, col2 = st.columns([1, 1])
@@ -1556,35 +2280,8 @@ with tab4:
             st.markdown("")
             st.markdown("### Career Timeline")
 
-            # Create the timeline chart using a different approach with go.Bar
-            fig = go.Figure()
-
-            # Add a bar for each album/milestone
-            for i, row in timeline_df.iterrows():
-                fig.add_trace(go.Bar(
-                    x=[row['End_Year'] - row['Year']],  # Width of the bar
-                    y=[row['Album/Milestone']],
-                    orientation='h',
-                    base=row['Year'],  # Start position
-                    marker_color=px.colors.qualitative.Pastel[i % len(px.colors.qualitative.Pastel)],
-                    name=row['Album/Milestone'],
-                    hovertemplate=f"{row['Album/Milestone']}<br>Year: {row['Year']}<br>Global_Sales: {row['Global_Sales'] if pd.notna(row['Global_Sales']) else 'N/A'}"
-                ))
-
-            # Update layout
-            fig.update_layout(
-                height=350,
-                showlegend=False,
-                xaxis_title="",
-                yaxis_title="",
-                title="Sabrina Carpenter Global_Sales Timeline",
-                xaxis=dict(
-                    tickmode='array',
-                    tickvals=list(range(2015, 2025)),
-                    ticktext=[str(year) for year in range(2015, 2025)],
-                ),
-                barmode='overlay'
-            )
+            # Create the timeline chart as a single bar trace with one bar per album/milestone
+            fig = timeline_figure(timeline_df, "Sabrina Carpenter Global_Sales Timeline")
 
             # Show timeline chart
             st.plotly_chart(fig, use_container_width=True)
@@ -1613,6 +2310,9 @@ with tab4:
 
             # Show sales chart
             st.plotly_chart(fig_sales, use_container_width=True)
+
+            # Weekly sales rolled up over time
+            sales_trajectory_chart("Sabrina Carpenter", "sabrina")
         
         with col2:
             st.markdown("### Viral Success Metrics")
@@ -1677,20 +2377,7 @@ with tab4:
         col1, col2 = st.columns([1, 1])
         
         # Timeline data for Gracie Abrams
-        gracie_timeline_data = {
-            'Year': [2019, 2020, 2021, 2022, 2023, 2024],
-            'Album/Milestone': ['Minor (EP)', 'This Is What It Feels Like (EP)', 
-                            'Mess It Up (Single)', 'Good Riddance', 
-                            'The Secret of Us (Single)', 'The Secret of Us'],
-            'USA_Sales': [15000, 18000, None, 42000, None, 65000],
-            'Global_Sales': [25000, 30000, None, 92000, None, 130000] 
-        }
-
-        # Create DataFrame
-        gracie_timeline_df = pd.DataFrame(gracie_timeline_data)
-
-        # Add End_Year for timeline visualization
-        gracie_timeline_df['End_Year'] = gracie_timeline_df['Year'] + 1
+        gracie_timeline_df = milestones_for(milestones, "Gracie Abrams")
         
         with col1:
             st.markdown("""
@@ -1721,35 +2408,8 @@ with tab4:
             st.markdown("")
             st.markdown("### Career Timeline")
 
-            # Create the timeline chart using a different approach with go.Bar
-            fig = go.Figure()
-
-            # Add a bar for each album/milestone
-            for i, row in gracie_timeline_df.iterrows():
-                fig.add_trace(go.Bar(
-                    x=[row['End_Year'] - row['Year']],  # Width of the bar
-                    y=[row['Album/Milestone']],
-                    orientation='h',
-                    base=row['Year'],  # Start position
-                    marker_color=px.colors.qualitative.Pastel[i % len(px.colors.qualitative.Pastel)],
-                    name=row['Album/Milestone'],
-                    hovertemplate=f"{row['Album/Milestone']}<br>Year: {row['Year']}<br>Global_Sales: {row['Global_Sales'] if pd.notna(row['Global_Sales']) else 'N/A'}"
-                ))
-
-            # Update layout
-            fig.update_layout(
-                height=350,
-                showlegend=False,
-                xaxis_title="",
-                yaxis_title="",
-                title="Gracie Abrams Global Sales Timeline",
-                xaxis=dict(
-                    tickmode='array',
-                    tickvals=list(range(2019, 2025)),
-                    ticktext=[str(year) for year in range(2019, 2025)],
-                ),
-                barmode='overlay'
-            )
+            # Create the timeline chart as a single bar trace with one bar per album/milestone
+            fig = timeline_figure(gracie_timeline_df, "Gracie Abrams Global Sales Timeline")
 
             # Show timeline chart
             st.plotly_chart(fig, use_container_width=True)
@@ -1778,6 +2438,9 @@ with tab4:
 
             # Show sales chart
             st.plotly_chart(fig_sales, use_container_width=True)
+
+            # Weekly sales rolled up over time
+            sales_trajectory_chart("Gracie Abrams", "gracie")
         
         with col2:
             st.markdown("### Viral Success Metrics")
@@ -1841,7 +2504,7 @@ with tab4:
 # Tab 5: Hit Song Performance
 with tab5:
     st.markdown("<div class='section-header'>Hit Song Performance Analysis</div>", unsafe_allow_html=True)
-    nested_tab1, nested_tab2 = st.tabs(["Sabrina Carpenter", "Gracie Abrams"])
+    nested_tab1, nested_tab2, nested_tab3 = st.tabs(["Sabrina Carpenter", "Gracie Abrams", "Setlist Planner"])
 
     with nested_tab1:
         col1, col2 = st.columns([3, 1])
@@ -1854,7 +2517,7 @@ with tab5:
             )
             if metric == "Streams":
                 fig = px.bar(
-                    sabrina_songs_df.sort_values(by="streams", ascending=False).head(10),
+                    song_catalog.top("Sabrina Carpenter", "streams", 10),
                     y="song_title",
                     x="streams",
                     color="album",
@@ -1867,7 +2530,7 @@ with tab5:
                 
             elif metric == "Chart Position":
                 # For chart position, lower is better, so we need to sort differently
-                chart_df = sabrina_songs_df.sort_values(by="chart_position", ascending=True).head(10)
+                chart_df = song_catalog.top("Sabrina Carpenter", "chart_position", 10)
                 fig = px.bar(
                     chart_df,
                     y="song_title",
@@ -1882,15 +2545,16 @@ with tab5:
                 fig.update_xaxes(autorange="reversed")  # Lower numbers (better positions) should be longer bars
                 
             else:  # Grammy Nominations
+                grammy_df = song_catalog.top("Sabrina Carpenter", "grammy_nominations", 10)
                 fig = px.bar(
-                    sabrina_songs_df.sort_values(by="grammy_nominations", ascending=False).head(10),
+                    grammy_df,
                     y="song_title",
                     x="grammy_nominations",
                     color="album",
                     labels={"song_title": "Song", "grammy_nominations": "Grammy Nominations", "album": "Album"},
                     title="Songs by Grammy Nominations",
                     orientation='h',
-                    text=sabrina_songs_df.sort_values(by="grammy_nominations", ascending=False).head(10)["grammy_nominations"]
+                    text=grammy_df["grammy_nominations"]
                 )
                 fig.update_layout(yaxis={'categoryorder':'total ascending'})
             
@@ -1901,11 +2565,11 @@ with tab5:
             st.markdown("### Filter by Album")
             album_choice = st.selectbox(
                 "Select Album:",
-                ["All Albums"] + list(sabrina_songs_df["album"].unique()),
+                ["All Albums"] + song_catalog.albums("Sabrina Carpenter"),
                 key="sabrina_album_selector"  # Added unique key
             )
             if album_choice != "All Albums":
-                filtered_songs = sabrina_songs_df[sabrina_songs_df["album"] == album_choice]["song_title"].tolist()
+                filtered_songs = song_catalog.album_songs("Sabrina Carpenter", album_choice)
                 st.write(f"Songs from {album_choice}:")
                 for song in filtered_songs:
                     st.markdown(f"- {song}")
@@ -1955,7 +2619,7 @@ with tab5:
             
             if metric == "Streams":
                 fig = px.bar(
-                    gracie_songs_df.sort_values(by="streams", ascending=False).head(10),
+                    song_catalog.top("Gracie Abrams", "streams", 10),
                     y="song_title",
                     x="streams",
                     color="album",
@@ -1968,7 +2632,7 @@ with tab5:
                 
             elif metric == "Chart Position":
 
-                chart_df = gracie_songs_df.sort_values(by="chart_position", ascending=True).head(10)
+                chart_df = song_catalog.top("Gracie Abrams", "chart_position", 10)
                 fig = px.bar(
                     chart_df,
                     y="song_title",
@@ -1983,15 +2647,16 @@ with tab5:
                 fig.update_xaxes(autorange="reversed")
                 
             else:  # Grammy Nominations
+                grammy_df = song_catalog.top("Gracie Abrams", "grammy_nominations", 10)
                 fig = px.bar(
-                    gracie_songs_df.sort_values(by="grammy_nominations", ascending=False).head(10),
+                    grammy_df,
                     y="song_title",
                     x="grammy_nominations",
                     color="album",
                     labels={"song_title": "Song", "grammy_nominations": "Grammy Nominations", "album": "Album"},
                     title="Songs by Grammy Nominations",
                     orientation='h',
-                    text=gracie_songs_df.sort_values(by="grammy_nominations", ascending=False).head(10)["grammy_nominations"]
+                    text=grammy_df["grammy_nominations"]
                 )
                 fig.update_layout(yaxis={'categoryorder':'total ascending'})
             
@@ -2001,12 +2666,12 @@ with tab5:
             st.markdown("### Filter by Album")
             album_choice = st.selectbox(
                 "Select Album:",
-                ["All Albums"] + list(gracie_songs_df["album"].unique()),
+                ["All Albums"] + song_catalog.albums("Gracie Abrams"),
                 key="gracie_album_selector"
             )
 
             if album_choice != "All Albums":
-                filtered_songs = gracie_songs_df[gracie_songs_df["album"] == album_choice]["song_title"].tolist()
+                filtered_songs = song_catalog.album_songs("Gracie Abrams", album_choice)
                 st.write(f"Songs from {album_choice}:")
                 for song in filtered_songs:
                     st.markdown(f"- {song}")
@@ -2043,26 +2708,107 @@ with tab5:
             </div>
             """, unsafe_allow_html=True)
 
+    with nested_tab3:
+        st.markdown("### Show Running Order")
+        
+        # Set lengths and how strongly hits are pulled to the front of each set
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            opener_minutes = st.slider("Gracie Abrams Set (minutes):", 15, 75, 40, step=5, key="opener_minutes")
+        with col2:
+            headliner_minutes = st.slider("Sabrina Carpenter Set (minutes):", 30, 120, 90, step=5, key="headliner_minutes")
+        with col3:
+            hit_weight = st.slider("Front-Load Hits:", 0.0, 5.0, 1.0, step=0.5, key="hit_weight",
+                                   help="Higher values move the most-streamed songs earlier in each set")
+        
+        show_df = plan_show(
+            song_catalog.songs_for("Gracie Abrams"),
+            song_catalog.songs_for("Sabrina Carpenter"),
+            opener_minutes=opener_minutes,
+            headliner_minutes=headliner_minutes,
+            hit_weight=hit_weight
+        )
+        
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            # Tempo and energy across the running order
+            fig_flow = go.Figure()
+            fig_flow.add_trace(go.Scatter(
+                x=show_df['slot'],
+                y=show_df['tempo'],
+                mode='lines+markers',
+                name='Tempo (BPM)',
+                text=show_df['song_title'],
+                line=dict(color='#9D76C1'),
+                hovertemplate="%{text}<br>Tempo: %{y:.0f} BPM<extra></extra>"
+            ))
+            fig_flow.add_trace(go.Scatter(
+                x=show_df['slot'],
+                y=show_df['energy'],
+                mode='lines+markers',
+                name='Energy',
+                text=show_df['song_title'],
+                yaxis='y2',
+                line=dict(color='#FF78C4'),
+                hovertemplate="%{text}<br>Energy: %{y:.2f}<extra></extra>"
+            ))
+            fig_flow.update_layout(
+                title="Tempo and Energy Flow Across the Show",
+                height=450,
+                xaxis_title="Slot",
+                yaxis=dict(title="Tempo (BPM)"),
+                yaxis2=dict(title="Energy", overlaying='y', side='right', range=[0, 1]),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+            headliner_start = show_df.loc[show_df['set'] == 'Headliner', 'slot'].min()
+            if pd.notna(headliner_start):
+                fig_flow.add_vline(x=headliner_start - 0.5, line_dash="dash", line_color="gray",
+                                   annotation_text="Changeover", annotation_position="top")
+            st.plotly_chart(fig_flow, use_container_width=True)
+        
+        with col2:
+            setlist_display = show_df[['slot', 'set', 'song_title', 'duration_sec', 'start_sec']].copy()
+            setlist_display['Start'] = setlist_display['start_sec'].apply(lambda x: f"{int(x) // 60}:{int(x) % 60:02d}")
+            setlist_display['Length'] = setlist_display['duration_sec'].apply(lambda x: f"{int(x) // 60}:{int(x) % 60:02d}")
+            st.dataframe(
+                setlist_display[['slot', 'set', 'song_title', 'Start', 'Length']].rename(
+                    columns={'slot': 'Slot', 'set': 'Set', 'song_title': 'Song'}),
+                use_container_width=True,
+                hide_index=True,
+                height=450
+            )
+        
+        st.markdown("""
+        <div class="bio-card">
+            <h4>How the Setlist Is Built</h4>
+            <p>Each set picks the most-streamed combination of songs that fits its time slot, then orders them so
+            consecutive songs have similar tempo, energy and mood while the biggest hits land early in the set.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
 with tab6:
 
     st.markdown("<div class='section-header'>Sub Performing Artists</div>", unsafe_allow_html=True)
-    nested_tab1, nested_tab2 = st.tabs(["Artist Collabrated with Sabrina Carpenter", "Artist Collabrated with Gracie Abrams"])
+    nested_tab1, nested_tab2, nested_tab3, nested_tab4 = st.tabs(["Artist Collabrated with Sabrina Carpenter", "Artist Collabrated with Gracie Abrams", "Collaboration Network", "Booking Budget"])
 
     with nested_tab1:
         subrina_artists_data = {
             'Artists': ['Rachel Chinouriri', 'Amaarae', 'Griff', 'Declan McKenna', 'Chappell Roan', 
                         'Teddy Swims', 'The Killers', 'ScHoolboy Q', 'FLETCHER', 'The Japanese House'],
-            'Appearances': [10, 7, 6, 4, 3, 2, 2, 2, 2, 2],
-            'Minimum_Fees': [15000, 25000, 15000, 25000, 1500000, 1500000, 1500000, 150000, 150000, 25000],
-            'Maximum_Fees': [24999, 39999, 24999, 39999, 1999999, 1999999, 1999999, 299000, 299000, 39999],
-            'Genres': [['Alternative rock', 'Indie'], ['Pop', 'Afropop', 'R&B', 'Soul'], ['Pop'], 
-                    ['Alternative rock', 'Indie'], ['Pop'], ['Rap'], ['Rock'], 
-                    ['Hip Hop', 'Rap'], ['Pop'], ['Alternative Pop', 'Indie']],
-            'Pop': ['No', 'Yes', 'Yes', 'No', 'Yes', 'No', 'No', 'No', 'Yes', 'No'],
             'Rank': [1.0, 2.0, 3.0, 4.0, 5.0, 8.0, 8.0, 7.0, 7.0, 6.0]
             }
-        # Create DataFrame
+        # Create DataFrame, with appearances taken from the co-billing graph
         subrina_artists_df = pd.DataFrame(subrina_artists_data)
+        subrina_appearances = collab_graph.billed_with("Sabrina Carpenter").set_index('artist')['appearances']
+        subrina_artists_df['Appearances'] = subrina_artists_df['Artists'].map(subrina_appearances).fillna(0)
+        subrina_fees = fee_index.fees_for(subrina_artists_df['Artists'])
+        subrina_artists_df['Minimum_Fees'] = subrina_fees['minimum_fee'].to_numpy()
+        subrina_artists_df['Maximum_Fees'] = subrina_fees['maximum_fee'].to_numpy()
+        # Genres, Pop flag and genre similarity to the headliner from the genre bitsets
+        subrina_rows = genre_index.rows(subrina_artists_df['Artists'])
+        subrina_artists_df['Genres'] = [', '.join(genre_index.genres_of(artist)) for artist in subrina_artists_df['Artists']]
+        subrina_artists_df['Pop'] = np.where(genre_index.matching(['Pop'])[subrina_rows], 'Yes', 'No')
+        subrina_artists_df['Genre_Similarity'] = genre_index.jaccard(genre_index.genres_of("Sabrina Carpenter"))[subrina_rows].round(2)
 
         color_discrete_map = {'Yes': 'purple', 'No': 'lightpink'}  # Custom color mapping for Pop genre
         fig = px.bar(subrina_artists_df.sort_values(by="Appearances", ascending=False).head(10),  # Top 10 artists by appearances
@@ -2071,7 +2817,7 @@ with tab6:
                     orientation='h',
                     color="Pop",  # Color by Pop genre
                     color_discrete_map=color_discrete_map,  # Custom color mapping
-                    hover_data=["Minimum_Fees", "Genres", "Rank"], # Fixed column name to match DataFrame
+                    hover_data=["Minimum_Fees", "Genres", "Genre_Similarity", "Rank"], # Fixed column name to match DataFrame
                     title="Top Artists Performing with Sabrina Carpenter (Ranked)",
                     labels={"Appearances": "Number of Appearances", "Artists": "Artist Name"},
                     text="Rank") # Display Rank on the bars
@@ -2083,24 +2829,27 @@ with tab6:
         graice_artists_data = {
             'Artists': ['Tiny Habits', 'Role Model', 'Searows', 'Dora Jar', 'Alix Page', 
                     'Olivia Rodrigo', 'Taylor Swift', 'Chappell Roan', 'Phoebe Bridgers', 'Noah Kahan'],
-            'Appearances': [17, 15, 14, 11, 11, 7, 6, 6, 5, 3],
-            'Minimum_Fees': [15000, 40000, 15000, 40000, 25000, 1500000, 3755000, 1500000, 300000, 2000000],
-            'Maximum_Fees': [24999, 74999, 24999, 74999, 39999, 1999999, 7450250, 1999999, 499000, 2499999],
-            'Genres': [['Alternative', 'Indie'], ['Pop'], ['Alternative', 'Folk'], ['Pop'], 
-                    ['Alternative', 'Indie', 'Pop'], ['Pop'], ['Contemporary Country', 'Country', 'Country Pop'], 
-                    ['Pop'], ['Indie Rock'], ['Folk-Pop', 'Indie']],
-            'Pop': ['No', 'Yes', 'No', 'Yes', 'Yes', 'Yes', 'Yes', 'Yes', 'No', 'No'],
             'Rank': [1.0, 2.0, 3.0, 5.0, 4.0, 6.0, 8.0, 7.0, 9.0, 10.0]
         }
-        # Create DataFrame
+        # Create DataFrame, with appearances taken from the co-billing graph
         graice_artists_df = pd.DataFrame(graice_artists_data)
+        graice_appearances = collab_graph.billed_with("Gracie Abrams").set_index('artist')['appearances']
+        graice_artists_df['Appearances'] = graice_artists_df['Artists'].map(graice_appearances).fillna(0)
+        graice_fees = fee_index.fees_for(graice_artists_df['Artists'])
+        graice_artists_df['Minimum_Fees'] = graice_fees['minimum_fee'].to_numpy()
+        graice_artists_df['Maximum_Fees'] = graice_fees['maximum_fee'].to_numpy()
+        # Genres, Pop flag and genre similarity to the headliner from the genre bitsets
+        graice_rows = genre_index.rows(graice_artists_df['Artists'])
+        graice_artists_df['Genres'] = [', '.join(genre_index.genres_of(artist)) for artist in graice_artists_df['Artists']]
+        graice_artists_df['Pop'] = np.where(genre_index.matching(['Pop'])[graice_rows], 'Yes', 'No')
+        graice_artists_df['Genre_Similarity'] = genre_index.jaccard(genre_index.genres_of("Gracie Abrams"))[graice_rows].round(2)
 
         fig = px.bar(graice_artists_df.sort_values(by="Appearances", ascending=False).head(10),  # Top 10 artists by appearances
             x="Appearances",
             y="Artists",
             orientation='h',
             color="Pop",  # Color by Pop genre
-            hover_data=["Minimum_Fees", "Genres", "Rank"], # Fixed column name to match DataFrame
+            hover_data=["Minimum_Fees", "Genres", "Genre_Similarity", "Rank"], # Fixed column name to match DataFrame
             title="Top Artists Performing with Gracie Abrams (Ranked)",
             labels={"Appearances": "Number of Appearances", "Artists": "Artist Name", "Minimum_Fees": "Minimum Fees (in Dollars)"},
             text="Rank") # Display Rank on the bars
@@ -2108,3 +2857,109 @@ with tab6:
         fig.update_traces(texttemplate='%{text:.0f}', textposition='outside') # Format the rank text
         fig.update_layout(yaxis={'categoryorder':'total ascending'}) # Order bars from lowest to highest appearances
         st.plotly_chart(fig)
+
+    with nested_tab3:
+        st.markdown("### Co-Billing Network")
+        st.caption(f"{len(collab_graph):,} artists in the co-billing graph")
+        
+        centrality_df = collab_graph.centrality()
+        col1, col2 = st.columns(2)
+        with col1:
+            # Most central artists across every tour in the co-billing data
+            fig = px.bar(centrality_df.head(15),
+                         x="pagerank",
+                         y="artist",
+                         orientation='h',
+                         color="weighted_degree",
+                         color_continuous_scale='Purp',
+                         title="Most Central Artists (PageRank)",
+                         labels={"pagerank": "PageRank", "artist": "Artist Name", "weighted_degree": "Shared Shows"})
+            fig.update_layout(yaxis={'categoryorder': 'total ascending'}, height=500)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            headliner_choice = st.selectbox(
+                "Find acts frequently billed with:",
+                centrality_df['artist'].head(200).tolist(),
+                key="collab_headliner"
+            )
+            st.markdown("**Already billed together**")
+            st.dataframe(
+                collab_graph.billed_with(headliner_choice).head(10).rename(
+                    columns={'artist': 'Artist', 'appearances': 'Shared Shows'}),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.markdown("**Two-hop recommendations**")
+            recommendations_df = collab_graph.recommendations(headliner_choice, 10)
+            if recommendations_df.empty:
+                st.info("No two-hop co-billing partners for this artist yet.")
+            else:
+                st.dataframe(
+                    recommendations_df.rename(columns={
+                        'artist': 'Artist', 'two_hop_score': 'Two-Hop Score', 'pagerank': 'PageRank'}),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+    with nested_tab4:
+        st.markdown("### Booking Budget")
+        
+        fee_floor, fee_ceiling = fee_index.fee_range()
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            budget_low, budget_high = st.slider(
+                "Budget Range (in Dollars):",
+                min_value=0,
+                max_value=int(fee_ceiling),
+                value=(0, min(int(fee_ceiling), 500000)),
+                step=5000,
+                key="budget_range"
+            )
+        with col2:
+            budget_genre = st.selectbox("Genre:", ["All Genres"] + fee_index.genres(), key="budget_genre")
+        with col3:
+            budget_count = st.number_input("Show:", min_value=1, max_value=50, value=10, key="budget_count")
+        
+        genre_filter = None if budget_genre == "All Genres" else budget_genre
+        # The count covers the same genre-filtered artists as the listing below it
+        overlapping_df = fee_index.overlapping(budget_low, budget_high, genre_filter)
+        st.metric("Artists With Fees Overlapping the Budget", f"{len(overlapping_df):,}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Fee range overlaps the budget**")
+            fig = go.Figure()
+            shown = overlapping_df.head(int(budget_count))
+            fig.add_trace(go.Bar(
+                x=shown['maximum_fee'] - shown['minimum_fee'],
+                base=shown['minimum_fee'],
+                y=shown['artist'],
+                orientation='h',
+                marker_color='#9D76C1',
+                customdata=shown[['minimum_fee', 'maximum_fee']].to_numpy(),
+                hovertemplate="%{y}<br>$%{customdata[0]:,.0f} - $%{customdata[1]:,.0f}<extra></extra>"
+            ))
+            fig.add_vrect(x0=budget_low, x1=budget_high, fillcolor="#FF78C4", opacity=0.15, line_width=0)
+            fig.update_layout(
+                title="Fee Ranges Within Budget",
+                xaxis_title="Fee (in Dollars)",
+                yaxis={'autorange': 'reversed'},
+                height=450
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.markdown(f"**Cheapest {int(budget_count)} up to ${budget_high:,}**")
+            cheapest_df = fee_index.cheapest(budget_high, int(budget_count), genre_filter)
+            if cheapest_df.empty:
+                st.info("No artists fit this budget.")
+            else:
+                cheapest_display = cheapest_df.copy()
+                cheapest_display['genres'] = cheapest_display['genres'].map(', '.join)
+                st.dataframe(
+                    cheapest_display.rename(columns={
+                        'artist': 'Artist', 'minimum_fee': 'Minimum Fee', 'maximum_fee': 'Maximum Fee', 'genres': 'Genres'}),
+                    use_container_width=True,
+                    hide_index=True
+                )
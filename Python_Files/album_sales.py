@@ -0,0 +1,70 @@
+"""Weekly album sales with precomputed week, month and year rollups.
+
+Weekly records are read in chunks and reduced per (artist, album, week) as
+they stream in. At load time each rollup frequency is computed once with a
+grouped sum over the period start, plus a grouped cumulative sum. The
+tables are sorted by (artist, album, period), so a view reads an artist's
+series as one contiguous slice found by binary search.
+"""
+import numpy as np
+import pandas as pd
+
+SALES_COLUMNS = ['week', 'artist', 'album', 'usa_units', 'global_units']
+UNIT_COLUMNS = ['usa_units', 'global_units']
+
+# Rollup name -> pandas period alias (None keeps the weekly rows)
+ROLLUPS = {'week': None, 'month': 'M', 'year': 'Y'}
+
+
+class AlbumSales:
+    def __init__(self, weekly):
+        weekly = weekly.groupby(['artist', 'album', 'week'], sort=True)[UNIT_COLUMNS].sum().reset_index()
+        # Albums in release order (first week with sales)
+        first_week = weekly.groupby(['artist', 'album'], sort=False)['week'].min().reset_index()
+        first_week = first_week.sort_values(['artist', 'week', 'album'], kind='stable')
+        self._albums = {artist: group['album'].tolist() for artist, group in first_week.groupby('artist', sort=False)}
+
+        self.rollups = {}
+        for name, alias in ROLLUPS.items():
+            period = weekly['week'] if alias is None else weekly['week'].dt.to_period(alias).dt.start_time
+            rolled = (weekly[['artist', 'album'] + UNIT_COLUMNS].assign(period=period)
+                      .groupby(['artist', 'album', 'period'], sort=True)[UNIT_COLUMNS].sum().reset_index())
+            cumulative = rolled.groupby(['artist', 'album'], sort=False)[UNIT_COLUMNS].cumsum()
+            for column in UNIT_COLUMNS:
+                rolled[f'cumulative_{column}'] = cumulative[column]
+            self.rollups[name] = rolled
+        # Artist boundaries in the (artist-sorted) rollup tables
+        self._artist_keys = {name: table['artist'].to_numpy() for name, table in self.rollups.items()}
+
+    @classmethod
+    def from_csv(cls, path, chunksize=1_000_000):
+        # Reduce each chunk to weekly totals before combining, so memory tracks distinct weeks, not rows
+        partials = []
+        for chunk in pd.read_csv(path, usecols=SALES_COLUMNS, chunksize=chunksize):
+            chunk['week'] = pd.to_datetime(chunk['week'])
+            partials.append(chunk.groupby(['artist', 'album', 'week'], sort=False)[UNIT_COLUMNS].sum().reset_index())
+        return cls(pd.concat(partials, ignore_index=True))
+
+    def artists(self):
+        return list(self._albums)
+
+    def albums(self, artist):
+        return list(self._albums.get(artist, []))
+
+    def series(self, artist, rollup='week', album=None):
+        # Per-period and cumulative units of one artist (optionally one album), ordered by album and period
+        if rollup not in self.rollups:
+            raise ValueError(f"Unknown rollup: {rollup}")
+        keys = self._artist_keys[rollup]
+        lo = np.searchsorted(keys, artist, side='left')
+        hi = np.searchsorted(keys, artist, side='right')
+        rows = self.rollups[rollup].iloc[lo:hi]
+        if album is not None:
+            rows = rows[rows['album'] == album]
+        return rows
+
+    def totals(self, artist):
+        # Lifetime units per album, in release order
+        yearly = self.series(artist, 'year')
+        totals = yearly.groupby('album', sort=False)[UNIT_COLUMNS].sum()
+        return totals.reindex(self.albums(artist)).reset_index()
@@ -0,0 +1,327 @@
+"""Local read-only JSON API over the dashboard's computations.
+
+Serves artist scores, top-k similar artists, decision-matrix totals and fee
+queries from the same data bundle, SQLite store and index builders as
+Concert_Dashboard.py. Indexes are cached per file fingerprint, so an edited
+data file is picked up on the next request. The similarity fit comes from
+the disk-backed result cache that the dashboard also fills. Requests run on a fixed pool of
+worker threads. The POST endpoints answer many artists or queries in one
+call.
+
+    python Python_Files/api_server.py --port 8765 --workers 8
+
+GET  /health
+GET  /scores?artist=A&artist=B          POST /scores   {"artists": [...]}
+GET  /scores/top?n=10&order_by=rank&ascending=true
+GET  /scores/formula?expr=0.6*frequency_normalized%2B0.4*rank_sum_normalized&n=10
+GET  /similar?artist=A&k=5              POST /similar  {"artists": [...], "k": 5}
+GET  /decision?scaling=min_max|rank_percentile|robust
+GET  /fees/overlap?low=0&high=50000&genre=Pop
+GET  /fees/cheapest?budget=100000&n=10  POST /fees/cheapest {"queries": [{"budget": ..., "n": ..., "genre": ...}]}
+"""
+import argparse
+import functools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from artist_store import ArtistStore
+from data_bundle import (ARTIST_GENRES_PATH, SCORES_PATH, SUPPORTING_ARTISTS_PATH, TRACK_FEATURES_PATH,
+                         build_genre_index, cached_similarity_index)
+from decision_matrix import DECISION_CRITERIA, build_decision_matrix
+from fee_index import FeeIndex
+from formula import FormulaError, rank_by_formula
+from normalization import METHODS, ScoreNormalizer
+from result_cache import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK = 1000
+
+
+class BadRequest(ValueError):
+    pass
+
+
+@functools.lru_cache(maxsize=1)
+def load_artist_store(source_hash):
+    store = ArtistStore()
+    store.sync_scores(SCORES_PATH)
+    return store
+
+
+@functools.lru_cache(maxsize=2)
+def load_score_normalizer(data_version):
+    columns = ['ranking_score', 'frequency', 'rank_sum']
+    return ScoreNormalizer.fit(get_artist_store().iter_scores(columns), columns)
+
+
+@functools.lru_cache(maxsize=32)
+def load_formula_ranking(data_version, formula):
+    return rank_by_formula(get_artist_store().current_scores(), formula)
+
+
+# The fit itself is shared with the dashboard through the disk cache; this only holds the loaded index
+@functools.lru_cache(maxsize=2)
+def load_similarity_index(source_hash):
+    return cached_similarity_index()
+
+
+@functools.lru_cache(maxsize=2)
+def load_fee_index(source_hash):
+    return FeeIndex.from_csv(SUPPORTING_ARTISTS_PATH)
+
+
+@functools.lru_cache(maxsize=2)
+def load_genre_index(source_hash, fee_source_hash):
+    return build_genre_index(load_fee_index(fee_source_hash), ARTIST_GENRES_PATH)
+
+
+def get_artist_store():
+    # Re-synced from the scores file whenever its content changes
+    return load_artist_store(file_fingerprint(SCORES_PATH))
+
+
+def similarity_index():
+    return load_similarity_index(file_fingerprint(TRACK_FEATURES_PATH))
+
+
+def fee_index():
+    return load_fee_index(file_fingerprint(SUPPORTING_ARTISTS_PATH))
+
+
+def genre_index():
+    return load_genre_index(file_fingerprint(ARTIST_GENRES_PATH), file_fingerprint(SUPPORTING_ARTISTS_PATH))
+
+
+def records(df):
+    # DataFrame rows as JSON-ready dicts, with NaN as null
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _number(params, name, default=None, cast=float):
+    values = params.get(name)
+    if not values:
+        if default is None:
+            raise BadRequest(f"Missing parameter: {name}")
+        return default
+    return _cast(values[0], name, cast)
+
+
+def _cast(value, name, cast=float):
+    # Query-string or JSON value as a number; anything unparseable is the client's error
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"Invalid value for {name}: {value}")
+
+
+def _count(value, name):
+    # Number of results to return; LIMIT -1 and head(-n) would quietly return (almost) every row
+    if isinstance(value, bool) or not isinstance(value, (int, np.integer)) or value < 1:
+        raise BadRequest(f"{name} must be a whole number of at least 1")
+    return int(value)
+
+
+def _names(values):
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise BadRequest("Expected a list of artist names")
+    if len(values) > MAX_BULK:
+        raise BadRequest(f"At most {MAX_BULK} artists per request")
+    return values
+
+
+# Endpoint implementations, shared by the GET and bulk POST routes
+
+def scores(artists):
+    found = get_artist_store().artist_scores(_names(artists))
+    return {'data_version': get_artist_store().data_version(), 'scores': records(found)}
+
+
+def top_scores(n, order_by, ascending):
+    n = _count(n, 'n')
+    try:
+        top = get_artist_store().top_artists(n, order_by, ascending)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    return {'data_version': get_artist_store().data_version(), 'scores': records(top)}
+
+
+def formula_scores(formula, n):
+    n = _count(n, 'n')
+    try:
+        ranked = load_formula_ranking(get_artist_store().data_version(), formula.strip())
+    except FormulaError as e:
+        raise BadRequest(str(e))
+    return {'data_version': get_artist_store().data_version(), 'scores': records(ranked.head(n))}
+
+
+def similar(artists, k):
+    k = _count(k, 'k')
+    index = similarity_index()
+    artists = _names(artists)
+    unknown = [artist for artist in artists if artist not in index]
+    return {'neighbors': records(index.neighbors(artists, k=k)), 'unknown': unknown}
+
+
+def decision(scaling):
+    if scaling not in METHODS:
+        raise BadRequest(f"scaling must be one of {', '.join(METHODS)}")
+    store = get_artist_store()
+    normalizer = load_score_normalizer(store.data_version())
+    matrix = build_decision_matrix(genre_index(), normalizer, scaling,
+                                   scores=store.artist_scores(DECISION_CRITERIA['Artist']))
+    return {'decision_matrix': records(matrix.sort_values('Total_Score', ascending=False))}
+
+
+def fees_overlap(low, high, genre):
+    index = fee_index()
+    found = index.overlapping(low, high, genre)
+    return {'count': len(found), 'artists': records(found)}
+
+
+def fees_cheapest(budget, n, genre):
+    return {'artists': records(fee_index().cheapest(budget, _count(n, 'n'), genre))}
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    server_version = "ConcertAPI/1.0"
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, handler):
+        try:
+            self._send(200, handler())
+        except BadRequest as e:
+            self._send(400, {'error': str(e)})
+        except Exception:
+            logger.exception("Request failed: %s", self.path)
+            self._send(500, {'error': 'internal error'})
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            raise BadRequest("Request body must be JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return body
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        routes = {
+            '/health': lambda: {'status': 'ok', 'data_version': get_artist_store().data_version()},
+            '/scores': lambda: scores(params.get('artist', [])),
+            '/scores/top': lambda: top_scores(
+                _number(params, 'n', 10, int),
+                params.get('order_by', ['ranking_score'])[0],
+                params.get('ascending', ['false'])[0].lower() == 'true'),
+            '/scores/formula': lambda: formula_scores(params.get('expr', [''])[0], _number(params, 'n', 10, int)),
+            '/similar': lambda: similar(params.get('artist', []), _number(params, 'k', 5, int)),
+            '/decision': lambda: decision(params.get('scaling', ['min_max'])[0]),
+            '/fees/overlap': lambda: fees_overlap(
+                _number(params, 'low', 0.0), _number(params, 'high'), params.get('genre', [None])[0]),
+            '/fees/cheapest': lambda: fees_cheapest(
+                _number(params, 'budget'), _number(params, 'n', 10, int), params.get('genre', [None])[0]),
+        }
+        if url.path not in routes:
+            self._send(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+        self._dispatch(routes[url.path])
+
+    def do_POST(self):
+        url = urlparse(self.path)
+
+        def bulk_cheapest(body):
+            queries = body.get('queries', [])
+            if not isinstance(queries, list) or len(queries) > MAX_BULK:
+                raise BadRequest(f"Expected a list of at most {MAX_BULK} queries")
+            results = []
+            for query in queries:
+                try:
+                    budget = float(query['budget'])
+                except (KeyError, TypeError, ValueError):
+                    raise BadRequest("Each query needs a numeric budget")
+                results.append(fees_cheapest(budget, query.get('n', 10), query.get('genre')))
+            return {'results': results}
+
+        routes = {
+            '/scores': lambda body: scores(body.get('artists', [])),
+            '/similar': lambda body: similar(body.get('artists', []), body.get('k', 5)),
+            '/fees/cheapest': bulk_cheapest,
+        }
+        if url.path not in routes:
+            self._send(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+        self._dispatch(lambda: routes[url.path](self._body()))
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    # HTTPServer that hands each connection to a fixed pool of worker threads
+    daemon_threads = True
+
+    def __init__(self, address, handler, workers=8):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def serve(host='127.0.0.1', port=8765, workers=8):
+    server = PooledHTTPServer((host, port), APIHandler, workers)
+    # Build the indexes up front so the first requests do not pay for them
+    get_artist_store()
+    similarity_index()
+    genre_index()
+    logger.info("Serving on http://%s:%d with %d workers", host, port, workers)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    serve(args.host, args.port, args.workers)
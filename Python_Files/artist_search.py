@@ -0,0 +1,91 @@
+"""Prefix and trigram index for fuzzy artist lookup over the full universe.
+
+Names are normalized (lowercase, accents stripped) and indexed twice: a
+sorted array for prefix lookups via binary search, and CSR-style trigram
+posting lists for fuzzy matches. A query gathers the postings of its
+trigrams, counts shared trigrams per candidate in one vectorized pass and
+ranks the candidates by Dice similarity, so lookups stay in the low milliseconds for
+hundreds of thousands of names.
+"""
+import unicodedata
+
+import numpy as np
+
+
+def normalize_name(name):
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ArtistSearchIndex:
+    def __init__(self, names):
+        self.names = np.asarray(list(dict.fromkeys(names)), dtype=object)
+        normalized = [normalize_name(name) for name in self.names]
+
+        # Prefix index: normalized names sorted, with a map back to the original rows
+        self._prefix_order = np.argsort(np.asarray(normalized, dtype=object), kind='stable')
+        self._sorted_names = np.asarray(normalized, dtype=object)[self._prefix_order]
+
+        # Trigram index: gram ids -> posting lists of name ids (CSR layout)
+        gram_ids = {}
+        gram_col, name_col = [], []
+        self._gram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for name_id, text in enumerate(normalized):
+            grams = trigrams(text)
+            self._gram_counts[name_id] = len(grams)
+            for gram in grams:
+                gram_col.append(gram_ids.setdefault(gram, len(gram_ids)))
+                name_col.append(name_id)
+        gram_col = np.asarray(gram_col, dtype=np.int32)
+        name_col = np.asarray(name_col, dtype=np.int32)
+        order = np.argsort(gram_col, kind='stable')
+        self._postings = name_col[order]
+        self._offsets = np.zeros(len(gram_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_col, minlength=len(gram_ids)), out=self._offsets[1:])
+        self._gram_ids = gram_ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def prefix(self, query, limit=10):
+        # Names whose normalized form starts with `query`, in alphabetical order
+        query = normalize_name(query)
+        if not query:
+            return []
+        lo = np.searchsorted(self._sorted_names, query, side='left')
+        hi = np.searchsorted(self._sorted_names, query + '\uffff', side='left')
+        return list(self.names[self._prefix_order[lo:min(hi, lo + limit)]])
+
+    def fuzzy(self, query, limit=10, min_score=0.2):
+        # (name, Dice similarity) pairs for names sharing the most trigrams with `query`
+        query_grams = trigrams(normalize_name(query))
+        grams = [self._gram_ids[g] for g in query_grams if g in self._gram_ids]
+        if not grams:
+            return []
+        query_size = len(query_grams)
+        hits = np.concatenate([self._postings[self._offsets[g]:self._offsets[g + 1]] for g in grams])
+        candidates, shared = np.unique(hits, return_counts=True)
+        scores = 2.0 * shared / (query_size + self._gram_counts[candidates])
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.names[i], float(s)) for i, s in zip(candidates[order], scores[order])]
+
+    def search(self, query, limit=10):
+        # Exact and prefix matches first, then fuzzy matches, without duplicates
+        results = {}
+        for name in self.prefix(query, limit):
+            results[name] = 1.0 if normalize_name(name) == normalize_name(query) else 0.99
+        for name, score in self.fuzzy(query, limit):
+            results.setdefault(name, score)
+        ranked = sorted(results.items(), key=lambda item: -item[1])
+        return ranked[:limit]
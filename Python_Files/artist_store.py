@@ -0,0 +1,274 @@
+"""Embedded SQLite store for artist scores, chart history and Spotify features.
+
+The dashboard views issue their top-N and filter queries against this store
+instead of loading whole tables into pandas, so each page only reads the rows
+it renders. Tables are (re)built from their sources whenever the source
+fingerprint changes.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from result_cache import file_fingerprint, fingerprint
+from scoring import SCORE_COLUMNS, fold_chart_entries, score_frame
+
+STORE_PATH = os.environ.get(
+    "CONCERT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "concert_store.sqlite")
+)
+
+# Column definitions per table, in source-column order
+TABLES = {
+    "artist_scores": [
+        ("artists", "TEXT PRIMARY KEY"),
+        ("frequency", "INTEGER"),
+        ("rank_sum", "REAL"),
+        ("ranking_score", "REAL"),
+        ("rank", "REAL"),
+        ("rank_sum_normalized", "REAL"),
+        ("frequency_normalized", "REAL"),
+    ],
+    "spotify_features": [
+        ("Artists", "TEXT PRIMARY KEY"),
+        ("danceability", "REAL"),
+        ("energy", "REAL"),
+        ("speechiness", "REAL"),
+        ("acousticness", "REAL"),
+        ("liveness", "REAL"),
+        ("valence", "REAL"),
+        ("tempo", "REAL"),
+        ("popularity", "REAL"),
+        ("daily_rank", "INTEGER"),
+        ("daily_movement", "INTEGER"),
+        ("weekly_movement", "INTEGER"),
+        ("Minimum Fees (in Dollars)", "REAL"),
+    ],
+    "chart_entries": [
+        ("date", "TEXT"),
+        ("artists", "TEXT"),
+        ("position", "INTEGER"),
+    ],
+}
+
+# Number of earlier artist_scores versions kept in score_history for diffs
+HISTORY_VERSIONS = 10
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_scores_rank ON artist_scores (rank)",
+    "CREATE INDEX IF NOT EXISTS idx_scores_score ON artist_scores (ranking_score DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_charts_artist ON chart_entries (artists, date)",
+    "CREATE INDEX IF NOT EXISTS idx_charts_date ON chart_entries (date)",
+]
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class ArtistStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS ingested_files (source_hash TEXT PRIMARY KEY, name TEXT, version INTEGER)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS score_history (version INTEGER, artists TEXT, frequency INTEGER, "
+                "rank_sum REAL, ranking_score REAL, rank REAL, PRIMARY KEY (version, artists))"
+            )
+            for table, columns in TABLES.items():
+                column_sql = ", ".join(f"{_quote(name)} {kind}" for name, kind in columns)
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column_sql})")
+            for statement in INDEXES:
+                conn.execute(statement)
+            # Songs are served by SongCatalog; drop the table older stores still carry
+            conn.execute("DROP TABLE IF EXISTS songs")
+            conn.execute("DELETE FROM meta WHERE key = 'source:songs'")
+
+    def _connection(self):
+        # Streamlit runs each session in its own thread, so keep one connection per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # Write transaction; BEGIN IMMEDIATE serializes writers across processes
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get_meta(self, key, default=None):
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def data_version(self):
+        # Bumped in the same transaction as every change to artist_scores
+        return int(self.get_meta("data_version", 0))
+
+    def _current_version(self, conn):
+        return int((conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone() or [0])[0])
+
+    def _bump_version(self, conn):
+        version = self._current_version(conn) + 1
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('data_version', ?)", (str(version),))
+        return version
+
+    def query(self, sql, params=()):
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    # Loading
+
+    def replace_table(self, table, df, source_hash=None):
+        # Swap the contents of `table` for `df`, skipping the write if the source is unchanged
+        columns = [name for name, _ in TABLES[table]]
+        source_hash = source_hash or fingerprint(df)
+        meta_key = f"source:{table}"
+        if self.get_meta(meta_key) == source_hash:
+            return False
+        rows = df[columns].astype(object).where(df[columns].notna(), None).values.tolist()
+        placeholders = ", ".join("?" for _ in columns)
+        column_sql = ", ".join(_quote(name) for name in columns)
+        with self._transaction() as conn:
+            if table == "artist_scores":
+                self._archive_scores(conn)
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(f"INSERT INTO {table} ({column_sql}) VALUES ({placeholders})", rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, source_hash))
+            if table == "artist_scores":
+                self._bump_version(conn)
+        return True
+
+    def sync_scores(self, csv_path):
+        # Reload artist_scores only when the CSV content changed
+        source_hash = file_fingerprint(csv_path)
+        if self.get_meta("source:artist_scores") == source_hash:
+            return False
+        return self.replace_table("artist_scores", pd.read_csv(csv_path), source_hash)
+
+    def publish_chart_entries(self, entries, source_hash, name=""):
+        # Fold daily chart rows into artist_scores and publish a new data version atomically.
+        # Returns the new version, or None if this file was already ingested.
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM ingested_files WHERE source_hash = ?", (source_hash,)).fetchone():
+                return None
+            current = pd.read_sql_query("SELECT artists, frequency, rank_sum FROM artist_scores", conn)
+            scores = fold_chart_entries(current, entries)
+            conn.executemany(
+                "INSERT INTO chart_entries (date, artists, position) VALUES (?, ?, ?)",
+                entries[["date", "artists", "position"]].values.tolist()
+            )
+            self._write_scores(conn, scores)
+            version = self._bump_version(conn)
+            conn.execute("INSERT INTO ingested_files (source_hash, name, version) VALUES (?, ?, ?)",
+                         (source_hash, name, version))
+            return version
+
+    def publish_scores(self, scores, source_hash, name=""):
+        # Replace artist_scores with a full snapshot and publish a new data version atomically
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM ingested_files WHERE source_hash = ?", (source_hash,)).fetchone():
+                return None
+            self._write_scores(conn, score_frame(scores))
+            version = self._bump_version(conn)
+            conn.execute("INSERT INTO ingested_files (source_hash, name, version) VALUES (?, ?, ?)",
+                         (source_hash, name, version))
+            return version
+
+    def _archive_scores(self, conn):
+        # Keep the outgoing artist_scores under its version so later versions can be diffed against it
+        version = self._current_version(conn)
+        conn.execute("DELETE FROM score_history WHERE version = ? OR version <= ?", (version, version - HISTORY_VERSIONS))
+        conn.execute(
+            "INSERT INTO score_history SELECT ?, artists, frequency, rank_sum, ranking_score, rank FROM artist_scores",
+            (version,)
+        )
+
+    def _write_scores(self, conn, scores):
+        self._archive_scores(conn)
+        placeholders = ", ".join("?" for _ in SCORE_COLUMNS)
+        conn.execute("DELETE FROM artist_scores")
+        conn.executemany(
+            f"INSERT INTO artist_scores ({', '.join(_quote(c) for c in SCORE_COLUMNS)}) VALUES ({placeholders})",
+            scores[SCORE_COLUMNS].astype(object).values.tolist()
+        )
+
+    def sync_features(self, features_df):
+        return self.replace_table("spotify_features", features_df)
+
+    # Queries
+
+    def _order_column(self, table, column):
+        # ORDER BY targets cannot be bound as parameters, so validate them against the schema
+        if column not in [name for name, _ in TABLES[table]]:
+            raise ValueError(f"Unknown column for {table}: {column}")
+        return _quote(column)
+
+    def top_artists(self, n, order_by="ranking_score", ascending=False):
+        direction = "ASC" if ascending else "DESC"
+        return self.query(
+            f"SELECT * FROM artist_scores ORDER BY {self._order_column('artist_scores', order_by)} {direction}, rowid LIMIT ?",
+            (int(n),)
+        )
+
+    def artists_by_rank(self, max_rank, include=()):
+        # Artists ranked at or above `max_rank`, plus any explicitly included names
+        placeholders = ", ".join("?" for _ in include) or "NULL"
+        return self.query(
+            f"SELECT * FROM artist_scores WHERE rank <= ? OR artists IN ({placeholders}) ORDER BY rank",
+            (max_rank, *include)
+        )
+
+    def artist_scores(self, artists):
+        placeholders = ", ".join("?" for _ in artists) or "NULL"
+        return self.query(f"SELECT * FROM artist_scores WHERE artists IN ({placeholders})", tuple(artists))
+
+    def features_for(self, artists):
+        placeholders = ", ".join("?" for _ in artists) or "NULL"
+        return self.query(
+            f"SELECT * FROM spotify_features WHERE Artists IN ({placeholders}) ORDER BY rowid", tuple(artists)
+        )
+
+    def chart_entries(self):
+        return self.query("SELECT date, artists, position FROM chart_entries ORDER BY date")
+
+    def current_scores(self):
+        return self.query("SELECT * FROM artist_scores ORDER BY rank, rowid")
+
+    def iter_scores(self, columns, chunksize=10000):
+        # artist_scores columns in chunks, for single-pass statistics over the scored universe
+        column_sql = ", ".join(self._order_column("artist_scores", column) for column in columns)
+        return pd.read_sql_query(f"SELECT {column_sql} FROM artist_scores", self._connection(), chunksize=chunksize)
+
+    def artist_names(self):
+        # Every known artist: the scored universe in rank order, then feature-only artists
+        return self.query(
+            "SELECT artists FROM (SELECT artists, rank, rowid AS row FROM artist_scores "
+            "UNION SELECT Artists, NULL, NULL FROM spotify_features "
+            "WHERE Artists NOT IN (SELECT artists FROM artist_scores)) "
+            "ORDER BY rank IS NULL, rank, row"
+        )["artists"].tolist()
+
+    def score_snapshot(self, version=None):
+        # artist_scores as of `version`; the latest archived version when None
+        if version is None:
+            row = self._connection().execute("SELECT MAX(version) FROM score_history").fetchone()
+            if row[0] is None:
+                return None
+            version = row[0]
+        return self.query(
+            "SELECT artists, frequency, rank_sum, ranking_score, rank FROM score_history WHERE version = ?",
+            (int(version),)
+        )
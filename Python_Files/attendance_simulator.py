@@ -0,0 +1,134 @@
+"""Monte Carlo attendance and gross projections for candidate lineups.
+
+Expected demand in each age group is
+
+    reachable market x conversion x age share x lineup appeal
+
+A lineup's appeal to an age group is the chance that at least one act draws
+a fan from it. Each act's draw is its chart popularity times the group's
+preference for the act's genres, taken from the music_prefs table. Support
+acts draw at SUPPORT_PULL of a headliner's weight.
+
+Each scenario applies a mean-one lognormal shock to the whole market, one
+per age group and one to the average ticket price, then draws Poisson demand
+per group. Attendance is demand capped at the venue capacity. All lineups
+are simulated in the same array pass with shared shocks (common random
+numbers), so their differences come from the lineups, not the noise.
+Scenarios are processed in seeded blocks, which can run on a process pool
+with results identical to a serial run.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Capital One Arena, end-stage concert configuration
+ARENA_CAPACITY = 20356
+
+# Reachable DC-metro music fans and the share of them who would buy for a fully appealing bill
+MARKET_SIZE = 6_300_000
+CONVERSION = 0.005
+TICKET_PRICE = 150.0
+
+MARKET_SIGMA = 0.35
+GROUP_SIGMA = 0.15
+PRICE_SIGMA = 0.10
+
+SUPPORT_PULL = 0.35
+POPULARITY_FLOOR = 0.3
+
+# music_prefs column -> keywords matched against an artist's genre names
+GENRE_KEYWORDS = {
+    'Pop': ('pop',),
+    'Rock': ('rock', 'alternative', 'indie', 'punk'),
+    'Hip_Hop': ('hip hop', 'rap', 'trap', 'r&b'),
+    'Country': ('country', 'americana', 'folk'),
+    'Electronic': ('electro', 'synth', 'dance', 'edm', 'house'),
+    'Classical': ('classical', 'orchestral'),
+}
+
+SCENARIO_BLOCK = 20_000
+
+
+def genre_appeal(genres, music_prefs):
+    # Share (0-1) of each age group drawn to an artist's genres: the best-liked matching preference column
+    names = [genre.lower() for genre in genres]
+    columns = [column for column, keywords in GENRE_KEYWORDS.items()
+               if column in music_prefs and any(keyword in name for name in names for keyword in keywords)]
+    return music_prefs[columns or ['Pop']].max(axis=1).to_numpy(dtype=float) / 100
+
+
+def lineup_appeal(lineup, popularity, artist_genres, music_prefs, support_pull=SUPPORT_PULL):
+    # Probability that a fan in each age group is drawn by at least one act; the first act headlines
+    missed = np.ones(len(music_prefs))
+    for position, artist in enumerate(lineup):
+        pull = (1.0 if position == 0 else support_pull) * (
+            POPULARITY_FLOOR + (1 - POPULARITY_FLOOR) * popularity.get(artist, 0.0))
+        missed *= 1 - pull * genre_appeal(artist_genres.get(artist, []), music_prefs)
+    return 1 - missed
+
+
+def expected_demand(lineups, popularity, artist_genres, age_df, music_prefs, market_size=MARKET_SIZE,
+                    conversion=CONVERSION):
+    # Expected buyers at the reference ticket price, as a (lineups x age groups) array in music_prefs order
+    shares = (age_df.set_index('age_group')['percentage']
+              .reindex(music_prefs['Age_Group']).fillna(0).to_numpy(dtype=float))
+    shares = shares / shares.sum()
+    return np.stack([
+        market_size * conversion * shares * lineup_appeal(lineup, popularity, artist_genres, music_prefs)
+        for lineup in lineups
+    ])
+
+
+def _lognormal_shock(rng, sigma, size):
+    # Mean-one multiplicative noise
+    return rng.lognormal(-sigma ** 2 / 2, sigma, size)
+
+
+def _simulate_block(expected, capacity, ticket_price, n_scenarios, seed, market_sigma, group_sigma, price_sigma):
+    # Attendance and gross of every lineup (columns) in `n_scenarios` scenarios (rows)
+    rng = np.random.default_rng(seed)
+    n_groups = expected.shape[1]
+    market = _lognormal_shock(rng, market_sigma, (n_scenarios, 1, 1))
+    group = _lognormal_shock(rng, group_sigma, (n_scenarios, 1, n_groups))
+    price = ticket_price * _lognormal_shock(rng, price_sigma, (n_scenarios, 1))
+    demand = rng.poisson(expected[None, :, :] * market * group).sum(axis=2)
+    attendance = np.minimum(demand, capacity)
+    return demand, attendance, attendance * price
+
+
+def simulate_lineups(lineups, popularity, artist_genres, age_df, music_prefs, capacity=ARENA_CAPACITY,
+                     market_size=MARKET_SIZE, conversion=CONVERSION, ticket_price=TICKET_PRICE,
+                     n_scenarios=100_000, seed=0, max_workers=1, market_sigma=MARKET_SIGMA,
+                     group_sigma=GROUP_SIGMA, price_sigma=PRICE_SIGMA):
+    # Per-lineup summary plus the raw (scenarios x lineups) attendance and gross arrays
+    names = list(lineups)
+    expected = expected_demand([lineups[name] for name in names], popularity, artist_genres, age_df, music_prefs,
+                               market_size, conversion)
+
+    block_sizes = [min(SCENARIO_BLOCK, n_scenarios - start) for start in range(0, n_scenarios, SCENARIO_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+    fixed = (expected, capacity, ticket_price)
+    noise = (market_sigma, group_sigma, price_sigma)
+    if max_workers == 1 or len(block_sizes) <= 1:
+        results = [_simulate_block(*fixed, size, block_seed, *noise) for size, block_seed in zip(block_sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_simulate_block, *fixed, size, block_seed, *noise)
+                       for size, block_seed in zip(block_sizes, seeds)]
+            results = [future.result() for future in futures]
+    demand, attendance, gross = (np.concatenate(parts) for parts in zip(*results))
+
+    summary = pd.DataFrame({
+        'lineup': names,
+        'expected_demand': expected.sum(axis=1),
+        'attendance_mean': attendance.mean(axis=0),
+        'attendance_p5': np.percentile(attendance, 5, axis=0),
+        'attendance_p50': np.percentile(attendance, 50, axis=0),
+        'attendance_p95': np.percentile(attendance, 95, axis=0),
+        'sellout_probability': (demand >= capacity).mean(axis=0),
+        'gross_mean': gross.mean(axis=0),
+        'gross_p5': np.percentile(gross, 5, axis=0),
+        'gross_p95': np.percentile(gross, 95, axis=0),
+    })
+    return summary, attendance, gross
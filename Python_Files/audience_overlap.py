@@ -0,0 +1,178 @@
+"""MinHash sketches of each artist's listeners, for audience-overlap estimates.
+
+Listener or ticket-buyer files have one (artist, listener_id) row per
+listener per artist. They are streamed in chunks, and IDs are hashed to 64
+bits. Integer IDs, whole-number float IDs and all-digit text IDs (with or
+without a trailing ".0") go through a numeric mix, so numeric and text
+exports of the same IDs agree. Any other text uses pandas' string
+hash. Each of `num_perm` seeded splitmix64 mixes acts as a random
+permutation. An artist's signature is the per-permutation minimum over their
+listeners. Within a chunk it comes from one np.minimum.reduceat over the rows
+grouped by artist.
+
+The share of equal signature slots estimates the Jaccard overlap of two
+audiences, with standard error about sqrt(J(1 - J) / num_perm). Signatures
+are saved to an .npz next to the result cache, tagged with the source files'
+fingerprints. Later runs reload them instead of rescanning the files.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from result_cache import CACHE_DIR, file_fingerprint
+
+LISTENERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "listeners.csv")
+SKETCH_PATH = os.path.join(CACHE_DIR, "audience_sketches.npz")
+
+NUM_PERM = 128
+# Bumped whenever hash_ids changes, so saved sketches built with the old hashing are rebuilt
+ID_HASH_VERSION = 3
+EMPTY = np.iinfo(np.uint64).max
+
+# Permutations mixed per pass, so a chunk allocates rows x PERM_BLOCK hashes at a time
+PERM_BLOCK = 32
+# Artists per block of the pairwise comparison
+PAIR_BLOCK = 256
+
+
+def _mix(x):
+    # splitmix64 finalizer; uint64 arithmetic wraps, which is what the mix relies on
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xbf58476d1ce4e5b9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_ids(ids):
+    # 64-bit hash per ID; integer-valued IDs skip the (much slower) string hashing
+    ids = np.asarray(ids)
+    if ids.dtype.kind in 'iu':
+        return _mix(ids.astype(np.uint64))
+    if ids.dtype.kind == 'f':
+        # A column with missing IDs is read as float64; whole numbers hash like the integers they were
+        integral = np.isfinite(ids) & (ids == np.floor(ids)) & (np.abs(ids) < 1e18)
+        hashes = np.empty(len(ids), dtype=np.uint64)
+        hashes[integral] = _mix(ids[integral].astype(np.int64).astype(np.uint64))
+        hashes[~integral] = hash_ids(ids[~integral].astype(object))
+        return hashes
+    text = pd.Series(ids, dtype=object).astype(str)
+    # All-digit text, optionally with a trailing ".0" from a float export, takes the numeric path
+    digits = text.str.fullmatch(r'\d{1,18}(?:\.0+)?').to_numpy(dtype=bool)
+    hashes = np.empty(len(text), dtype=np.uint64)
+    whole = text[digits].str.replace(r'\.0+$', '', regex=True)
+    hashes[digits] = _mix(whole.astype(np.int64).to_numpy().astype(np.uint64))
+    hashes[~digits] = pd.util.hash_pandas_object(text[~digits], index=False).to_numpy()
+    return hashes
+
+
+class AudienceSketches:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        self.num_perm = num_perm
+        self.seeds = np.random.default_rng(seed).integers(0, EMPTY, num_perm, dtype=np.uint64, endpoint=True)
+        self.artists = []
+        self._rows = {}
+        self.signatures = np.full((0, num_perm), EMPTY, dtype=np.uint64)
+
+    def __contains__(self, artist):
+        return artist in self._rows
+
+    def _artist_rows(self, names):
+        # Row of each name, appending empty signatures for artists seen for the first time
+        new = [name for name in names if name not in self._rows]
+        for name in new:
+            self._rows[name] = len(self.artists)
+            self.artists.append(name)
+        if new:
+            self.signatures = np.vstack([self.signatures, np.full((len(new), self.num_perm), EMPTY, dtype=np.uint64)])
+        return np.array([self._rows[name] for name in names], dtype=int)
+
+    def update(self, artists, listener_ids):
+        codes, names = pd.factorize(pd.Series(artists))
+        if len(codes) == 0:
+            return self
+        rows = self._artist_rows(list(names))
+        order = np.argsort(codes, kind='stable')
+        hashes = hash_ids(np.asarray(listener_ids)[order])
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+        groups = rows[codes[order][starts]]
+        for start in range(0, self.num_perm, PERM_BLOCK):
+            block = slice(start, start + PERM_BLOCK)
+            mins = np.minimum.reduceat(_mix(hashes[:, None] ^ self.seeds[None, block]), starts, axis=0)
+            self.signatures[groups, block] = np.minimum(self.signatures[groups, block], mins)
+        return self
+
+    def merge(self, other):
+        if other.num_perm != self.num_perm or not np.array_equal(other.seeds, self.seeds):
+            raise ValueError("Sketches were built with different permutations")
+        rows = self._artist_rows(other.artists)
+        self.signatures[rows] = np.minimum(self.signatures[rows], other.signatures)
+        return self
+
+    @classmethod
+    def from_csv(cls, paths, chunksize=1_000_000, artist_column='artist', id_column='listener_id',
+                 num_perm=NUM_PERM, seed=1):
+        sketches = cls(num_perm, seed)
+        for path in paths:
+            for chunk in pd.read_csv(path, usecols=[artist_column, id_column], chunksize=chunksize):
+                chunk = chunk.dropna()
+                sketches.update(chunk[artist_column].to_numpy(), chunk[id_column].to_numpy())
+        return sketches
+
+    def jaccard(self, artist, other):
+        # Estimated Jaccard overlap of two artists' audiences
+        a, b = self.signatures[self._rows[artist]], self.signatures[self._rows[other]]
+        return float(np.count_nonzero(a == b)) / self.num_perm
+
+    def pairwise(self, artists=None):
+        # Estimated Jaccard overlap for every pair of `artists` (all artists by default), as a DataFrame
+        artists = list(self.artists if artists is None else artists)
+        signatures = self.signatures[[self._rows[artist] for artist in artists]]
+        overlap = np.empty((len(artists), len(artists)))
+        for start in range(0, len(artists), PAIR_BLOCK):
+            block = signatures[start:start + PAIR_BLOCK]
+            overlap[start:start + PAIR_BLOCK] = (block[:, None, :] == signatures[None, :, :]).mean(axis=2)
+        return pd.DataFrame(overlap, index=artists, columns=artists)
+
+    def most_overlapping(self, artist, n=10):
+        overlap = (self.signatures == self.signatures[self._rows[artist]]).mean(axis=1)
+        overlap[self._rows[artist]] = -1
+        top = np.argsort(-overlap, kind='stable')[:n]
+        return pd.DataFrame({'artist': np.asarray(self.artists, dtype=object)[top], 'jaccard': overlap[top]})
+
+    def save(self, path, source_hash=""):
+        # Write to a temporary file first so readers never see a partial sketch file
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, artists=np.asarray(self.artists, dtype=str), signatures=self.signatures,
+                 seeds=self.seeds, source_hash=np.asarray(source_hash))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        # Sketches and the source hash they were saved with
+        with np.load(path) as data:
+            sketches = cls(len(data['seeds']))
+            sketches.seeds = data['seeds']
+            sketches.artists = data['artists'].tolist()
+            sketches._rows = {artist: i for i, artist in enumerate(sketches.artists)}
+            sketches.signatures = data['signatures']
+            return sketches, str(data['source_hash'])
+
+
+def load_or_build(paths=(LISTENERS_PATH,), sketch_path=SKETCH_PATH, num_perm=NUM_PERM):
+    # Saved sketches when they match the current listener files, otherwise rebuild and save them
+    source_hash = "|".join(file_fingerprint(path) for path in paths) + f"|{num_perm}|{ID_HASH_VERSION}"
+    if os.path.exists(sketch_path):
+        try:
+            sketches, saved_hash = AudienceSketches.load(sketch_path)
+            if saved_hash == source_hash:
+                return sketches
+        except (OSError, ValueError, KeyError):
+            pass
+    sketches = AudienceSketches.from_csv(paths, num_perm=num_perm)
+    sketches.save(sketch_path, source_hash)
+    return sketches
@@ -0,0 +1,120 @@
+"""Bootstrap confidence intervals for ranking scores over chart days.
+
+The daily chart history is reduced to one (day, artist, contribution) triple
+per artist per day, where contribution is that day's share of ranking_score
+(RANKING_WEIGHTS applied to the appearance count and the 1 / position
+weights). A bootstrap resample draws chart days with replacement, so its
+scores are a weighted bincount of the contributions, weighted by how often
+each day was drawn. A block of resamples is handled by one bincount over
+offset artist codes. Blocks are independent and seeded from one
+SeedSequence, so they can run on a process pool and reproduce the same
+intervals for any worker count.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scoring import RANKING_WEIGHTS, position_weight
+
+# Resamples per block; a block allocates about RESAMPLE_BLOCK x (day, artist) pairs
+RESAMPLE_BLOCK = 100
+
+_worker_state = {}
+
+
+def daily_contributions(entries):
+    # (day code, artist code, ranking_score contribution) per artist per chart day, plus the labels
+    day_codes, days = pd.factorize(entries['date'])
+    artist_codes, artists = pd.factorize(entries['artists'])
+    contribution = RANKING_WEIGHTS['frequency'] + RANKING_WEIGHTS['rank_sum'] * position_weight(entries['position'])
+    pairs = pd.DataFrame({'day': day_codes, 'artist': artist_codes, 'contribution': contribution})
+    pairs = pairs.groupby(['day', 'artist'], sort=False, as_index=False)['contribution'].sum()
+    return (pairs['day'].to_numpy(), pairs['artist'].to_numpy(), pairs['contribution'].to_numpy(),
+            len(days), np.asarray(artists, dtype=object))
+
+
+def _init_worker(day, artist, contribution, n_days, n_artists, targets):
+    _worker_state['args'] = (day, artist, contribution, n_days, n_artists, targets)
+
+
+def _resample_block(day, artist, contribution, n_days, n_artists, targets, n_resamples, seed):
+    # Scores and ranks of the target artists in `n_resamples` day resamples
+    rng = np.random.default_rng(seed)
+    day_weights = np.stack([
+        np.bincount(rng.integers(0, n_days, n_days), minlength=n_days) for _ in range(n_resamples)
+    ])
+    offsets = (np.arange(n_resamples) * n_artists)[:, None]
+    scores = np.bincount(
+        (offsets + artist[None, :]).ravel(),
+        weights=(day_weights[:, day] * contribution[None, :]).ravel(),
+        minlength=n_resamples * n_artists
+    ).reshape(n_resamples, n_artists)
+    target_scores = scores[:, targets]
+    return target_scores, _ranks(scores, target_scores)
+
+
+def _ranks(scores, target_scores):
+    # Rank = 1 + number of artists scoring strictly higher in the same resample. Per resample, each
+    # artist's score is placed among the sorted target scores by binary search, and a histogram of
+    # those positions counts the artists above every target: O(n_artists log top_n) time, O(n_artists) memory.
+    n_targets = target_scores.shape[1]
+    ranks = np.empty(target_scores.shape, dtype=np.int64)
+    for row in range(len(scores)):
+        order = np.argsort(target_scores[row], kind='stable')
+        below = np.searchsorted(target_scores[row][order], scores[row], side='left')
+        # at_least[j] = artists scoring above at least j of the targets
+        at_least = np.cumsum(np.bincount(below, minlength=n_targets + 1)[::-1])[::-1]
+        ranks[row, order] = 1 + at_least[1:]
+    return ranks
+
+
+def _resample_block_in_worker(n_resamples, seed):
+    return _resample_block(*_worker_state['args'], n_resamples, seed)
+
+
+def bootstrap_scores(entries, n_resamples=2000, top_n=10, confidence=0.95, seed=0, max_workers=1):
+    # Observed score and rank of the top_n artists with bootstrap intervals, and the leader's lead over #2
+    day, artist, contribution, n_days, artists = daily_contributions(entries)
+    observed = np.bincount(artist, weights=contribution, minlength=len(artists))
+    order = np.argsort(-observed, kind='stable')
+    targets = order[:top_n]
+
+    block_sizes = [min(RESAMPLE_BLOCK, n_resamples - start) for start in range(0, n_resamples, RESAMPLE_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+    args = (day, artist, contribution, n_days, len(artists), targets)
+    if max_workers == 1 or len(block_sizes) <= 1:
+        results = [_resample_block(*args, size, block_seed) for size, block_seed in zip(block_sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=args) as pool:
+            results = list(pool.map(_resample_block_in_worker, block_sizes, seeds))
+    scores = np.concatenate([block_scores for block_scores, _ in results])
+    ranks = np.concatenate([block_ranks for _, block_ranks in results])
+
+    tail = (1 - confidence) / 2 * 100
+    low, high = tail, 100 - tail
+    observed_ranks = 1 + (observed[None, :] > observed[targets][:, None]).sum(axis=1)
+    summary = pd.DataFrame({
+        'artists': artists[targets],
+        'ranking_score': observed[targets],
+        'score_low': np.percentile(scores, low, axis=0),
+        'score_high': np.percentile(scores, high, axis=0),
+        'rank': observed_ranks,
+        'rank_low': np.percentile(ranks, low, axis=0, method='lower').astype(int),
+        'rank_high': np.percentile(ranks, high, axis=0, method='higher').astype(int),
+        'top_rank_share': (ranks == 1).mean(axis=0),
+    })
+
+    lead = None
+    if len(targets) >= 2:
+        # Percentage lead of the observed #1 over the observed #2, per resample
+        leads = (scores[:, 0] / scores[:, 1] - 1) * 100
+        lead = {
+            'leader': artists[targets[0]],
+            'runner_up': artists[targets[1]],
+            'lead_pct': float((observed[targets[0]] / observed[targets[1]] - 1) * 100),
+            'lead_low': float(np.percentile(leads, low)),
+            'lead_high': float(np.percentile(leads, high)),
+            'lead_positive_share': float((leads > 0).mean()),
+        }
+    return summary, lead
@@ -0,0 +1,136 @@
+"""Background worker that folds chart files dropped into a directory into the store.
+
+Two kinds of CSV are accepted in the drop directory:
+
+- daily chart files with `date`, `position` and `artists` columns, whose
+  appearances are added to the existing frequency and rank_sum totals;
+- full score snapshots in the artist_scores.csv layout, which replace the
+  current table.
+
+A file is only read once its size and modification time are unchanged
+between two polls, so a copy still in progress is not ingested truncated
+(and then ingested again in full under its new hash). Writers should still
+write to a dotfile (dotfiles are ignored) and rename it into place when done,
+which makes the file appear complete.
+
+Each file is published as one SQLite transaction that also bumps the store's
+data version, so open dashboard sessions pick up the new leaderboard on their
+next rerun and never see a half-applied file.
+"""
+import logging
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from result_cache import file_fingerprint
+from snapshot_diff import diff_snapshots, summarize
+
+logger = logging.getLogger(__name__)
+
+DROP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "incoming")
+
+CHART_COLUMNS = ['date', 'position', 'artists']
+SNAPSHOT_COLUMNS = ['artists', 'frequency', 'rank_sum']
+
+
+def read_chart_file(path):
+    # Load a dropped CSV and classify it as daily chart rows or a score snapshot
+    df = pd.read_csv(path)
+    if set(CHART_COLUMNS).issubset(df.columns):
+        entries = df[CHART_COLUMNS].dropna()
+        entries = entries.assign(
+            date=pd.to_datetime(entries['date']).dt.strftime('%Y-%m-%d'),
+            position=entries['position'].astype(int),
+            artists=entries['artists'].astype(str).str.strip()
+        )
+        if (entries['position'] < 1).any():
+            raise ValueError(f"{path}: chart positions must be 1 or higher")
+        return 'chart', entries
+    if set(SNAPSHOT_COLUMNS).issubset(df.columns):
+        return 'snapshot', df[SNAPSHOT_COLUMNS].dropna()
+    raise ValueError(f"{path}: expected columns {CHART_COLUMNS} or {SNAPSHOT_COLUMNS}")
+
+
+class ChartIngestWorker(threading.Thread):
+    def __init__(self, store, drop_dir=DROP_DIR, poll_seconds=5.0):
+        super().__init__(name="chart-ingest", daemon=True)
+        self.store = store
+        self.drop_dir = drop_dir
+        self.poll_seconds = poll_seconds
+        self._stop_event = threading.Event()
+        # (size, mtime) of each candidate file at the previous poll
+        self._last_seen = {}
+        for subdir in ("processed", "failed"):
+            os.makedirs(os.path.join(drop_dir, subdir), exist_ok=True)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+            except Exception:
+                logger.exception("Chart ingest scan failed")
+            self._stop_event.wait(self.poll_seconds)
+
+    def pending_files(self):
+        # Candidate files whose size and mtime have not changed since the previous poll
+        names = sorted(
+            name for name in os.listdir(self.drop_dir)
+            if name.endswith(".csv") and not name.startswith(".")
+        )
+        seen, ready = {}, []
+        for name in names:
+            path = os.path.join(self.drop_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            seen[path] = (stat.st_size, stat.st_mtime_ns)
+            if self._last_seen.get(path) == seen[path]:
+                ready.append(path)
+        self._last_seen = seen
+        return ready
+
+    def scan(self):
+        # Ingest every pending file in name order; returns the versions that were published
+        published = []
+        for path in self.pending_files():
+            version = self.ingest_file(path)
+            if version is not None:
+                published.append(version)
+        return published
+
+    def ingest_file(self, path):
+        name = os.path.basename(path)
+        try:
+            source_hash = file_fingerprint(path)
+            kind, df = read_chart_file(path)
+            if kind == 'chart':
+                version = self.store.publish_chart_entries(df, source_hash, name)
+            else:
+                version = self.store.publish_scores(df, source_hash, name)
+        except FileNotFoundError:
+            # Another dashboard process picked the file up first
+            return None
+        except Exception:
+            logger.exception("Could not ingest %s", name)
+            self._move(path, "failed")
+            return None
+        self._move(path, "processed")
+        if version is not None:
+            logger.info("Ingested %s as data version %s", name, version)
+            previous = self.store.score_snapshot(version - 1)
+            if previous is not None and not previous.empty:
+                logger.info("Ranking changes in version %s: %s", version,
+                            summarize(diff_snapshots(previous, self.store.current_scores())))
+        return version
+
+    def _move(self, path, subdir):
+        try:
+            shutil.move(path, os.path.join(self.drop_dir, subdir, os.path.basename(path)))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,68 @@
+"""Data files shared by the dashboard and the JSON API, and the builders for their indexes.
+
+Both front ends build their indexes from these same files with these same
+functions, and key their caches on the files' fingerprints. A change to any
+file therefore refreshes the dashboard and the API alike. The expensive
+builds also go through the disk-backed result cache, so every dashboard
+worker, the API and later restarts reuse one computation.
+"""
+import os
+
+import pandas as pd
+
+from genre_index import GenreIndex, split_genres
+from graph_layout import force_layout, similarity_edges
+from result_cache import disk_cached
+from similarity import SimilarityIndex
+from track_features import TRACK_FEATURES, aggregate_files
+
+BUNDLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCORES_PATH = os.path.join(BUNDLE_DIR, "artist_scores.csv")
+SONGS_PATH = os.path.join(BUNDLE_DIR, "songs.csv")
+CO_BILLINGS_PATH = os.path.join(BUNDLE_DIR, "co_billings.csv")
+SUPPORTING_ARTISTS_PATH = os.path.join(BUNDLE_DIR, "supporting_artists.csv")
+ARTIST_GENRES_PATH = os.path.join(BUNDLE_DIR, "artist_genres.csv")
+TRACK_FEATURES_PATH = os.path.join(BUNDLE_DIR, "track_features.csv")
+MILESTONES_PATH = os.path.join(BUNDLE_DIR, "milestones.csv")
+ALBUM_SALES_PATH = os.path.join(BUNDLE_DIR, "album_sales.csv")
+
+# Chart movement and booking fees for the artists we have them for
+ARTIST_PROFILES = {
+    'Artists': ['Sabrina Carpenter', 'Gracie Abrams', 'Olivia Rodrigo', 'Ariana Grande', 'Dua Lipa', 'Taylor Swift'],
+    'daily_rank': [10, 28, 5, 8, 7, 3],
+    'daily_movement': [1, 2, 0, -1, 1, 0],
+    'weekly_movement': [3, 5, -1, 0, 2, -2],
+    'Minimum Fees (in Dollars)': [500000, 150000, 450000, 650000, 550000, 800000]
+}
+
+
+def read_spotify_features(track_path=TRACK_FEATURES_PATH):
+    # Per-artist feature means, variances and track counts, with chart movement and fees where known
+    features_df = aggregate_files([track_path]).to_frame()
+    return features_df.merge(pd.DataFrame(ARTIST_PROFILES), on='Artists', how='left')
+
+
+def build_similarity_index(features_df):
+    return SimilarityIndex(features_df, TRACK_FEATURES)
+
+
+@disk_cached(data_files=[TRACK_FEATURES_PATH])
+def cached_similarity_index():
+    # Standardized features for KNN queries, fitted once per version of the track file
+    return build_similarity_index(read_spotify_features(TRACK_FEATURES_PATH))
+
+
+@disk_cached(data_files=[TRACK_FEATURES_PATH])
+def cached_similarity_layout(k=5):
+    # Top-k similarity edges and force-directed positions over every artist, in read_spotify_features row order
+    index = cached_similarity_index()
+    source, target, similarity = similarity_edges(index, k)
+    return source, target, similarity, force_layout(len(index), source, target, similarity)
+
+
+def build_genre_index(fee_index, path=ARTIST_GENRES_PATH):
+    # Headliner candidates first, then the supporting artists from the fee index
+    headliners = pd.read_csv(path)
+    headliners['genres'] = headliners['genres'].map(split_genres)
+    return GenreIndex.from_frames(headliners, fee_index.artists)
@@ -0,0 +1,51 @@
+"""Headliner decision matrix: criteria scores, weights and weighted totals.
+
+Genre_Match is computed from the genre bitsets. Ranking_Score is the
+candidate's current ranking_score from the artist store, falling back to the
+value recorded during the selection process for candidates the store does
+not score, and is scaled to 0-100 against ranking_score statistics from the
+whole scored universe. The other criteria are the hand-assessed 0-100 scores
+from the selection process.
+"""
+import pandas as pd
+
+from normalization import ScoreNormalizer
+
+DECISION_CRITERIA = {
+    'Artist': ['Sabrina Carpenter', 'Taylor Swift', 'Chappell Roan', 'Billie Eilish', 'Zach Bryan'],
+    'Ranking_Score': [814.86, 719.34, 565.93, 489.15, 547.12],
+    'Target_Demo_Match': [95, 85, 90, 90, 70],
+    'Tour_Availability': [90, 60, 85, 70, 80],
+    'Cost_Effectiveness': [85, 50, 90, 75, 80],
+    'Social_Engagement': [95, 90, 85, 90, 75]
+}
+
+DECISION_WEIGHTS = {
+    'Ranking_Score': 0.3,
+    'Genre_Match': 0.2,
+    'Target_Demo_Match': 0.2,
+    'Tour_Availability': 0.1,
+    'Cost_Effectiveness': 0.1,
+    'Social_Engagement': 0.1
+}
+
+
+def build_decision_matrix(genre_index, score_normalizer=None, method='min_max', weights=DECISION_WEIGHTS,
+                          scores=None):
+    # Criteria on a 0-100 scale, each criterion's weighted score and the weighted total.
+    # `scores` holds the live artists / ranking_score rows; without them the recorded Ranking_Score is used.
+    # `score_normalizer` holds ranking_score statistics; without one the candidates are scaled among themselves.
+    matrix = pd.DataFrame(DECISION_CRITERIA)
+    if scores is not None:
+        live = scores.drop_duplicates('artists').set_index('artists')['ranking_score']
+        matrix['Ranking_Score'] = matrix['Artist'].map(live).astype(float).fillna(matrix['Ranking_Score'])
+    matrix.insert(2, 'Genre_Match', genre_index.target_match(matrix['Artist']))
+
+    if score_normalizer is None:
+        score_normalizer = ScoreNormalizer.fit(matrix.rename(columns={'Ranking_Score': 'ranking_score'}), ['ranking_score'])
+    matrix['Ranking_Score'] = score_normalizer.normalize('ranking_score', matrix['Ranking_Score'], method) * 100
+
+    for column, weight in weights.items():
+        matrix[f'{column}_weighted'] = matrix[column] * weight
+    matrix['Total_Score'] = sum(matrix[f'{column}_weighted'] for column in weights)
+    return matrix
@@ -0,0 +1,172 @@
+"""HyperLogLog distinct counts of attendees per demographic segment.
+
+Raw attendee or listener event logs are streamed in chunks. Each event's ID
+is hashed once, and the hash updates the HyperLogLog registers of the event's
+segments: its age group, its campus and its genre preference, plus an
+all-attendees total. Every segment holds 2**p registers (4 KB at p = 12,
+about 1.6% standard error) whatever its size. Segment sketches merge by
+elementwise maximum, so the distinct count of any union of segments is
+estimated from the registers alone, without going back to the raw logs.
+Sketches are saved next to the result cache and rebuilt when the logs
+change.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from audience_overlap import ID_HASH_VERSION, hash_ids
+from result_cache import CACHE_DIR, file_fingerprint
+
+EVENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "attendee_events.csv.gz")
+SKETCH_PATH = os.path.join(CACHE_DIR, "segment_counts.npz")
+
+SEGMENT_DIMENSIONS = ['age_group', 'campus', 'genre']
+TOTAL = ('all', 'all')
+
+PRECISION = 12
+
+
+def _leading_zeros(x):
+    # Leading zero bits of each uint64, by a branch-free binary search over shifts
+    x = x.copy()
+    zeros = np.zeros(x.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = x < (np.uint64(1) << np.uint64(64 - shift))
+        zeros[empty] += shift
+        x[empty] <<= np.uint64(shift)
+    zeros[x == 0] += 1
+    return zeros
+
+
+def register_updates(hashes, p=PRECISION):
+    # Register index (top p bits) and rank (position of the first 1 bit in the rest) of each hash
+    index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    rank = np.minimum(_leading_zeros(hashes << np.uint64(p)) + 1, 64 - p + 1).astype(np.uint8)
+    return index, rank
+
+
+def estimate(registers):
+    # HyperLogLog estimate for one register row, with linear counting for small cardinalities
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(float)), axis=-1)
+    empty = np.count_nonzero(registers == 0, axis=-1)
+    linear = m * np.log(m / np.maximum(empty, 1))
+    return np.where((raw <= 2.5 * m) & (empty > 0), linear, raw)
+
+
+class SegmentCounts:
+    def __init__(self, dimensions=SEGMENT_DIMENSIONS, p=PRECISION):
+        self.dimensions = list(dimensions)
+        self.p = p
+        self.segments = [TOTAL]
+        self._rows = {TOTAL: 0}
+        self.registers = np.zeros((1, 1 << p), dtype=np.uint8)
+
+    def _segment_rows(self, keys):
+        new = [key for key in keys if key not in self._rows]
+        for key in new:
+            self._rows[key] = len(self.segments)
+            self.segments.append(key)
+        if new:
+            self.registers = np.vstack([self.registers, np.zeros((len(new), 1 << self.p), dtype=np.uint8)])
+        return np.array([self._rows[key] for key in keys], dtype=np.int64)
+
+    def update(self, chunk, id_column='attendee_id'):
+        # Fold one chunk of events into the total and every segment the events belong to
+        index, rank = register_updates(hash_ids(chunk[id_column].to_numpy()), self.p)
+        m = 1 << self.p
+        targets = [np.zeros(len(chunk), dtype=np.int64)]
+        keep = [np.ones(len(chunk), dtype=bool)]
+        for dimension in self.dimensions:
+            # Missing or blank values (e.g. attendees without a campus) belong to no segment of this dimension
+            codes, uniques = pd.factorize(chunk[dimension])
+            if len(uniques) == 0:
+                # Entirely missing in this chunk; indexing the empty lookups below with code -1 would fail
+                continue
+            labels = [str(value) for value in uniques]
+            blank = np.array([label.strip() == '' for label in labels], dtype=bool)
+            rows = np.zeros(len(labels), dtype=np.int64)
+            rows[~blank] = self._segment_rows([(dimension, label) for label in np.asarray(labels, dtype=object)[~blank]])
+            targets.append(np.where(codes >= 0, rows[codes], 0))
+            keep.append((codes >= 0) & ~blank[codes])
+        flat = self.registers.reshape(-1)
+        for rows, mask in zip(targets, keep):
+            np.maximum.at(flat, rows[mask] * m + index[mask], rank[mask])
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Sketches have different precision")
+        rows = self._segment_rows(other.segments)
+        self.registers[rows] = np.maximum(self.registers[rows], other.registers)
+        return self
+
+    @classmethod
+    def from_csv(cls, paths, chunksize=1_000_000, id_column='attendee_id', dimensions=SEGMENT_DIMENSIONS, p=PRECISION):
+        counts = cls(dimensions, p)
+        for path in paths:
+            for chunk in pd.read_csv(path, usecols=[id_column] + list(dimensions), chunksize=chunksize,
+                                     dtype={dimension: str for dimension in dimensions}):
+                counts.update(chunk.dropna(subset=[id_column]), id_column)
+        return counts
+
+    def values(self, dimension):
+        return [value for key, value in self.segments if key == dimension]
+
+    def count(self, selections=None):
+        # Distinct attendees in the union of the selected segments, e.g. {'campus': [...], 'age_group': [...]}
+        if not selections:
+            return float(estimate(self.registers[0]))
+        rows = [self._rows[(dimension, value)] for dimension, values in selections.items()
+                for value in values if (dimension, value) in self._rows]
+        if not rows:
+            return 0.0
+        return float(estimate(self.registers[rows].max(axis=0)))
+
+    def breakdown(self, dimension):
+        # Estimated distinct attendees per value of one dimension, largest first
+        values = self.values(dimension)
+        rows = [self._rows[(dimension, value)] for value in values]
+        counts = estimate(self.registers[rows]) if rows else np.zeros(0)
+        return (pd.DataFrame({dimension: values, 'distinct_attendees': counts})
+                .sort_values('distinct_attendees', ascending=False, kind='stable').reset_index(drop=True))
+
+    def relative_error(self):
+        return 1.04 / np.sqrt(1 << self.p)
+
+    def save(self, path, source_hash=""):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, segments=np.asarray(self.segments, dtype=str), registers=self.registers,
+                 dimensions=np.asarray(self.dimensions, dtype=str), source_hash=np.asarray(source_hash))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        # Sketches and the source hash they were saved with
+        with np.load(path) as data:
+            registers = data['registers']
+            counts = cls(data['dimensions'].tolist(), int(np.log2(registers.shape[1])))
+            counts.segments = [tuple(segment) for segment in data['segments'].tolist()]
+            counts._rows = {segment: i for i, segment in enumerate(counts.segments)}
+            counts.registers = registers
+            return counts, str(data['source_hash'])
+
+
+def load_or_build(paths=(EVENTS_PATH,), sketch_path=SKETCH_PATH, p=PRECISION):
+    # Saved sketches when they match the current event logs, otherwise rebuild and save them
+    source_hash = "|".join(file_fingerprint(path) for path in paths) + f"|{p}|{ID_HASH_VERSION}"
+    if os.path.exists(sketch_path):
+        try:
+            counts, saved_hash = SegmentCounts.load(sketch_path)
+            if saved_hash == source_hash:
+                return counts
+        except (OSError, ValueError, KeyError):
+            pass
+    counts = SegmentCounts.from_csv(paths, p=p)
+    counts.save(sketch_path, source_hash)
+    return counts
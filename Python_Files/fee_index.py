@@ -0,0 +1,102 @@
+"""Booking-fee index over supporting artists' fee ranges.
+
+Fee ranges are kept as sorted endpoint arrays: one order by minimum fee and
+one by maximum fee. A range [minimum, maximum] overlaps [low, high] exactly
+when minimum <= high and maximum >= low. Ranges failing the second test are
+a subset of those passing the first, so overlap counts are two binary
+searches. Listing the overlapping artists filters the smaller of the two
+candidate blocks. Every genre also keeps its own artists in minimum-fee
+and maximum-fee order, so "cheapest N within budget matching genre X" is one
+binary search plus a slice, and a genre-filtered overlap query runs the same
+two binary searches over the genre's arrays.
+"""
+import numpy as np
+import pandas as pd
+
+from genre_index import split_genres
+
+FEE_COLUMNS = ['artist', 'minimum_fee', 'maximum_fee', 'genres']
+
+
+class FeeIndex:
+    def __init__(self, artists):
+        self.artists = artists.reset_index(drop=True)
+        self.minimum = self.artists['minimum_fee'].to_numpy(dtype=float)
+        self.maximum = self.artists['maximum_fee'].to_numpy(dtype=float)
+        self._by_min = np.argsort(self.minimum, kind='stable')
+        self._by_max = np.argsort(self.maximum, kind='stable')
+        self._sorted_min = self.minimum[self._by_min]
+        self._sorted_max = self.maximum[self._by_max]
+
+        # Per-genre row ids, each already in minimum-fee order
+        exploded = self.artists['genres'].iloc[self._by_min].explode().dropna()
+        genre_codes, genre_names = pd.factorize(exploded)
+        rows = exploded.index.to_numpy()
+        order = np.argsort(genre_codes, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(genre_codes, minlength=len(genre_names)))])
+        self._genre_rows = {
+            genre: rows[order[bounds[i]:bounds[i + 1]]] for i, genre in enumerate(genre_names)
+        }
+        self._genre_min = {genre: self.minimum[rows] for genre, rows in self._genre_rows.items()}
+        # ...and again in maximum-fee order, for genre-filtered overlap queries
+        self._genre_by_max = {
+            genre: rows[np.argsort(self.maximum[rows], kind='stable')] for genre, rows in self._genre_rows.items()
+        }
+        self._genre_max = {genre: self.maximum[rows] for genre, rows in self._genre_by_max.items()}
+
+    @classmethod
+    def from_csv(cls, path):
+        artists = pd.read_csv(path, usecols=FEE_COLUMNS)
+        artists['genres'] = artists['genres'].map(split_genres)
+        return cls(artists)
+
+    def __len__(self):
+        return len(self.artists)
+
+    def genres(self):
+        return sorted(self._genre_rows)
+
+    def fee_range(self):
+        return self._sorted_min[0], self._sorted_max[-1]
+
+    def overlap_count(self, low, high):
+        # Artists whose fee range overlaps [low, high]
+        starts_in_time = np.searchsorted(self._sorted_min, high, side='right')
+        ends_too_early = np.searchsorted(self._sorted_max, low, side='left')
+        return max(int(starts_in_time - ends_too_early), 0)
+
+    def overlapping(self, low, high, genre=None):
+        # Rows whose fee range overlaps [low, high], cheapest minimum fee first
+        if genre is None:
+            by_min, sorted_min, by_max, sorted_max = self._by_min, self._sorted_min, self._by_max, self._sorted_max
+        elif genre in self._genre_rows:
+            # The genre's own sorted arrays, so the filter costs nothing beyond the genre's candidates
+            by_min, sorted_min = self._genre_rows[genre], self._genre_min[genre]
+            by_max, sorted_max = self._genre_by_max[genre], self._genre_max[genre]
+        else:
+            return self.artists.iloc[[]]
+        starts_in_time = np.searchsorted(sorted_min, high, side='right')
+        ends_too_early = np.searchsorted(sorted_max, low, side='left')
+        if starts_in_time <= len(by_max) - ends_too_early:
+            rows = by_min[:starts_in_time]
+            rows = rows[self.maximum[rows] >= low]
+        else:
+            rows = by_max[ends_too_early:]
+            rows = rows[self.minimum[rows] <= high]
+            rows = rows[np.argsort(self.minimum[rows], kind='stable')]
+        return self.artists.iloc[rows]
+
+    def cheapest(self, budget, n=10, genre=None):
+        # Up to `n` artists whose minimum fee fits the budget, cheapest first
+        if genre is None:
+            rows, sorted_min = self._by_min, self._sorted_min
+        elif genre in self._genre_rows:
+            rows, sorted_min = self._genre_rows[genre], self._genre_min[genre]
+        else:
+            return self.artists.iloc[[]]
+        affordable = np.searchsorted(sorted_min, budget, side='right')
+        return self.artists.iloc[rows[:min(affordable, n)]]
+
+    def fees_for(self, artists):
+        # Minimum and maximum fee per artist name, indexed by artist
+        return self.artists.drop_duplicates('artist').set_index('artist').reindex(artists)[['minimum_fee', 'maximum_fee']]
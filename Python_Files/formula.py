@@ -0,0 +1,121 @@
+"""User-defined ranking formulas over the score columns.
+
+A formula such as ``0.6*frequency_normalized + 0.4*rank_sum_normalized`` is
+parsed with `ast` and checked against a whitelist. Only numbers, score
+columns, arithmetic operators and a few NumPy functions are accepted, and
+nothing is passed to eval(). The checked tree is compiled once into nested
+closures that apply the matching NumPy ufunc to whole columns. Compiled
+formulas are cached by their text, so re-ranking the full table costs one
+vectorized pass.
+"""
+import ast
+import functools
+import operator
+
+import numpy as np
+
+FORMULA_COLUMNS = ['frequency', 'rank_sum', 'ranking_score', 'rank',
+                   'frequency_normalized', 'rank_sum_normalized']
+
+# Function name -> (ufunc, number of arguments)
+FUNCTIONS = {
+    'abs': (np.abs, 1),
+    'sqrt': (np.sqrt, 1),
+    'log': (np.log, 1),
+    'log1p': (np.log1p, 1),
+    'exp': (np.exp, 1),
+    'min': (np.minimum, 2),
+    'max': (np.maximum, 2),
+}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+}
+
+UNARY_OPERATORS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+MAX_FORMULA_LENGTH = 500
+
+
+class FormulaError(ValueError):
+    pass
+
+
+class CompiledFormula:
+    def __init__(self, text, evaluate, columns):
+        self.text = text
+        self.columns = columns
+        self._evaluate = evaluate
+
+    def __call__(self, df):
+        # Formula value per row; division by zero and other invalid results become NaN
+        missing = [column for column in self.columns if column not in df]
+        if missing:
+            raise FormulaError(f"Missing columns: {', '.join(missing)}")
+        values = {column: df[column].to_numpy(dtype=float) for column in self.columns}
+        with np.errstate(all='ignore'):
+            result = np.broadcast_to(np.asarray(self._evaluate(values), dtype=float), (len(df),)).copy()
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+def _compile_node(node, columns):
+    # Closure over `values` (column name -> array) for one whitelisted syntax node
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        constant = np.float64(node.value)
+        return lambda values: constant
+    if isinstance(node, ast.Name):
+        if node.id not in FORMULA_COLUMNS:
+            raise FormulaError(f"Unknown column: {node.id}. Available: {', '.join(FORMULA_COLUMNS)}")
+        columns.add(node.id)
+        name = node.id
+        return lambda values: values[name]
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left, right = _compile_node(node.left, columns), _compile_node(node.right, columns)
+        return lambda values: op(left(values), right(values))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, columns)
+        return lambda values: op(operand(values))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+        function, arity = FUNCTIONS[node.func.id]
+        if node.keywords or len(node.args) != arity:
+            raise FormulaError(f"{node.func.id}() takes {arity} argument{'s' if arity > 1 else ''}")
+        args = [_compile_node(arg, columns) for arg in node.args]
+        return lambda values: function(*(arg(values) for arg in args))
+    if isinstance(node, ast.Call):
+        raise FormulaError(f"Unknown function. Available: {', '.join(FUNCTIONS)}")
+    raise FormulaError(f"Unsupported expression: {ast.unparse(node)}")
+
+
+@functools.lru_cache(maxsize=64)
+def compile_formula(text):
+    text = text.strip()
+    if not text:
+        raise FormulaError("Formula is empty")
+    if len(text) > MAX_FORMULA_LENGTH:
+        raise FormulaError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters")
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as e:
+        raise FormulaError(f"Invalid formula: {e.msg}")
+    except RecursionError:
+        raise FormulaError("Formula is nested too deeply")
+    columns = set()
+    evaluate = _compile_node(tree.body, columns)
+    return CompiledFormula(text, evaluate, sorted(columns))
+
+
+def rank_by_formula(scores, text):
+    # Scores re-ranked by the formula, best first; rank_change > 0 means the artist moved up
+    formula = compile_formula(text)
+    ranked = scores.copy()
+    ranked['formula_score'] = formula(scores)
+    ranked['formula_rank'] = ranked['formula_score'].rank(ascending=False, method='min', na_option='bottom')
+    ranked['rank_change'] = ranked['rank'] - ranked['formula_rank']
+    return ranked.sort_values('formula_rank', kind='stable').reset_index(drop=True)
@@ -0,0 +1,105 @@
+"""Multi-label genres encoded as a vocabulary plus packed bitsets.
+
+Every artist's genre list becomes one row of uint64 words with a bit set
+per genre in the vocabulary. Genre filters are AND/compare operations over
+the whole bit matrix. Jaccard similarity and target-genre match are
+popcounts of AND/OR results, so no per-artist Python loops or list cells are
+touched after load.
+"""
+import numpy as np
+import pandas as pd
+
+# Pop-family genres the target audience leans towards (see the genre preferences by age group)
+TARGET_GENRES = ['Pop', 'Dance Pop', 'Synth-pop', 'Electropop', 'Indie Pop', 'Country Pop']
+
+GENRE_SEPARATOR = ';'
+
+# Set bits per byte value, for popcounts that do not depend on the NumPy version
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def split_genres(value):
+    if not isinstance(value, str) or not value:
+        return []
+    return [genre.strip() for genre in value.split(GENRE_SEPARATOR) if genre.strip()]
+
+
+def popcount(bits):
+    # Set bits per row of a (rows, words) uint64 matrix
+    bits = np.ascontiguousarray(bits)
+    return _BYTE_POPCOUNT[bits.view(np.uint8)].reshape(len(bits), -1).sum(axis=1, dtype=np.int64)
+
+
+class GenreIndex:
+    def __init__(self, artists, genre_lists):
+        self.artists = pd.Index(artists)
+        self._ids = {name: i for i, name in enumerate(self.artists)}
+        exploded = pd.Series(list(genre_lists), dtype=object).explode().dropna()
+        codes, vocabulary = pd.factorize(exploded)
+        self.vocabulary = list(vocabulary)
+        self._genre_ids = {genre: i for i, genre in enumerate(self.vocabulary)}
+        self.n_words = max((len(self.vocabulary) + 63) // 64, 1)
+
+        self.bits = np.zeros((len(self.artists), self.n_words), dtype=np.uint64)
+        rows = exploded.index.to_numpy()
+        np.bitwise_or.at(self.bits, (rows, codes // 64), np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+        self.counts = popcount(self.bits)
+
+    @classmethod
+    def from_frames(cls, *frames):
+        # Artists from several (artist, genres) frames; the first frame listing an artist wins
+        combined = pd.concat([frame[['artist', 'genres']] for frame in frames], ignore_index=True)
+        combined = combined.drop_duplicates('artist')
+        return cls(combined['artist'], combined['genres'])
+
+    def __len__(self):
+        return len(self.artists)
+
+    def __contains__(self, artist):
+        return artist in self._ids
+
+    def mask(self, genres):
+        # Bitset for a list of genres; genres outside the vocabulary are ignored
+        mask = np.zeros(self.n_words, dtype=np.uint64)
+        for genre in genres:
+            code = self._genre_ids.get(genre)
+            if code is not None:
+                mask[code // 64] |= np.uint64(1) << np.uint64(code % 64)
+        return mask
+
+    def rows(self, artists):
+        return np.array([self._ids[artist] for artist in artists], dtype=int)
+
+    def genres_of(self, artist):
+        row = self.bits[self._ids[artist]]
+        return [genre for code, genre in enumerate(self.vocabulary)
+                if row[code // 64] >> np.uint64(code % 64) & np.uint64(1)]
+
+    def matching(self, genres, match_all=False):
+        # Boolean mask of artists tagged with any (or all) of `genres`
+        mask = self.mask(genres)
+        overlap = self.bits & mask
+        if match_all:
+            return (overlap == mask).all(axis=1) & (len(genres) > 0)
+        return overlap.any(axis=1)
+
+    def jaccard(self, genres):
+        # Jaccard similarity of every artist's genre set with `genres`
+        mask = self.mask(genres)
+        shared = popcount(self.bits & mask)
+        union = popcount(self.bits | mask)
+        return np.divide(shared, union, out=np.zeros(len(self.artists)), where=union > 0)
+
+    def similar_to(self, artist, n=10):
+        # Artists with the most similar genre sets, excluding `artist` itself
+        scores = self.jaccard(self.genres_of(artist))
+        scores[self._ids[artist]] = -1
+        order = np.argsort(-scores, kind='stable')[:n]
+        return pd.Series(scores[order], index=self.artists[order], name='genre_similarity')
+
+    def target_match(self, artists, target=TARGET_GENRES):
+        # Share of each artist's genre tags that fall in `target`, 0-100
+        rows = self.rows(artists)
+        shared = popcount(self.bits[rows] & self.mask(target))
+        counts = self.counts[rows]
+        return np.divide(100.0 * shared, counts, out=np.zeros(len(rows)), where=counts > 0)
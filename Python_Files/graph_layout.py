@@ -0,0 +1,180 @@
+"""Force-directed layout for the top-k artist similarity graph.
+
+The graph links every artist to its k most similar artists (undirected,
+deduplicated). Positions follow Fruchterman-Reingold: edges pull their ends
+together, all pairs push apart, and a cooling step limit lets the layout
+settle. Up to EXACT_LIMIT nodes, repulsion is computed for all pairs with
+one vectorized distance matrix. Larger graphs use a quadtree of grid
+levels, as in Barnes-Hut. Nodes in the same or adjacent finest cells repel
+exactly. Farther nodes are grouped by the coarsest cell that is still
+separated from the node's cell by at least one cell of its own size, and
+each such cell acts as one mass at its centroid. Far-field forces are
+computed once per pair of interacting cells (at most 27 per cell and
+level) and spread to each cell's nodes with a first-order correction, so
+an iteration costs O(n log n) instead of O(n^2).
+"""
+import numpy as np
+
+EXACT_LIMIT = 1000
+NODES_PER_CELL = 5
+MAX_LEVELS = 10
+
+
+def similarity_edges(index, k=5):
+    # Undirected top-k edges (source, target, similarity) over every artist in a SimilarityIndex
+    n = len(index)
+    if n < 2:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    nearest, distances, farthest = index.query(np.arange(n), k)
+    source = np.repeat(np.arange(n), nearest.shape[1])
+    target = nearest.ravel()
+    similarity = 1 - np.divide(distances, farthest[:, None], out=np.zeros_like(distances),
+                               where=farthest[:, None] > 0).ravel()
+    # Keep each pair once, with the larger similarity of its two directions
+    low, high = np.minimum(source, target), np.maximum(source, target)
+    order = np.lexsort((-similarity, high, low))
+    low, high, similarity = low[order], high[order], similarity[order]
+    first = np.ones(len(low), dtype=bool)
+    first[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+    return low[first], high[first], similarity[first]
+
+
+def _exact_repulsion(positions, k_squared):
+    delta_x = positions[:, 0, None] - positions[None, :, 0]
+    delta_y = positions[:, 1, None] - positions[None, :, 1]
+    distance_squared = delta_x ** 2 + delta_y ** 2
+    np.fill_diagonal(distance_squared, np.inf)
+    weight = k_squared / np.maximum(distance_squared, 1e-9)
+    return np.column_stack([(delta_x * weight).sum(axis=1), (delta_y * weight).sum(axis=1)])
+
+
+def _cell_masses(cell, positions, n_cells):
+    # Node count and centroid of every cell of one grid level
+    counts = np.bincount(cell, minlength=n_cells)
+    centroids = np.column_stack([
+        np.bincount(cell, weights=positions[:, axis], minlength=n_cells) for axis in range(2)
+    ]) / np.maximum(counts, 1)[:, None]
+    return counts, centroids
+
+
+def _far_field(positions, cell_xy, levels, k_squared):
+    # Quadtree far field. At each level, a cell's interaction list is the children of its parent's 3x3
+    # block that lie outside its own 3x3 block; over all levels these lists cover every cell beyond the
+    # finest 3x3 block exactly once. Forces are computed cell to cell, once per occupied cell, at the
+    # cell's centroid together with their gradient, then spread to the cell's nodes by a first-order
+    # expansion around the centroid.
+    force = np.zeros_like(positions)
+    offsets = np.arange(-2, 4)
+    for level in range(2, levels + 1):
+        side = 1 << level
+        xy = cell_xy >> (levels - level)
+        cell = xy[:, 0] * side + xy[:, 1]
+        counts, centroids = _cell_masses(cell, positions, side * side)
+        occupied = np.flatnonzero(counts)
+        occupied_xy = np.column_stack([occupied // side, occupied % side])
+        base = (occupied_xy >> 1) << 1
+        candidate_x = np.repeat(base[:, 0, None] + offsets, len(offsets), axis=1)
+        candidate_y = np.tile(base[:, 1, None] + offsets, (1, len(offsets)))
+        valid = ((candidate_x >= 0) & (candidate_x < side) & (candidate_y >= 0) & (candidate_y < side)
+                 & ((np.abs(candidate_x - occupied_xy[:, 0, None]) > 1)
+                    | (np.abs(candidate_y - occupied_xy[:, 1, None]) > 1)))
+        candidate = np.where(valid, candidate_x * side + candidate_y, 0)
+        mass = np.where(valid, counts[candidate], 0) * k_squared
+        delta_x = centroids[occupied, 0, None] - centroids[candidate, 0]
+        delta_y = centroids[occupied, 1, None] - centroids[candidate, 1]
+        inverse = 1 / np.maximum(delta_x ** 2 + delta_y ** 2, 1e-9)
+        weight = mass * inverse
+        # Force k^2 m d / |d|^2 at each occupied cell's centroid, and its Jacobian m k^2 (I - 2 d d^T / |d|^2) / |d|^2
+        cell_force = np.zeros((side * side, 2))
+        cell_force[occupied, 0] = (delta_x * weight).sum(axis=1)
+        cell_force[occupied, 1] = (delta_y * weight).sum(axis=1)
+        jacobian = np.zeros((side * side, 3))
+        jacobian[occupied, 0] = (weight * (1 - 2 * delta_x ** 2 * inverse)).sum(axis=1)
+        jacobian[occupied, 1] = (-2 * weight * delta_x * delta_y * inverse).sum(axis=1)
+        jacobian[occupied, 2] = (weight * (1 - 2 * delta_y ** 2 * inverse)).sum(axis=1)
+
+        offset = positions - centroids[cell]
+        node_jacobian = jacobian[cell]
+        force[:, 0] += cell_force[cell, 0] + node_jacobian[:, 0] * offset[:, 0] + node_jacobian[:, 1] * offset[:, 1]
+        force[:, 1] += cell_force[cell, 1] + node_jacobian[:, 1] * offset[:, 0] + node_jacobian[:, 2] * offset[:, 1]
+    return force
+
+
+def _finest_cells(positions):
+    # Finest quadtree level and each node's cell there. Deepen until a node shares its cell with about
+    # NODES_PER_CELL others on average, so clustered layouts do not pile pairs into the near field.
+    n = len(positions)
+    low = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - low, 1e-9)
+    levels = max(int(round(np.log2(np.sqrt(n / NODES_PER_CELL)))), 2)
+    while True:
+        cells_per_side = 1 << levels
+        cell_xy = np.minimum(((positions - low) / extent * cells_per_side).astype(int), cells_per_side - 1)
+        counts = np.bincount(cell_xy[:, 0] * cells_per_side + cell_xy[:, 1], minlength=cells_per_side ** 2)
+        if levels >= MAX_LEVELS or (counts.astype(float) ** 2).sum() / n <= 2 * NODES_PER_CELL:
+            return levels, cell_xy, counts
+        levels += 1
+
+
+def _grid_repulsion(positions, k_squared):
+    # Exact forces from nodes in the 3x3 block of finest cells around each node, quadtree centroid forces
+    # from everything farther
+    n = len(positions)
+    levels, cell_xy, counts = _finest_cells(positions)
+    cells_per_side = 1 << levels
+    cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+
+    order = np.argsort(cell, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    force = _far_field(positions, cell_xy, levels, k_squared)
+
+    # Near field: exact pairs between each node and the nodes of its 3x3 block
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbor_xy = cell_xy + (dx, dy)
+            valid = ((neighbor_xy >= 0) & (neighbor_xy < cells_per_side)).all(axis=1)
+            nodes = np.flatnonzero(valid)
+            neighbor_cell = neighbor_xy[valid, 0] * cells_per_side + neighbor_xy[valid, 1]
+            sizes = counts[neighbor_cell]
+            source = np.repeat(nodes, sizes)
+            # Position of each pair inside its cell's block of the cell-sorted node order
+            within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            target = order[np.repeat(starts[neighbor_cell], sizes) + within]
+            keep = source != target
+            source, target = source[keep], target[keep]
+            pair_delta = positions[source] - positions[target]
+            pair_weight = k_squared / np.maximum((pair_delta ** 2).sum(axis=1), 1e-9)
+            for axis in range(2):
+                force[:, axis] += np.bincount(source, weights=pair_delta[:, axis] * pair_weight, minlength=n)
+    return force
+
+
+def force_layout(n, source, target, weight=None, iterations=200, seed=0):
+    # 2-D positions for `n` nodes, scaled to [-1, 1]
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.zeros((1, 2))
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-1, 1, size=(n, 2))
+    weight = np.ones(len(source)) if weight is None else np.asarray(weight, dtype=float)
+    k = np.sqrt(4.0 / n)  # ideal edge length for a 2 x 2 area
+    k_squared = k ** 2
+    temperature = 0.1
+    for step in range(iterations):
+        if n <= EXACT_LIMIT:
+            force = _exact_repulsion(positions, k_squared)
+        else:
+            force = _grid_repulsion(positions, k_squared)
+        delta = positions[source] - positions[target]
+        distance = np.sqrt((delta ** 2).sum(axis=1))
+        pull = delta * (distance * weight / k)[:, None]
+        for axis in range(2):
+            force[:, axis] -= np.bincount(source, weights=pull[:, axis], minlength=n)
+            force[:, axis] += np.bincount(target, weights=pull[:, axis], minlength=n)
+        # Move each node at most `temperature` along its net force, then cool
+        length = np.sqrt((force ** 2).sum(axis=1))
+        positions += force * (np.minimum(length, temperature) / np.maximum(length, 1e-9))[:, None]
+        temperature = 0.1 * (1 - (step + 1) / iterations) + 1e-3
+    positions -= positions.mean(axis=0)
+    return positions / max(np.abs(positions).max(), 1e-9)
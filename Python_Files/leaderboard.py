@@ -0,0 +1,91 @@
+"""Server-side paging, sorting and range filtering for the full scores table.
+
+A stable sort permutation is precomputed for every sortable column, and a
+stable descending one is built on first use. Sorting by a column is then a
+slice of its permutation, and a range filter on a
+column is a contiguous block of that column's permutation found by binary
+search. Filtered orderings are memoized, so turning pages costs O(page size)
+and only the rows of the visible page are materialized.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SORTABLE_COLUMNS = ['rank', 'ranking_score', 'frequency', 'rank_sum',
+                    'frequency_normalized', 'rank_sum_normalized', 'artists']
+
+
+class LeaderboardPager:
+    def __init__(self, scores, columns=SORTABLE_COLUMNS, memo_size=16):
+        self.scores = scores.reset_index(drop=True)
+        self.columns = [column for column in columns if column in self.scores.columns]
+        self._values = {column: self.scores[column].to_numpy() for column in self.columns}
+        self._order = {
+            column: np.argsort(self._values[column], kind='stable') for column in self.columns
+        }
+        self._sorted_values = {column: self._values[column][self._order[column]] for column in self.columns}
+        # Missing values (a formula that divides by zero, say) sort last either way and never match a range
+        self._missing = {column: pd.isna(self._values[column]) for column in self.columns}
+        self._present = {column: len(self.scores) - int(self._missing[column].sum()) for column in self.columns}
+        self._descending = {}
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+
+    def __len__(self):
+        return len(self.scores)
+
+    def value_range(self, column):
+        # Smallest and largest present value, or (None, None) when the column is all missing
+        values = self._sorted_values[column][:self._present[column]]
+        if not len(values):
+            return None, None
+        return values[0], values[-1]
+
+    def _filtered_positions(self, column, low, high):
+        # Row ids with low <= column <= high, as a slice of the column's sort permutation
+        values = self._sorted_values[column][:self._present[column]]
+        lo = np.searchsorted(values, low, side='left')
+        hi = np.searchsorted(values, high, side='right')
+        return self._order[column][lo:hi]
+
+    def _descending_order(self, column):
+        # Largest values first with ties kept in row order, which reversing the ascending permutation would not do
+        if column not in self._descending:
+            missing = self._missing[column]
+            key = np.zeros(len(self.scores), dtype=np.int64)
+            _, codes = np.unique(self._values[column][~missing], return_inverse=True)
+            key[~missing] = -codes.reshape(-1)
+            key[missing] = 1
+            self._descending[column] = np.argsort(key, kind='stable')
+        return self._descending[column]
+
+    def _ordering(self, sort_by, ascending, filter_column, low, high):
+        key = (sort_by, ascending, filter_column, low, high)
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        order = self._order[sort_by] if ascending else self._descending_order(sort_by)
+        if filter_column is not None:
+            if filter_column == sort_by and ascending:
+                order = self._filtered_positions(filter_column, low, high)
+            else:
+                # Keep the sort order of `sort_by`, restricted to rows inside the filter range
+                keep = np.zeros(len(self.scores), dtype=bool)
+                keep[self._filtered_positions(filter_column, low, high)] = True
+                order = order[keep[order]]
+        self._memo[key] = order
+        if len(self._memo) > self._memo_size:
+            self._memo.popitem(last=False)
+        return order
+
+    def page(self, page, page_size=50, sort_by='rank', ascending=True,
+             filter_column=None, low=None, high=None):
+        # Rows of one page plus the number of rows matching the filter
+        if sort_by not in self._order:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        if filter_column is not None and filter_column not in self._order:
+            raise ValueError(f"Cannot filter by {filter_column}")
+        order = self._ordering(sort_by, ascending, filter_column, low, high)
+        start = max(page, 0) * page_size
+        return self.scores.iloc[order[start:start + page_size]], len(order)
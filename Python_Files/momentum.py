@@ -0,0 +1,90 @@
+"""Rolling-window chart metrics backed by per-artist prefix sums.
+
+Daily chart appearances are accumulated into two (days + 1) x artists prefix
+sum arrays, one for appearance counts and one for 1 / position weights. The
+frequency and rank_sum of any artist over any date window is then the
+difference of two rows, and a leaderboard for a window or a past date is one
+vectorized row difference across all artists.
+"""
+import numpy as np
+import pandas as pd
+
+from scoring import position_weight, score_frame
+
+
+class MomentumIndex:
+    def __init__(self, artists, start_date, freq_prefix, rank_sum_prefix):
+        self.artists = np.asarray(artists, dtype=object)
+        self.start_date = pd.Timestamp(start_date)
+        self.freq_prefix = freq_prefix
+        self.rank_sum_prefix = rank_sum_prefix
+        self._artist_index = {name: i for i, name in enumerate(self.artists)}
+
+    @classmethod
+    def from_entries(cls, entries):
+        # Build the prefix sums from chart rows with `date`, `artists` and `position` columns
+        if entries.empty:
+            return None
+        dates = pd.to_datetime(entries['date']).values.astype('datetime64[D]')
+        start = dates.min()
+        day_idx = (dates - start).astype(int)
+        n_days = int(day_idx.max()) + 1
+        artist_codes, artists = pd.factorize(entries['artists'])
+        freq = np.zeros((n_days + 1, len(artists)), dtype=np.int32)
+        rank_sum = np.zeros((n_days + 1, len(artists)), dtype=np.float64)
+        # Row d + 1 holds day d, so prefix row k covers days [0, k)
+        np.add.at(freq, (day_idx + 1, artist_codes), 1)
+        np.add.at(rank_sum, (day_idx + 1, artist_codes), position_weight(entries['position']))
+        np.cumsum(freq, axis=0, out=freq)
+        np.cumsum(rank_sum, axis=0, out=rank_sum)
+        return cls(artists, start, freq, rank_sum)
+
+    @property
+    def end_date(self):
+        return self.start_date + pd.Timedelta(days=self.freq_prefix.shape[0] - 2)
+
+    def _row(self, date):
+        # Prefix row covering every day up to and including `date`, clamped to the history
+        offset = (pd.Timestamp(date).normalize() - self.start_date).days + 1
+        return int(np.clip(offset, 0, self.freq_prefix.shape[0] - 1))
+
+    def _bounds(self, end_date, days):
+        end_date = self.end_date if end_date is None else end_date
+        hi = self._row(end_date)
+        lo = 0 if days is None else self._row(pd.Timestamp(end_date) - pd.Timedelta(days=days))
+        return lo, hi
+
+    def artist_window(self, artist, end_date=None, days=30):
+        # Constant-time frequency and rank_sum for one artist over the `days` ending at `end_date`
+        lo, hi = self._bounds(end_date, days)
+        i = self._artist_index[artist]
+        return (int(self.freq_prefix[hi, i] - self.freq_prefix[lo, i]),
+                float(self.rank_sum_prefix[hi, i] - self.rank_sum_prefix[lo, i]))
+
+    def window(self, end_date=None, days=30):
+        # Scored leaderboard over the `days` ending at `end_date`; days=None means all history to that date
+        lo, hi = self._bounds(end_date, days)
+        totals = pd.DataFrame({
+            'artists': self.artists,
+            'frequency': self.freq_prefix[hi] - self.freq_prefix[lo],
+            'rank_sum': self.rank_sum_prefix[hi] - self.rank_sum_prefix[lo],
+        })
+        return score_frame(totals[totals['frequency'] > 0])
+
+    def leaderboard_at(self, date):
+        # Point-in-time leaderboard using every appearance up to `date`
+        return self.window(end_date=date, days=None)
+
+    def momentum(self, end_date=None, days=30):
+        # Window leaderboard with the score change against the preceding window of the same length
+        end_date = self.end_date if end_date is None else pd.Timestamp(end_date)
+        current = self.window(end_date, days)
+        previous = self.window(end_date - pd.Timedelta(days=days), days)
+        merged = current.merge(
+            previous[['artists', 'ranking_score', 'rank']].rename(
+                columns={'ranking_score': 'previous_score', 'rank': 'previous_rank'}),
+            on='artists', how='left'
+        )
+        merged['previous_score'] = merged['previous_score'].fillna(0.0)
+        merged['score_change'] = merged['ranking_score'] - merged['previous_score']
+        return merged
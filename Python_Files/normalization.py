@@ -0,0 +1,141 @@
+"""Streaming normalization of score columns.
+
+`ScoreNormalizer` collects per-column statistics in one pass over chunks of
+rows, and two normalizers fitted on separate chunks can be merged. New rows
+are then normalized against the accumulated statistics without rescanning
+the history. Three scalings are available, all onto 0-1:
+
+- ``min_max``: (x - min) / (max - min);
+- ``rank_percentile``: share of the observed values at or below x;
+- ``robust``: logistic of (x - median) / IQR, so a few outliers at the top
+  do not compress everyone else towards zero.
+
+Each column keeps a sorted value/count table. Once a column has more than
+`max_bins` distinct values, adjacent entries are merged by weighted mean.
+Quantiles and percentiles are exact until then and approximate afterwards.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = ('min_max', 'rank_percentile', 'robust')
+
+
+class ColumnStats:
+    def __init__(self, max_bins=4096):
+        self.max_bins = max_bins
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        distinct, counts = np.unique(values, return_counts=True)
+        self._absorb(distinct, counts.astype(float))
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._absorb(other.values, other.weights)
+        return self
+
+    def _absorb(self, values, weights):
+        values = np.concatenate([self.values, values])
+        weights = np.concatenate([self.weights, weights])
+        distinct, inverse = np.unique(values, return_inverse=True)
+        self.values = distinct
+        self.weights = np.bincount(inverse, weights=weights, minlength=len(distinct))
+        while len(self.values) > self.max_bins:
+            self._compress()
+
+    def _compress(self):
+        # Merge neighbouring entries pairwise, keeping the total weight and the weighted mean
+        paired = len(self.values) // 2 * 2
+        left_v, right_v = self.values[0:paired:2], self.values[1:paired:2]
+        left_w, right_w = self.weights[0:paired:2], self.weights[1:paired:2]
+        weights = left_w + right_w
+        values = (left_v * left_w + right_v * right_w) / weights
+        self.values = np.concatenate([values, self.values[paired:]])
+        self.weights = np.concatenate([weights, self.weights[paired:]])
+
+    def quantile(self, q):
+        # Linear-interpolated quantile over the expanded sample, as numpy's default method
+        if self.count == 0:
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        position = q * (self.count - 1)
+        below = int(np.floor(position))
+        ranks = np.searchsorted(cumulative, [below, min(below + 1, self.count - 1)], side='right')
+        low, high = self.values[np.minimum(ranks, len(self.values) - 1)]
+        return low + (position - below) * (high - low)
+
+    def percentile_of(self, values):
+        # Share of the observed values at or below each of `values`
+        values = np.asarray(values, dtype=float)
+        if self.count == 0:
+            return np.full(values.shape, np.nan)
+        cumulative = np.concatenate([[0.0], np.cumsum(self.weights)])
+        return cumulative[np.searchsorted(self.values, values, side='right')] / self.count
+
+
+class ScoreNormalizer:
+    def __init__(self, columns, max_bins=4096):
+        self.columns = list(columns)
+        self.stats = {column: ColumnStats(max_bins) for column in self.columns}
+
+    @classmethod
+    def fit(cls, chunks, columns, max_bins=4096):
+        # Accept one DataFrame or an iterable of DataFrame chunks
+        normalizer = cls(columns, max_bins)
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+        for chunk in chunks:
+            normalizer.update(chunk)
+        return normalizer
+
+    def update(self, df):
+        for column in self.columns:
+            self.stats[column].update(df[column].to_numpy())
+        return self
+
+    def merge(self, other):
+        for column in self.columns:
+            self.stats[column].merge(other.stats[column])
+        return self
+
+    def normalize(self, column, values, method='min_max'):
+        stats = self.stats[column]
+        values = np.asarray(values, dtype=float)
+        if method == 'min_max':
+            span = stats.max - stats.min
+            if not span > 0:
+                return np.zeros_like(values)
+            return (values - stats.min) / span
+        if method == 'rank_percentile':
+            return stats.percentile_of(values)
+        if method == 'robust':
+            median = stats.quantile(0.5)
+            iqr = stats.quantile(0.75) - stats.quantile(0.25)
+            if not iqr > 0:
+                iqr = stats.max - stats.min
+            if not iqr > 0:
+                return np.full(values.shape, 0.5)
+            return 1.0 / (1.0 + np.exp(-(values - median) / iqr))
+        raise ValueError(f"Unknown normalization method: {method}")
+
+    def transform(self, df, method='min_max', suffix='_normalized'):
+        # Copy of `df` with a normalized column per fitted column
+        normalized = df.copy()
+        for column in self.columns:
+            if column in df:
+                normalized[f'{column}{suffix}'] = self.normalize(column, df[column], method)
+        return normalized
@@ -0,0 +1,292 @@
+"""Disk-backed result cache shared by every dashboard process on the host.
+
+Results are pickled into a local SQLite file keyed by function, arguments, a
+hash of the data files the function reads and a hash of the code behind it:
+the function's source file and every project module it imports, plus an
+optional explicit `version`. A deploy that changes any of that code misses
+the entries pickled by the old code. Because the file lives on disk,
+all Streamlit workers on the machine see the same entries and they survive
+restarts. A short-lived lease row makes sure only one process recomputes a
+missing entry while the others wait for it. Each new entry prunes entries
+older than `max_age` seconds, then the oldest entries until the rest fit in
+`max_bytes`, so keys for superseded data files do not pile up.
+"""
+import ast
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Default location of the cache file (override with CONCERT_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    "CONCERT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+CACHE_PATH = os.path.join(CACHE_DIR, "results.sqlite")
+
+MAX_BYTES = 512 * 1024 * 1024
+MAX_AGE_SECONDS = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    func TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+# Memo of file content hashes keyed by (path, size, mtime) so unchanged files are not re-read
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+
+def file_fingerprint(path):
+    # Hash the file contents in chunks; missing files hash to a fixed marker
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "missing:" + os.path.abspath(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _file_hashes_lock:
+        if memo_key in _file_hashes:
+            return _file_hashes[memo_key]
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[memo_key] = value
+    return value
+
+
+def fingerprint(obj):
+    # Stable digest of a call argument; DataFrames and arrays are hashed by content
+    digest = hashlib.sha256()
+    if isinstance(obj, pd.DataFrame):
+        digest.update(repr(list(obj.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        digest.update(repr(obj.name).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.dtype.str, obj.shape)).encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(type(obj).__name__.encode())
+        for item in obj:
+            digest.update(fingerprint(item).encode())
+    elif isinstance(obj, dict):
+        digest.update(b"dict")
+        for item_key in sorted(obj, key=repr):
+            digest.update(repr(item_key).encode())
+            digest.update(fingerprint(obj[item_key]).encode())
+    else:
+        digest.update(pickle.dumps(obj, protocol=4))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path=CACHE_PATH, lease_seconds=300, poll_interval=0.05, max_bytes=MAX_BYTES,
+                 max_age=MAX_AGE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self):
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value, func_name=""):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results (key, func, value, created) VALUES (?, ?, ?, ?)",
+            (key, func_name, sqlite3.Binary(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)), time.time())
+        )
+        self.prune()
+
+    def prune(self, max_bytes=None, max_age=None):
+        # Drop entries older than max_age, then the oldest entries beyond max_bytes; returns the number removed
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        conn = self._connection()
+        now = time.time()
+        removed = conn.execute("DELETE FROM results WHERE created < ?", (now - max_age,)).rowcount
+        removed += conn.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM (SELECT key, SUM(LENGTH(value)) "
+            "OVER (ORDER BY created DESC, key) AS kept FROM results) WHERE kept > ?)",
+            (max_bytes,)
+        ).rowcount
+        conn.execute("DELETE FROM leases WHERE expires < ?", (now,))
+        return removed
+
+    def _try_lease(self, key, owner):
+        # Claim the right to compute `key`; fails while another live process holds it
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone():
+                conn.execute("COMMIT")
+                return False
+            row = conn.execute("SELECT expires FROM leases WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, expires) VALUES (?, ?, ?)",
+                (key, owner, now + self.lease_seconds)
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _release(self, key, owner):
+        self._connection().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def get_or_compute(self, key, compute, func_name=""):
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        deadline = time.time() + self.lease_seconds
+        while True:
+            hit, value = self.get(key)
+            if hit:
+                return value
+            if self._try_lease(key, owner):
+                try:
+                    value = compute()
+                    self.set(key, value, func_name)
+                    return value
+                finally:
+                    self._release(key, owner)
+            # Another process is computing this entry; wait for it instead of stampeding
+            if time.time() > deadline:
+                return compute()
+            time.sleep(self.poll_interval)
+
+    def clear(self, func_name=None):
+        conn = self._connection()
+        if func_name is None:
+            conn.execute("DELETE FROM results")
+        else:
+            conn.execute("DELETE FROM results WHERE func = ?", (func_name,))
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+# Memo of the module names each source file imports, keyed by (path, mtime)
+_file_imports = {}
+
+
+def _imported_modules(path):
+    memo_key = (path, os.stat(path).st_mtime_ns)
+    if memo_key not in _file_imports:
+        with open(path, "rb") as handle:
+            tree = ast.parse(handle.read(), filename=path)
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+        _file_imports[memo_key] = [name.split(".")[0] for name in names]
+    return _file_imports[memo_key]
+
+
+def _project_sources(func):
+    # Source files of the function's module and of every project module it imports, directly or not
+    root = os.path.dirname(os.path.abspath(func.__code__.co_filename))
+    seen = set()
+    pending = [os.path.abspath(func.__code__.co_filename)]
+    while pending:
+        path = pending.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.add(path)
+        pending.extend(os.path.join(root, name + ".py") for name in _imported_modules(path))
+    return sorted(seen)
+
+
+def code_version(func, version=None):
+    # Hash of the source files behind `func` and an explicit version, for invalidating results on deploy
+    digest = hashlib.sha256(repr(version).encode())
+    for path in _project_sources(func):
+        digest.update(path.encode())
+        digest.update(file_fingerprint(path).encode())
+    return digest.hexdigest()
+
+
+def make_key(func_name, args, kwargs, data_hash="", code_hash=""):
+    digest = hashlib.sha256()
+    digest.update(func_name.encode())
+    digest.update(data_hash.encode())
+    digest.update(code_hash.encode())
+    digest.update(fingerprint(list(args)).encode())
+    digest.update(fingerprint(dict(kwargs)).encode())
+    return digest.hexdigest()
+
+
+def disk_cached(data_files=(), cache=None, version=None):
+    # Decorator: memoize a function on disk, invalidated when any of `data_files` or the code behind it changes.
+    # Bump `version` for changes the source hash cannot see, such as a new hashing scheme in a library.
+    def decorator(func):
+        func_name = f"{func.__module__}.{func.__qualname__}"
+        code_hash = []
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # The code loaded into this process does not change, so it is hashed on the first call only
+            if not code_hash:
+                code_hash.append(code_version(func, version))
+            data_hash = "|".join(file_fingerprint(path) for path in data_files)
+            key = make_key(func_name, args, kwargs, data_hash, code_hash[0])
+            return (cache or default_cache()).get_or_compute(
+                key, lambda: func(*args, **kwargs), func_name
+            )
+
+        wrapper.func_name = func_name
+        return wrapper
+    return decorator
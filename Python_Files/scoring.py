@@ -0,0 +1,52 @@
+"""Derivation of the artist_scores columns from chart appearances.
+
+Each chart appearance counts once towards `frequency` and contributes
+1 / position to `rank_sum`. `ranking_score` is the weighted combination in
+RANKING_WEIGHTS, `rank` ranks it with ties sharing the best position, and the
+`*_normalized` columns are scaled to 0-1 by a ScoreNormalizer (min-max by
+default). These match the columns shipped in artist_scores.csv.
+"""
+import numpy as np
+import pandas as pd
+
+from normalization import ScoreNormalizer
+
+RANKING_WEIGHTS = {'frequency': 0.5, 'rank_sum': 1.5}
+
+SCORE_COLUMNS = ['artists', 'frequency', 'rank_sum', 'ranking_score', 'rank',
+                 'rank_sum_normalized', 'frequency_normalized']
+
+
+def position_weight(position):
+    # Contribution of one chart appearance to rank_sum
+    return 1.0 / np.asarray(position, dtype=float)
+
+
+def score_frame(df, method='min_max'):
+    # Recompute ranking_score, rank and the normalized columns from frequency and rank_sum
+    scored = df[['artists', 'frequency', 'rank_sum']].copy()
+    scored['frequency'] = scored['frequency'].astype(int)
+    scored['rank_sum'] = scored['rank_sum'].astype(float)
+    scored['ranking_score'] = sum(scored[column] * weight for column, weight in RANKING_WEIGHTS.items())
+    scored['rank'] = scored['ranking_score'].rank(ascending=False, method='min')
+    scored = ScoreNormalizer.fit(scored, ['rank_sum', 'frequency']).transform(scored, method)
+    return scored.sort_values('rank', kind='stable').reset_index(drop=True)[SCORE_COLUMNS]
+
+
+def aggregate_chart_entries(entries):
+    # Per-artist frequency and rank_sum from chart rows with `artists` and `position`
+    weights = position_weight(entries['position'])
+    return (
+        entries.assign(rank_sum=weights)
+        .groupby('artists', sort=False)
+        .agg(frequency=('position', 'size'), rank_sum=('rank_sum', 'sum'))
+        .reset_index()
+    )
+
+
+def fold_chart_entries(scores, entries):
+    # Add the appearances in `entries` to an existing scores table and re-derive the score columns
+    added = aggregate_chart_entries(entries)
+    combined = pd.concat([scores[['artists', 'frequency', 'rank_sum']], added], ignore_index=True)
+    totals = combined.groupby('artists', sort=False, as_index=False)[['frequency', 'rank_sum']].sum()
+    return score_frame(totals)
@@ -0,0 +1,134 @@
+"""Setlist planner: pick and order an artist's songs for a set of fixed length.
+
+Selection is a 0/1 knapsack over song durations (5-second units) that
+maximizes total popularity within the set length, solved with a vectorized
+dynamic program. Ordering is an open-path TSP over tempo/energy/valence
+distances with an extra term that rewards playing popular songs early.
+It starts from a nearest-neighbour tour and improves it with best-improvement
+2-opt, where every candidate segment reversal is scored at once with NumPy.
+Pools of 100+ songs plan in well under a second.
+"""
+import numpy as np
+import pandas as pd
+
+DURATION_UNIT = 5  # seconds per knapsack unit
+
+# Relative weight of each feature in the transition distance between two songs
+TRANSITION_WEIGHTS = {'tempo': 1.0, 'energy': 1.0, 'valence': 0.5}
+TEMPO_SCALE = 40.0  # BPM difference counted as one unit of distance
+
+
+def popularity(songs):
+    # Streams on a 0-1 log scale, so one mega-hit does not flatten the rest
+    streams = np.log1p(songs['streams'].to_numpy(dtype=float))
+    span = streams.max() - streams.min()
+    return (streams - streams.min()) / span if span > 0 else np.ones_like(streams)
+
+
+def transition_matrix(songs):
+    # Pairwise weighted feature distance between every two songs
+    features = np.column_stack([
+        songs['tempo'].to_numpy(dtype=float) / TEMPO_SCALE * TRANSITION_WEIGHTS['tempo'],
+        songs['energy'].to_numpy(dtype=float) * TRANSITION_WEIGHTS['energy'],
+        songs['valence'].to_numpy(dtype=float) * TRANSITION_WEIGHTS['valence'],
+    ])
+    return np.abs(features[:, None, :] - features[None, :, :]).sum(axis=2)
+
+
+def select_songs(durations, values, max_seconds):
+    # 0/1 knapsack: indices of the songs with the highest total value that fit in max_seconds
+    weights = np.ceil(np.asarray(durations, dtype=float) / DURATION_UNIT).astype(int)
+    capacity = int(max_seconds // DURATION_UNIT)
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((len(weights), capacity + 1), dtype=bool)
+    for i, (weight, value) in enumerate(zip(weights, values)):
+        if weight > capacity:
+            continue
+        # Each row is updated from the previous row in one vectorized step
+        candidate = best[:capacity + 1 - weight] + value
+        improves = candidate > best[weight:]
+        taken[i, weight:] = improves
+        best[weight:] = np.where(improves, candidate, best[weight:])
+    chosen, remaining = [], capacity
+    for i in range(len(weights) - 1, -1, -1):
+        if taken[i, remaining]:
+            chosen.append(i)
+            remaining -= weights[i]
+    return np.array(sorted(chosen), dtype=int)
+
+
+def path_cost(order, distances, pop, hit_weight):
+    transitions = distances[order[:-1], order[1:]].sum()
+    positions = np.arange(len(order)) / max(len(order) - 1, 1)
+    return transitions + hit_weight * (positions * pop[order]).sum()
+
+
+def order_songs(distances, pop, hit_weight=1.0, max_rounds=500):
+    # Open-path order minimizing transition distance plus a penalty for playing hits late
+    n = len(pop)
+    if n <= 2:
+        return np.argsort(-pop, kind='stable')
+    position_scale = hit_weight / (n - 1)
+
+    # Nearest-neighbour tour starting from the biggest hit
+    order = [int(np.argmax(pop))]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[order[0]] = False
+    for _ in range(n - 1):
+        last = order[-1]
+        cost = np.where(unvisited, distances[last] + position_scale * len(order) * pop, np.inf)
+        order.append(int(np.argmin(cost)))
+        unvisited[order[-1]] = False
+    order = np.array(order)
+
+    # Padded distance matrix: node n is a virtual endpoint at zero distance from every song
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = distances
+    i_idx, j_idx = np.triu_indices(n, k=1)
+    for _ in range(max_rounds):
+        tour = np.concatenate([[n], order, [n]])
+        before, first = tour[i_idx], tour[i_idx + 1]
+        last, after = tour[j_idx + 1], tour[j_idx + 2]
+        # Reversing order[i..j] swaps two edges...
+        edge_delta = (padded[before, last] + padded[first, after]
+                      - padded[before, first] - padded[last, after])
+        # ...and moves the song at position p to i + j - p
+        weights = pop[order]
+        prefix_w = np.concatenate([[0.0], np.cumsum(weights)])
+        prefix_pw = np.concatenate([[0.0], np.cumsum(np.arange(n) * weights)])
+        position_delta = ((i_idx + j_idx) * (prefix_w[j_idx + 1] - prefix_w[i_idx])
+                          - 2 * (prefix_pw[j_idx + 1] - prefix_pw[i_idx]))
+        delta = edge_delta + position_scale * position_delta
+        best = int(np.argmin(delta))
+        if delta[best] >= -1e-12:
+            break
+        i, j = i_idx[best], j_idx[best]
+        order[i:j + 1] = order[i:j + 1][::-1]
+    return order
+
+
+def plan_set(songs, max_minutes, hit_weight=1.0):
+    # Choose and order songs for one set; returns the songs in running order with start times
+    songs = songs.reset_index(drop=True)
+    pop = popularity(songs)
+    chosen = select_songs(songs['duration_sec'], pop, max_minutes * 60)
+    if len(chosen) == 0:
+        return songs.iloc[[]].assign(popularity=[], start_sec=[])
+    selected = songs.iloc[chosen].reset_index(drop=True)
+    order = order_songs(transition_matrix(selected), pop[chosen], hit_weight)
+    planned = selected.iloc[order].reset_index(drop=True)
+    planned['popularity'] = pop[chosen][order]
+    planned['start_sec'] = np.concatenate([[0], np.cumsum(planned['duration_sec'].to_numpy()[:-1])])
+    return planned
+
+
+def plan_show(opener_songs, headliner_songs, opener_minutes=45, headliner_minutes=90,
+              hit_weight=1.0, changeover_minutes=20):
+    # Opener set, changeover, then headliner set as one running order
+    opener = plan_set(opener_songs, opener_minutes, hit_weight).assign(set='Opener')
+    headliner = plan_set(headliner_songs, headliner_minutes, hit_weight).assign(set='Headliner')
+    opener_end = opener['duration_sec'].sum() if len(opener) else 0
+    headliner['start_sec'] = headliner['start_sec'] + opener_end + changeover_minutes * 60
+    show = pd.concat([opener, headliner], ignore_index=True)
+    show.insert(0, 'slot', np.arange(1, len(show) + 1))
+    return show
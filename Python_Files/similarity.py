@@ -0,0 +1,101 @@
+"""Batch nearest-neighbour queries over standardized artist features.
+
+Features are standardized once (like StandardScaler). A batch of seed
+artists is answered with one matrix product per block of seeds: squared
+distances come from |s|^2 + |y|^2 - 2 s.y, and argpartition picks each
+seed's k nearest artists. The same pass gives each seed's farthest
+distance, which scales similarity to 0-1. For large catalogs the seed
+blocks can be fanned out across a process pool; each worker receives the
+feature matrix once through its initializer.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+NEIGHBOR_COLUMNS = ['seed', 'neighbor_rank', 'artist', 'distance', 'similarity', 'fee']
+
+# Seeds per matrix product, so a block's distance matrix stays around tens of MB
+SEED_BLOCK = 256
+
+_worker_state = {}
+
+
+def _init_worker(matrix, squared_norms):
+    _worker_state['matrix'] = matrix
+    _worker_state['squared_norms'] = squared_norms
+
+
+def _nearest(matrix, squared_norms, seed_rows, k):
+    # k nearest rows (excluding the seed itself) with distances, plus the farthest distance per seed
+    seeds = matrix[seed_rows]
+    squared = squared_norms[seed_rows][:, None] + squared_norms[None, :] - 2.0 * seeds @ matrix.T
+    np.maximum(squared, 0, out=squared)
+    squared[np.arange(len(seed_rows)), seed_rows] = np.inf
+    k = min(k, matrix.shape[0] - 1)
+    nearest = np.argpartition(squared, k - 1, axis=1)[:, :k] if k > 0 else np.zeros((len(seed_rows), 0), dtype=int)
+    nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+    order = np.argsort(nearest_squared, axis=1, kind='stable')
+    nearest = np.take_along_axis(nearest, order, axis=1)
+    distances = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+    squared[np.arange(len(seed_rows)), seed_rows] = 0
+    farthest = np.sqrt(squared.max(axis=1))
+    return nearest, distances, farthest
+
+
+def _nearest_in_worker(seed_rows, k):
+    return _nearest(_worker_state['matrix'], _worker_state['squared_norms'], seed_rows, k)
+
+
+class SimilarityIndex:
+    def __init__(self, features, feature_columns, name_column='Artists', fee_column='Minimum Fees (in Dollars)'):
+        self.features = features.reset_index(drop=True)
+        self.names = self.features[name_column].to_numpy()
+        self._rows = {name: i for i, name in enumerate(self.names)}
+        self.fees = (self.features[fee_column].to_numpy(dtype=float) if fee_column in self.features
+                     else np.full(len(self.features), np.nan))
+        values = self.features[feature_columns].to_numpy(dtype=float)
+        scale = values.std(axis=0)
+        self.matrix = (values - values.mean(axis=0)) / np.where(scale > 0, scale, 1.0)
+        self.squared_norms = (self.matrix ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, artist):
+        return artist in self._rows
+
+    def row(self, artist):
+        return self._rows[artist]
+
+    def query(self, seed_rows, k=5, n_jobs=1):
+        # Nearest rows, distances and farthest distance for every seed row, in seed order
+        seed_rows = np.asarray(seed_rows, dtype=int)
+        blocks = [seed_rows[start:start + SEED_BLOCK] for start in range(0, len(seed_rows), SEED_BLOCK)]
+        if n_jobs == 1 or len(blocks) <= 1:
+            results = [_nearest(self.matrix, self.squared_norms, block, k) for block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                     initargs=(self.matrix, self.squared_norms)) as pool:
+                results = list(pool.map(_nearest_in_worker, blocks, [k] * len(blocks)))
+        if not results:
+            width = min(k, max(len(self.names) - 1, 0))
+            return np.zeros((0, width), dtype=int), np.zeros((0, width)), np.zeros(0)
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
+    def neighbors(self, seeds, k=5, n_jobs=1):
+        # Tidy table of the k most similar artists for each seed artist name
+        seeds = [seed for seed in seeds if seed in self._rows]
+        nearest, distances, farthest = self.query([self._rows[seed] for seed in seeds], k, n_jobs)
+        width = nearest.shape[1]
+        similarity = 1 - np.divide(distances, farthest[:, None], out=np.zeros_like(distances),
+                                   where=farthest[:, None] > 0)
+        flat = nearest.ravel()
+        return pd.DataFrame({
+            'seed': np.repeat(np.asarray(seeds, dtype=object), width),
+            'neighbor_rank': np.tile(np.arange(1, width + 1), len(seeds)),
+            'artist': self.names[flat],
+            'distance': distances.ravel(),
+            'similarity': similarity.ravel(),
+            'fee': self.fees[flat],
+        }, columns=NEIGHBOR_COLUMNS)
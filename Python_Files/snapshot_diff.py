@@ -0,0 +1,60 @@
+"""Diff two artist_scores snapshots to see who moved between data versions.
+
+Both snapshots are joined on `artists` with a single factorize-and-scatter
+pass, and every artist is labelled as new, dropped, up, down or unchanged.
+rank_delta is positive when an artist climbed (old rank minus new rank).
+"""
+import numpy as np
+import pandas as pd
+
+STATUSES = ['unchanged', 'new', 'dropped', 'up', 'down']
+
+DIFF_COLUMNS = ['artists', 'status', 'old_rank', 'new_rank', 'rank_delta',
+                'old_score', 'new_score', 'score_delta']
+
+
+def diff_snapshots(old, new):
+    # Factorize the union of names once, then scatter both snapshots into aligned arrays
+    codes, artists = pd.factorize(pd.concat([old['artists'], new['artists']], ignore_index=True))
+    old_codes, new_codes = codes[:len(old)], codes[len(old):]
+
+    def aligned(codes_, values):
+        out = np.full(len(artists), np.nan)
+        out[codes_] = np.asarray(values, dtype=float)
+        return out
+
+    old_rank, new_rank = aligned(old_codes, old['rank']), aligned(new_codes, new['rank'])
+    old_score, new_score = aligned(old_codes, old['ranking_score']), aligned(new_codes, new['ranking_score'])
+    rank_delta = old_rank - new_rank
+    status = np.select(
+        [np.isnan(old_rank), np.isnan(new_rank), rank_delta > 0, rank_delta < 0],
+        [1, 2, 3, 4],
+        default=0
+    ).astype(np.int8)
+    # Current rank first, dropped artists last in their old order
+    sort_key = np.where(np.isnan(new_rank), np.nanmax(new_rank, initial=0) + 1 + old_rank, new_rank)
+    order = np.argsort(sort_key, kind='stable')
+    return pd.DataFrame({
+        'artists': artists.take(order),
+        'status': pd.Categorical.from_codes(status[order], categories=STATUSES),
+        'old_rank': old_rank[order],
+        'new_rank': new_rank[order],
+        'rank_delta': rank_delta[order],
+        'old_score': old_score[order],
+        'new_score': new_score[order],
+        'score_delta': (np.nan_to_num(new_score) - np.nan_to_num(old_score))[order],
+    }, columns=DIFF_COLUMNS)
+
+
+def summarize(diff):
+    counts = diff['status'].value_counts()
+    return {status: int(counts.get(status, 0)) for status in STATUSES}
+
+
+def top_movers(diff, n=10, within_rank=None):
+    # Largest climbers and fallers among artists present in both snapshots
+    moved = diff[diff['status'].isin(['up', 'down'])]
+    if within_rank is not None:
+        moved = moved[(moved['new_rank'] <= within_rank) | (moved['old_rank'] <= within_rank)]
+    order = np.argsort(-np.abs(moved['rank_delta'].to_numpy()), kind='stable')[:n]
+    return moved.iloc[order]
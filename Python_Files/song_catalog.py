@@ -0,0 +1,114 @@
+"""Song-level catalog with precomputed top-N indexes per artist, metric and album.
+
+The catalog is read from the CSV in one pass and kept in memory, since every
+query returns song rows. At load time each metric is sorted once, and a
+stable re-sort by group (artist, and artist + album) yields the best TOP_K
+songs of every group. The hit-song views then read their top 10 lists and
+album filters without re-sorting on each rerun. Requests deeper than TOP_K
+fall back to an argpartition over that group's rows.
+"""
+import numpy as np
+import pandas as pd
+
+SONG_COLUMNS = ['artist', 'song_title', 'album', 'release_year', 'streams',
+                'chart_position', 'grammy_nominations']
+
+# Optional per-track audio columns used by the setlist planner
+AUDIO_COLUMNS = ['duration_sec', 'tempo', 'energy', 'valence']
+
+# Metric -> True when a lower value is better
+METRICS = {
+    'streams': False,
+    'chart_position': True,
+    'grammy_nominations': False,
+    'release_year': False,
+}
+
+TOP_K = 50
+
+
+class _GroupIndex:
+    # Rows of each group in file order plus the best TOP_K rows of each group per metric
+    def __init__(self, codes, n_groups, sort_keys, key_orders, top_k):
+        n_rows = len(codes)
+        counts = np.bincount(codes, minlength=n_groups)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.rows = np.argsort(codes, kind='stable')
+        self.top_k = top_k
+        self.sort_keys = sort_keys
+        self.top = {}
+        top_offsets = np.concatenate([[0], np.cumsum(np.minimum(counts, top_k))])
+        for metric, key_order in key_orders.items():
+            # Stable re-sort of the metric order by group: group first, then metric, then file order
+            order = key_order[np.argsort(codes[key_order], kind='stable')]
+            position_in_group = np.arange(n_rows) - self.offsets[codes[order]]
+            self.top[metric] = (order[position_in_group < top_k], top_offsets)
+
+    def members(self, group):
+        return self.rows[self.offsets[group]:self.offsets[group + 1]]
+
+    def best(self, group, metric, n):
+        if n <= self.top_k:
+            rows, offsets = self.top[metric]
+            return rows[offsets[group]:min(offsets[group] + n, offsets[group + 1])]
+        # Deeper than the precomputed lists: partition the group's rows, then sort the head
+        members = self.members(group)
+        key = self.sort_keys[metric][members]
+        head = np.argpartition(key, n - 1)[:n] if n < len(members) else np.arange(len(members))
+        return members[head[np.lexsort((members[head], key[head]))]]
+
+
+class SongCatalog:
+    def __init__(self, songs, top_k=TOP_K):
+        self.songs = songs.reset_index(drop=True)
+        sort_keys, key_orders = {}, {}
+        for metric, lower_is_better in METRICS.items():
+            values = self.songs[metric].to_numpy(dtype=float)
+            sort_keys[metric] = values if lower_is_better else -values
+            # Shared by both groupings below (best first, file order for ties)
+            key_orders[metric] = np.argsort(sort_keys[metric], kind='stable')
+
+        artist_codes, artists = pd.factorize(self.songs['artist'])
+        self._artist_ids = {name: i for i, name in enumerate(artists)}
+        self._by_artist = _GroupIndex(artist_codes, len(artists), sort_keys, key_orders, top_k)
+
+        # Album groups are numbered in order of first appearance
+        album_codes = self.songs.groupby(['artist', 'album'], sort=False).ngroup().to_numpy()
+        albums = list(self.songs[['artist', 'album']].drop_duplicates().itertuples(index=False, name=None))
+        self._album_ids = {pair: i for i, pair in enumerate(albums)}
+        self._by_album = _GroupIndex(album_codes, len(albums), sort_keys, key_orders, top_k)
+
+        # Albums of each artist in order of first appearance
+        self._albums = {}
+        for artist, album in albums:
+            self._albums.setdefault(artist, []).append(album)
+
+    @classmethod
+    def from_csv(cls, path, top_k=TOP_K):
+        wanted = set(SONG_COLUMNS + AUDIO_COLUMNS)
+        return cls(pd.read_csv(path, usecols=lambda column: column in wanted), top_k=top_k)
+
+    def artists(self):
+        return list(self._artist_ids)
+
+    def songs_for(self, artist):
+        return self.songs.iloc[self._by_artist.members(self._artist_ids[artist])]
+
+    def top(self, artist, metric='streams', n=10, album=None):
+        # Best `n` songs of `artist` by `metric`, optionally within one album
+        if metric not in METRICS:
+            raise ValueError(f"Unknown song metric: {metric}")
+        if album is None:
+            rows = self._by_artist.best(self._artist_ids[artist], metric, n)
+        else:
+            rows = self._by_album.best(self._album_ids[(artist, album)], metric, n)
+        return self.songs.iloc[rows]
+
+    def albums(self, artist):
+        return list(self._albums.get(artist, []))
+
+    def album_songs(self, artist, album):
+        group = self._album_ids.get((artist, album))
+        if group is None:
+            return []
+        return self.songs['song_title'].to_numpy()[self._by_album.members(group)].tolist()
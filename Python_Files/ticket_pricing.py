@@ -0,0 +1,185 @@
+"""Seating-tier ticket prices that maximize expected revenue for a lineup.
+
+The attendance simulator's expected demand per age group is taken as demand
+at each tier's reference price. Each age group splits across tiers by
+TIER_PREFERENCE and responds to price with its own elasticity, so younger
+fans are more price-sensitive. Summing the groups gives a tier demand curve
+that is not exactly constant-elasticity. A constant-elasticity curve,
+q = q_ref * (price / reference) ** -elasticity, is fitted to it per tier by
+log-log least squares. The same fit accepts observed (price, tickets sold)
+pairs when there are some.
+
+Revenue in a tier is price x min(shocked demand, seats), averaged over
+shared mean-one lognormal market shocks, so prices near the sellout edge pay
+for the risk of empty seats. The draws are sorted once, and each grid point
+reads its average from their prefix sums, so memory does not grow with the
+number of draws. The search evaluates every tier on a
+geometric price grid at once. Tier revenues are added over the full grid of
+price vectors by broadcasting, and vectors that price a better tier below a
+worse one are masked out. The grid is then narrowed around the best vector
+for a few rounds. Net margin subtracts the lineup's booking fees.
+"""
+import numpy as np
+import pandas as pd
+
+from attendance_simulator import ARENA_CAPACITY, MARKET_SIGMA
+from data_bundle import ARTIST_PROFILES
+
+# Capital One Arena seats per tier, best first; they add up to ARENA_CAPACITY
+SEATING_TIERS = {'Floor': 3_356, 'Lower Bowl': 8_500, 'Upper Bowl': 8_500}
+REFERENCE_PRICES = {'Floor': 250.0, 'Lower Bowl': 160.0, 'Upper Bowl': 90.0}
+
+# Share of each age group's buyers wanting each tier (columns follow SEATING_TIERS)
+TIER_PREFERENCE = {
+    '13-17': [0.30, 0.35, 0.35],
+    '18-24': [0.35, 0.35, 0.30],
+    '25-34': [0.25, 0.45, 0.30],
+    '35-44': [0.20, 0.50, 0.30],
+    '45-54': [0.15, 0.50, 0.35],
+    '55+': [0.10, 0.50, 0.40],
+}
+PRICE_ELASTICITY = {'13-17': 2.4, '18-24': 2.0, '25-34': 1.6, '35-44': 1.4, '45-54': 1.3, '55+': 1.2}
+
+# Searched prices, as multiples of each tier's reference price
+PRICE_RANGE = (0.4, 3.0)
+GRID_SIZE = 41
+REFINE_ROUNDS = 3
+N_DRAWS = 2000
+
+
+def fit_demand_curve(prices, quantities, reference):
+    # Least-squares constant-elasticity fit on a log-log scale; the last axis holds the observations
+    x = np.log(np.asarray(prices, dtype=float) / reference)
+    y = np.log(np.maximum(np.asarray(quantities, dtype=float), 1e-9))
+    x_centered = x - x.mean(axis=-1, keepdims=True)
+    slope = (x_centered * (y - y.mean(axis=-1, keepdims=True))).sum(axis=-1) / (x_centered ** 2).sum(axis=-1)
+    intercept = y.mean(axis=-1) - slope * x.mean(axis=-1)
+    return np.exp(intercept), -slope
+
+
+def tier_demand_curves(expected, music_prefs, tiers=SEATING_TIERS, reference_prices=REFERENCE_PRICES,
+                       preference=TIER_PREFERENCE, elasticity=PRICE_ELASTICITY, n_points=25):
+    # Fitted (reference demand, elasticity) per lineup and tier from (lineups x age groups) expected demand
+    groups = list(music_prefs['Age_Group'])
+    shares = np.array([preference[group] for group in groups])
+    group_elasticity = np.array([elasticity[group] for group in groups])
+    multiples = np.geomspace(*PRICE_RANGE, n_points)
+    # (lineups, age groups, tiers, price points), summed over age groups
+    demand = (expected[:, :, None, None] * shares[None, :, :, None]
+              * multiples[None, None, None, :] ** -group_elasticity[None, :, None, None]).sum(axis=1)
+    reference = np.array([reference_prices[tier] for tier in tiers])
+    return fit_demand_curve(reference[:, None] * multiples, demand, reference[:, None])
+
+
+def _market_shocks(seed, n_draws, sigma):
+    # Mean-one lognormal demand shocks shared by every lineup, tier and price, sorted, with prefix sums
+    shocks = np.sort(np.random.default_rng(seed).lognormal(-sigma ** 2 / 2, sigma, n_draws))
+    return shocks, np.concatenate([[0.0], np.cumsum(shocks)])
+
+
+def _tier_revenue(prices, reference, q_ref, elasticity, seats, shocks):
+    # Expected tickets sold, sellout probability and revenue per (lineup, tier, price) grid point.
+    # min(q S, seats) = q min(S, seats / q), so the average over the sorted draws S needs only the
+    # number of draws below the sellout threshold seats / q and their prefix sum.
+    sorted_shocks, prefix = shocks
+    n_draws = len(sorted_shocks)
+    demand = q_ref[:, :, None] * (prices / reference[None, :, None]) ** -elasticity[:, :, None]
+    threshold = seats[None, :, None] / np.maximum(demand, 1e-12)
+    below = np.searchsorted(sorted_shocks, threshold, side='left')
+    sold = demand * (prefix[below] + threshold * (n_draws - below)) / n_draws
+    sellout = (n_draws - below) / n_draws
+    return sold, sellout, prices * sold
+
+
+def _best_price_vectors(revenue, prices):
+    # Grid index per tier of the best price vector for each lineup, with tiers priced in order
+    n_lineups, n_tiers, grid_size = revenue.shape
+    total = revenue[:, 0]
+    feasible = np.ones((n_lineups, grid_size), dtype=bool)
+    for tier in range(1, n_tiers):
+        shape = (n_lineups,) + (1,) * tier + (grid_size,)
+        total = total[..., None] + revenue[:, tier].reshape(shape)
+        # A tier may not cost more than the tier before it
+        ordered = prices[:, tier - 1, :, None] >= prices[:, tier, None, :]
+        feasible = feasible[..., None] & ordered.reshape((n_lineups,) + (1,) * (tier - 1) + (grid_size, grid_size))
+    total = np.where(feasible, total, -np.inf).reshape(n_lineups, -1)
+    return np.stack(np.unravel_index(total.argmax(axis=1), (grid_size,) * n_tiers), axis=1)
+
+
+def optimize_tier_prices(q_ref, elasticity, capacity=ARENA_CAPACITY, tiers=SEATING_TIERS,
+                         reference_prices=REFERENCE_PRICES, grid_size=GRID_SIZE, refine_rounds=REFINE_ROUNDS,
+                         n_draws=N_DRAWS, market_sigma=MARKET_SIGMA, seed=0):
+    # Revenue-maximizing price per lineup and tier, with expected tickets sold, sellout chance and revenue
+    names = list(tiers)
+    seats = np.array([tiers[tier] for tier in names], dtype=float)
+    seats = np.floor(seats * capacity / seats.sum())
+    reference = np.array([reference_prices[tier] for tier in names])
+    shocks = _market_shocks(seed, n_draws, market_sigma)
+
+    n_lineups = len(q_ref)
+    low = np.broadcast_to(np.log(reference * PRICE_RANGE[0]), (n_lineups, len(names)))
+    high = np.broadcast_to(np.log(reference * PRICE_RANGE[1]), (n_lineups, len(names)))
+    for _ in range(refine_rounds + 1):
+        prices = np.exp(np.linspace(low, high, grid_size, axis=-1))
+        sold, sellout, revenue = _tier_revenue(prices, reference, q_ref, elasticity, seats, shocks)
+        best = _best_price_vectors(revenue, prices)
+        # Next round searches two grid steps either side of the best price
+        best_log = np.log(np.take_along_axis(prices, best[..., None], axis=-1)[..., 0])
+        step = (high - low) / (grid_size - 1)
+        low, high = best_log - 2 * step, best_log + 2 * step
+
+    pick = best[..., None]
+    return (np.take_along_axis(prices, pick, axis=-1)[..., 0], np.take_along_axis(sold, pick, axis=-1)[..., 0],
+            np.take_along_axis(sellout, pick, axis=-1)[..., 0], np.take_along_axis(revenue, pick, axis=-1)[..., 0],
+            seats)
+
+
+def artist_fee_table(fee_index, artists):
+    # Minimum and maximum booking fee per artist: supporting-artist fee columns first, then ARTIST_PROFILES
+    fees = fee_index.fees_for(artists)
+    profiles = pd.DataFrame(ARTIST_PROFILES).set_index('Artists')['Minimum Fees (in Dollars)']
+    known = profiles.reindex(fees.index)
+    fees['minimum_fee'] = fees['minimum_fee'].fillna(known)
+    fees['maximum_fee'] = fees['maximum_fee'].fillna(known)
+    return fees
+
+
+def price_lineups(lineups, expected, music_prefs, fees, capacity=ARENA_CAPACITY, tiers=SEATING_TIERS,
+                  reference_prices=REFERENCE_PRICES, seed=0):
+    # Per-lineup revenue and net margin at the optimal prices, plus the per-tier prices behind them
+    names = list(lineups)
+    q_ref, elasticity = tier_demand_curves(expected, music_prefs, tiers, reference_prices)
+    prices, sold, sellout, revenue, seats = optimize_tier_prices(
+        q_ref, elasticity, capacity, tiers, reference_prices, seed=seed)
+
+    # Revenue at the reference prices, for the uplift from optimizing
+    reference = np.array([reference_prices[tier] for tier in tiers])
+    shocks = _market_shocks(seed, N_DRAWS, MARKET_SIGMA)
+    _, _, baseline = _tier_revenue(np.broadcast_to(reference[None, :, None], (len(names), len(tiers), 1)),
+                                   reference, q_ref, elasticity, seats, shocks)
+
+    tier_table = pd.DataFrame({
+        'lineup': np.repeat(names, len(tiers)),
+        'tier': np.tile(list(tiers), len(names)),
+        'seats': np.tile(seats, len(names)).astype(int),
+        'elasticity': elasticity.ravel(),
+        'price': prices.ravel(),
+        'expected_sold': sold.ravel(),
+        'sellout_probability': sellout.ravel(),
+        'expected_revenue': revenue.ravel(),
+    })
+
+    # A lineup's fee is unknown (NaN) if any act's fee is unknown
+    fee_min = np.array([fees['minimum_fee'].reindex(lineups[name]).sum(skipna=False) for name in names])
+    fee_max = np.array([fees['maximum_fee'].reindex(lineups[name]).sum(skipna=False) for name in names])
+    summary = pd.DataFrame({
+        'lineup': names,
+        'expected_tickets': sold.sum(axis=1),
+        'expected_revenue': revenue.sum(axis=1),
+        'reference_revenue': baseline[..., 0].sum(axis=1),
+        'fee_min': fee_min,
+        'fee_max': fee_max,
+        'net_margin_low': revenue.sum(axis=1) - fee_max,
+        'net_margin_high': revenue.sum(axis=1) - fee_min,
+    })
+    return summary, tier_table
@@ -0,0 +1,68 @@
+"""Gantt-style career timeline built from a milestone table.
+
+Every release or milestone is one bar of a single horizontal go.Bar trace:
+bar bases, widths, colours and hover text are arrays, and the year axis and
+its ticks are derived from the data. A discography with hundreds of
+releases is still one trace and a few columns of JSON.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px  # type: ignore
+import plotly.graph_objects as go  # type: ignore
+
+MILESTONE_COLUMNS = ['artist', 'year', 'milestone', 'usa_sales', 'global_sales']
+
+MAX_TICKS = 12
+
+
+def load_milestones(path):
+    return pd.read_csv(path, usecols=MILESTONE_COLUMNS)
+
+
+def milestones_for(milestones, artist):
+    # One artist's milestones in the column names the biography views use
+    rows = milestones[milestones['artist'] == artist].sort_values('year', kind='stable')
+    timeline_df = pd.DataFrame({
+        'Year': rows['year'].to_numpy(),
+        'Album/Milestone': rows['milestone'].to_numpy(),
+        'USA_Sales': rows['usa_sales'].to_numpy(dtype=float),
+        'Global_Sales': rows['global_sales'].to_numpy(dtype=float),
+    })
+    timeline_df['End_Year'] = timeline_df['Year'] + 1
+    return timeline_df
+
+
+def year_ticks(start, end):
+    # Whole-year ticks over [start, end), thinned to at most MAX_TICKS
+    step = max(int(np.ceil((end - start) / MAX_TICKS)), 1)
+    return list(range(int(start), int(end), step))
+
+
+def timeline_figure(timeline_df, title, palette=px.colors.qualitative.Pastel, height=None):
+    colors = np.asarray(palette, dtype=object)[np.arange(len(timeline_df)) % len(palette)]
+    sales = timeline_df['Global_Sales'].to_numpy(dtype=float)
+    sales_text = np.where(np.isnan(sales), 'N/A', pd.Series(sales).map('{:,.0f}'.format).to_numpy())
+    fig = go.Figure(go.Bar(
+        x=(timeline_df['End_Year'] - timeline_df['Year']).to_numpy(),  # Width of each bar
+        y=timeline_df['Album/Milestone'].to_numpy(),
+        base=timeline_df['Year'].to_numpy(),  # Start position
+        orientation='h',
+        marker_color=colors,
+        customdata=np.column_stack([timeline_df['Year'].to_numpy(), sales_text]),
+        hovertemplate="%{y}<br>Year: %{customdata[0]}<br>Global_Sales: %{customdata[1]}<extra></extra>"
+    ))
+    ticks = year_ticks(timeline_df['Year'].min(), timeline_df['End_Year'].max()) if len(timeline_df) else []
+    fig.update_layout(
+        height=height or max(350, 22 * len(timeline_df)),
+        showlegend=False,
+        xaxis_title="",
+        yaxis_title="",
+        title=title,
+        xaxis=dict(
+            tickmode='array',
+            tickvals=ticks,
+            ticktext=[str(year) for year in ticks],
+        ),
+        yaxis=dict(categoryorder='array', categoryarray=timeline_df['Album/Milestone'].to_numpy())
+    )
+    return fig
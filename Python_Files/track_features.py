@@ -0,0 +1,102 @@
+"""Streaming aggregation of per-track audio features into per-artist statistics.
+
+A track file is read in chunks. Each chunk is reduced to per-artist counts,
+means and sums of squared deviations, then merged into a running
+accumulator with the pairwise (Chan et al.) update. Accumulators merge the
+same way, so several files can be aggregated in separate processes and
+combined at the end.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+TRACK_FEATURES = ['danceability', 'energy', 'speechiness', 'acousticness',
+                  'liveness', 'valence', 'tempo', 'popularity']
+
+
+class FeatureAccumulator:
+    def __init__(self, features=TRACK_FEATURES):
+        self.features = list(features)
+        self.artists = pd.Index([], dtype=object)
+        self.count = np.zeros(0)
+        self.mean = np.zeros((0, len(self.features)))
+        self.m2 = np.zeros((0, len(self.features)))
+
+    def __len__(self):
+        return len(self.artists)
+
+    def _combine(self, artists, count, mean, m2):
+        # Pairwise merge of (count, mean, m2) statistics aligned on artist name
+        union = self.artists.append(artists.difference(self.artists, sort=False))
+        n = len(union)
+        positions = union.get_indexer(artists)
+
+        total = np.zeros(n)
+        total[:len(self.artists)] = self.count
+        merged_mean = np.zeros((n, len(self.features)))
+        merged_mean[:len(self.artists)] = self.mean
+        merged_m2 = np.zeros((n, len(self.features)))
+        merged_m2[:len(self.artists)] = self.m2
+
+        old_count = total[positions]
+        new_total = old_count + count
+        delta = mean - merged_mean[positions]
+        merged_mean[positions] += delta * (count / new_total)[:, None]
+        merged_m2[positions] += m2 + delta ** 2 * (old_count * count / new_total)[:, None]
+        total[positions] = new_total
+
+        self.artists, self.count, self.mean, self.m2 = union, total, merged_mean, merged_m2
+        return self
+
+    def update(self, tracks, artist_column='artist'):
+        # Fold one chunk of tracks into the running statistics
+        tracks = tracks.dropna(subset=[artist_column] + self.features)
+        if tracks.empty:
+            return self
+        codes, artists = pd.factorize(tracks[artist_column])
+        count = np.bincount(codes, minlength=len(artists)).astype(float)
+        values = tracks[self.features].to_numpy(dtype=float)
+        mean = np.column_stack([
+            np.bincount(codes, weights=values[:, i], minlength=len(artists)) for i in range(len(self.features))
+        ]) / count[:, None]
+        deviations = (values - mean[codes]) ** 2
+        m2 = np.column_stack([
+            np.bincount(codes, weights=deviations[:, i], minlength=len(artists)) for i in range(len(self.features))
+        ])
+        return self._combine(pd.Index(artists, dtype=object), count, mean, m2)
+
+    def merge(self, other):
+        return self._combine(other.artists, other.count, other.mean, other.m2)
+
+    def to_frame(self, artist_column='Artists'):
+        # One row per artist: feature means, population variances and the number of tracks
+        frame = pd.DataFrame(self.mean, columns=self.features)
+        variance = np.divide(self.m2, self.count[:, None], out=np.zeros_like(self.m2), where=self.count[:, None] > 0)
+        for i, feature in enumerate(self.features):
+            frame[f'{feature}_var'] = variance[:, i]
+        frame['track_count'] = self.count.astype(int)
+        frame.insert(0, artist_column, self.artists.to_numpy())
+        return frame
+
+
+def aggregate_file(path, chunksize=500_000, artist_column='artist', features=TRACK_FEATURES):
+    accumulator = FeatureAccumulator(features)
+    for chunk in pd.read_csv(path, usecols=[artist_column] + list(features), chunksize=chunksize):
+        accumulator.update(chunk, artist_column)
+    return accumulator
+
+
+def aggregate_files(paths, chunksize=500_000, artist_column='artist', features=TRACK_FEATURES, max_workers=None):
+    # Aggregate each file on its own (in worker processes when there is more than one) and merge the results
+    paths = list(paths)
+    if len(paths) <= 1 or max_workers == 1:
+        partials = [aggregate_file(path, chunksize, artist_column, features) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            partials = list(pool.map(aggregate_file, paths, [chunksize] * len(paths),
+                                     [artist_column] * len(paths), [features] * len(paths)))
+    total = FeatureAccumulator(features)
+    for partial in partials:
+        total.merge(partial)
+    return total
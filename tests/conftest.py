@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# The dashboard modules import each other as top-level modules from Python_Files
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Python_Files"))
+
+# Keep the SQLite store and the result cache out of the working tree; both are read at import time
+_scratch = tempfile.mkdtemp(prefix="concert-tests-")
+os.environ.setdefault("CONCERT_STORE_PATH", os.path.join(_scratch, "store.sqlite"))
+os.environ.setdefault("CONCERT_CACHE_DIR", os.path.join(_scratch, "cache"))
@@ -0,0 +1,82 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import api_server
+
+
+@pytest.fixture
+def server():
+    httpd = api_server.PooledHTTPServer(('127.0.0.1', 0), api_server.APIHandler, workers=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(url, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_non_integer_k_is_a_bad_request(server):
+    assert _request(f"{server}/similar", {'artists': ['Sabrina Carpenter'], 'k': 'abc'})[0] == 400
+    assert _request(f"{server}/similar", {'artists': ['Sabrina Carpenter'], 'k': None})[0] == 400
+    assert _request(f"{server}/similar?artist=Sabrina%20Carpenter&k=abc")[0] == 400
+    assert _request(f"{server}/similar?artist=Sabrina%20Carpenter&k=0")[0] == 400
+
+
+def test_similar_answers_known_artists(server):
+    status, payload = _request(f"{server}/similar", {'artists': ['Sabrina Carpenter', 'Nobody'], 'k': 3})
+    assert status == 200
+    assert payload['unknown'] == ['Nobody']
+    assert {row['seed'] for row in payload['neighbors']} == {'Sabrina Carpenter'}
+
+
+def test_edited_scores_file_is_picked_up(tmp_path, monkeypatch):
+    path = tmp_path / "artist_scores.csv"
+    columns = ['artists', 'frequency', 'rank_sum', 'ranking_score', 'rank', 'rank_sum_normalized',
+               'frequency_normalized']
+    pd.DataFrame([['A', 3, 1.5, 2.0, 1, 1.0, 1.0]], columns=columns).to_csv(path, index=False)
+    monkeypatch.setattr(api_server, 'SCORES_PATH', str(path))
+    first = api_server.get_artist_store().artist_scores(['A', 'B'])
+    pd.DataFrame([['A', 3, 1.5, 2.0, 2, 1.0, 1.0], ['B', 5, 2.5, 4.0, 1, 1.0, 1.0]],
+                 columns=columns).to_csv(path, index=False)
+    second = api_server.get_artist_store().artist_scores(['A', 'B'])
+    assert first['artists'].tolist() == ['A']
+    assert sorted(second['artists']) == ['A', 'B']
+
+
+def test_decision_matrix_follows_the_scores_file(tmp_path, monkeypatch):
+    scores = pd.read_csv(api_server.SCORES_PATH)
+    scores.loc[scores['artists'] == 'Zach Bryan', 'ranking_score'] = scores['ranking_score'].max() + 1
+    path = tmp_path / "artist_scores.csv"
+    scores.to_csv(path, index=False)
+    monkeypatch.setattr(api_server, 'SCORES_PATH', str(path))
+    matrix = pd.DataFrame(api_server.decision('min_max')['decision_matrix']).set_index('Artist')
+    assert matrix['Ranking_Score'].idxmax() == 'Zach Bryan'
+    assert matrix.loc['Zach Bryan', 'Ranking_Score'] == 100
+
+
+def test_result_counts_must_be_positive_whole_numbers(server):
+    for path in ['/scores/top', '/scores/formula?expr=frequency&', '/fees/cheapest?budget=50000&']:
+        separator = '' if path.endswith('&') else '?'
+        for n in ['-1', '0', '2.5', 'abc']:
+            assert _request(f"{server}{path}{separator}n={n}")[0] == 400
+    status, payload = _request(f"{server}/scores/top?n=3")
+    assert status == 200 and len(payload['scores']) == 3
+    status, payload = _request(f"{server}/scores/formula?expr=frequency&n=2")
+    assert status == 200 and len(payload['scores']) == 2
+    assert _request(f"{server}/similar", {'artists': ['Sabrina Carpenter'], 'k': 2.5})[0] == 400
+    assert _request(f"{server}/fees/cheapest", {'queries': [{'budget': 50000, 'n': -1}]})[0] == 400
+    status, payload = _request(f"{server}/fees/cheapest", {'queries': [{'budget': 'x'}]})
+    assert status == 400 and 'budget' in payload['error']
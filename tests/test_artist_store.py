@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from artist_store import HISTORY_VERSIONS, ArtistStore
+from scoring import position_weight
+
+
+def _day(date, artists):
+    return pd.DataFrame({'date': date, 'artists': artists, 'position': np.arange(1, len(artists) + 1)})
+
+
+def _brute_force_totals(entries):
+    totals = {}
+    for artist, position in zip(entries['artists'], entries['position']):
+        frequency, rank_sum = totals.get(artist, (0, 0.0))
+        totals[artist] = (frequency + 1, rank_sum + float(position_weight(position)))
+    return totals
+
+
+def test_published_days_fold_into_totals_and_bump_the_version(tmp_path):
+    store = ArtistStore(str(tmp_path / "store.sqlite"))
+    days = [_day('2025-01-01', ['A', 'B', 'C']), _day('2025-01-02', ['B', 'A']), _day('2025-01-03', ['D', 'B'])]
+    for i, day in enumerate(days):
+        assert store.publish_chart_entries(day, f"hash{i}", f"day{i}.csv") == i + 1
+    # The same file again is a no-op
+    assert store.publish_chart_entries(days[0], "hash0", "day0.csv") is None
+    assert store.data_version() == 3
+
+    scores = store.current_scores().set_index('artists')
+    for artist, (frequency, rank_sum) in _brute_force_totals(pd.concat(days)).items():
+        assert scores.loc[artist, 'frequency'] == frequency
+        assert np.isclose(scores.loc[artist, 'rank_sum'], rank_sum)
+    assert list(store.current_scores()['rank']) == sorted(store.current_scores()['rank'])
+    assert len(store.chart_entries()) == 7
+
+
+def test_snapshots_keep_each_version_as_it_was(tmp_path):
+    store = ArtistStore(str(tmp_path / "store.sqlite"))
+    seen = {}
+    for i in range(HISTORY_VERSIONS + 3):
+        store.publish_chart_entries(_day(f"2025-02-{i + 1:02d}", ['A', 'B'] if i % 2 else ['B', 'C']), f"h{i}")
+        seen[store.data_version()] = store.current_scores()
+    current = store.data_version()
+
+    def same_rows(snapshot, scores):
+        by_artist = lambda df: df.sort_values('artists').reset_index(drop=True)
+        pd.testing.assert_frame_equal(by_artist(snapshot), by_artist(scores[snapshot.columns]))
+
+    # Version v is archived when v + 1 is published
+    same_rows(store.score_snapshot(), seen[current - 1])
+    for version in range(current - HISTORY_VERSIONS + 1, current):
+        same_rows(store.score_snapshot(version), seen[version])
+    assert store.score_snapshot(current - HISTORY_VERSIONS - 1).empty
+
+
+def test_unchanged_scores_file_is_not_reloaded(tmp_path):
+    store = ArtistStore(str(tmp_path / "store.sqlite"))
+    path = tmp_path / "artist_scores.csv"
+    pd.DataFrame({'artists': ['A', 'B'], 'frequency': [2, 1], 'rank_sum': [1.5, 0.5], 'ranking_score': [3.25, 1.25],
+                  'rank': [1, 2], 'rank_sum_normalized': [1.0, 0.0],
+                  'frequency_normalized': [1.0, 0.0]}).to_csv(path, index=False)
+    assert store.sync_scores(str(path))
+    assert not store.sync_scores(str(path))
+    assert store.data_version() == 1
+    assert store.artist_names() == ['A', 'B']
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from audience_overlap import AudienceSketches, hash_ids
+
+
+def test_integer_float_and_text_ids_hash_alike():
+    ints = np.array([12345, 67890, 0, 10 ** 15], dtype=np.int64)
+    expected = hash_ids(ints)
+    assert np.array_equal(hash_ids(ints.astype(np.float64)), expected)
+    assert np.array_equal(hash_ids(np.array(['12345', '67890', '0', str(10 ** 15)], dtype=object)), expected)
+    assert np.array_equal(hash_ids(np.array(['12345.0', '67890.0', '0.0', f'{10 ** 15}.0'], dtype=object)), expected)
+
+
+def test_non_integral_and_text_ids_do_not_collide_with_integers():
+    hashes = hash_ids(np.array([12345.5, 12345.0]))
+    assert hashes[0] != hashes[1]
+    assert hash_ids(np.array(['abc'], dtype=object))[0] != hash_ids(np.array([12345]))[0]
+
+
+def test_float_chunk_matches_integer_chunk_in_signatures():
+    # A chunk read as float64 (e.g. after dropping a missing ID) must not count its listeners again
+    artists = np.array(['A'] * 3 + ['B'] * 3, dtype=object)
+    ids = np.array([1, 2, 3, 2, 3, 4])
+    from_ints = AudienceSketches(num_perm=64).update(artists, ids)
+    from_floats = AudienceSketches(num_perm=64).update(artists, ids.astype(float))
+    assert np.array_equal(from_ints.signatures, from_floats.signatures)
+    merged = AudienceSketches(num_perm=64).update(artists, ids).merge(from_floats)
+    assert np.array_equal(merged.signatures, from_ints.signatures)
+
+
+def test_jaccard_estimate_close_to_exact():
+    rng = np.random.default_rng(0)
+    a, b = set(range(0, 6000)), set(range(3000, 9000))
+    rows = pd.DataFrame({'artist': ['A'] * len(a) + ['B'] * len(b), 'listener_id': list(a) + list(b)})
+    rows = rows.iloc[rng.permutation(len(rows))]
+    sketches = AudienceSketches(num_perm=256).update(rows['artist'].to_numpy(), rows['listener_id'].to_numpy())
+    exact = len(a & b) / len(a | b)
+    assert abs(sketches.jaccard('A', 'B') - exact) < 4 * np.sqrt(exact * (1 - exact) / 256)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from bootstrap import _ranks, bootstrap_scores
+
+
+def _chart_entries(n_days=30, n_artists=40, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = [(f"2025-01-{day + 1:02d}", f"Artist {artist}", position + 1)
+            for day in range(n_days)
+            for position, artist in enumerate(rng.permutation(n_artists)[:20])]
+    return pd.DataFrame(rows, columns=['date', 'artists', 'position'])
+
+
+def test_ranks_match_pairwise_comparison_with_ties():
+    rng = np.random.default_rng(1)
+    scores = rng.integers(0, 10, (25, 200)).astype(float)
+    target_scores = scores[:, rng.choice(200, 8, replace=False)]
+    expected = 1 + (scores[:, :, None] > target_scores[:, None, :]).sum(axis=1)
+    assert np.array_equal(_ranks(scores, target_scores), expected)
+
+
+def test_intervals_contain_observed_scores_and_are_reproducible():
+    entries = _chart_entries()
+    summary, lead = bootstrap_scores(entries, n_resamples=300, top_n=5, seed=3)
+    again, _ = bootstrap_scores(entries, n_resamples=300, top_n=5, seed=3)
+    pd.testing.assert_frame_equal(summary, again)
+    assert (summary['score_low'] <= summary['ranking_score']).all()
+    assert (summary['ranking_score'] <= summary['score_high']).all()
+    assert (summary['rank_low'] <= summary['rank_high']).all()
+    assert lead['leader'] == summary['artists'].iloc[0]
+
+
+def test_worker_count_does_not_change_results():
+    entries = _chart_entries(seed=4)
+    serial, _ = bootstrap_scores(entries, n_resamples=250, top_n=4, max_workers=1)
+    pooled, _ = bootstrap_scores(entries, n_resamples=250, top_n=4, max_workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
@@ -0,0 +1,44 @@
+import os
+import time
+
+import pandas as pd
+
+from artist_store import ArtistStore
+from chart_ingest import ChartIngestWorker
+
+
+def _touch_later(path, seconds):
+    later = time.time() + seconds
+    os.utime(path, (later, later))
+
+
+def test_file_still_being_written_is_ingested_once_complete(tmp_path):
+    store = ArtistStore(str(tmp_path / "store.sqlite"))
+    worker = ChartIngestWorker(store, str(tmp_path / "incoming"), poll_seconds=0)
+    path = tmp_path / "incoming" / "2025-01-01.csv"
+    rows = [f"2025-01-01,{position},Artist {position}" for position in range(1, 11)]
+
+    path.write_text("date,position,artists\n" + "\n".join(rows[:4]) + "\n")
+    assert worker.scan() == []
+    # The writer appends the rest before the next poll
+    with open(path, "a") as handle:
+        handle.write("\n".join(rows[4:]) + "\n")
+    _touch_later(path, 1)
+    assert worker.scan() == []
+    assert worker.scan() == [1]
+
+    scores = store.current_scores()
+    assert len(scores) == 10 and (scores['frequency'] == 1).all()
+    assert os.path.exists(tmp_path / "incoming" / "processed" / "2025-01-01.csv")
+
+
+def test_dotfiles_are_ignored_until_renamed(tmp_path):
+    store = ArtistStore(str(tmp_path / "store.sqlite"))
+    worker = ChartIngestWorker(store, str(tmp_path / "incoming"), poll_seconds=0)
+    partial = tmp_path / "incoming" / ".snapshot.csv"
+    pd.DataFrame({'artists': ['A', 'B'], 'frequency': [3, 1], 'rank_sum': [2.0, 5.0]}).to_csv(partial, index=False)
+    assert worker.scan() == [] and worker.scan() == []
+    os.rename(partial, tmp_path / "incoming" / "snapshot.csv")
+    assert worker.scan() == []
+    assert worker.scan() == [1]
+    assert sorted(store.current_scores()['artists']) == ['A', 'B']
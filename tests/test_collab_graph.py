@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from collab_graph import CollaborationGraph
+
+
+def _edges(n_artists=25, n_edges=70, seed=0):
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(0, n_artists, (n_edges, 2))
+    edges = pd.DataFrame({'headliner': [f"Artist {i}" for i in pairs[:, 0]],
+                          'artist': [f"Artist {j}" for j in pairs[:, 1]],
+                          'appearances': rng.integers(1, 6, n_edges)})
+    # A self-billing leaves this artist without edges, so PageRank has a dangling node
+    return pd.concat([edges, pd.DataFrame({'headliner': ['Loner'], 'artist': ['Loner'], 'appearances': [3]})],
+                     ignore_index=True)
+
+
+def _dense_adjacency(graph, edges):
+    dense = np.zeros((len(graph), len(graph)))
+    ids = {name: i for i, name in enumerate(graph.artists)}
+    for headliner, artist, appearances in edges.itertuples(index=False):
+        if headliner != artist:
+            dense[ids[headliner], ids[artist]] += appearances
+            dense[ids[artist], ids[headliner]] += appearances
+    return dense
+
+
+def test_pagerank_matches_a_dense_power_iteration():
+    edges = _edges()
+    graph = CollaborationGraph(edges)
+    dense = _dense_adjacency(graph, edges)
+    n = len(dense)
+    degree = dense.sum(axis=1)
+    # Dangling rows jump uniformly, every row teleports with probability 1 - damping
+    transition = np.where(degree[:, None] > 0, dense / np.maximum(degree, 1)[:, None], 1.0 / n)
+    google = 0.85 * transition + 0.15 / n
+    rank = np.full(n, 1.0 / n)
+    for _ in range(1000):
+        rank = rank @ google
+    assert np.isclose(graph.pagerank().sum(), 1.0)
+    assert np.allclose(graph.pagerank(), rank, atol=1e-9)
+    assert np.allclose(graph.degree, degree)
+
+
+def test_recommendations_are_unbilled_two_hop_neighbours():
+    edges = _edges(seed=1)
+    graph = CollaborationGraph(edges)
+    dense = _dense_adjacency(graph, edges)
+    degree = dense.sum(axis=1)
+    transition = dense / np.maximum(degree, 1)[:, None]
+    two_hop = transition @ transition
+    for i in range(5):
+        artist = graph.artists[i]
+        scores = two_hop[i].copy()
+        scores[i] = 0
+        scores[dense[i] > 0] = 0
+        found = graph.recommendations(artist, n=5)
+        expected = np.sort(scores[scores > 0])[::-1][:5]
+        assert np.allclose(found['two_hop_score'], expected)
+        assert not set(found['artist']) & (set(graph.billed_with(artist)['artist']) | {artist})
+
+
+def test_repeated_pairs_are_summed_in_both_directions():
+    edges = pd.DataFrame({'headliner': ['A', 'B', 'A'], 'artist': ['B', 'A', 'C'], 'appearances': [2, 3, 1]})
+    graph = CollaborationGraph(edges)
+    billed = graph.billed_with('A')
+    assert list(billed['artist']) == ['B', 'C'] and list(billed['appearances']) == [5, 1]
+    assert graph.billed_with('B')['appearances'].tolist() == [5]
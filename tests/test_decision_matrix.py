@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from decision_matrix import DECISION_CRITERIA, build_decision_matrix
+
+
+class _NoGenres:
+    def target_match(self, artists):
+        return np.zeros(len(artists))
+
+
+def test_live_scores_replace_the_recorded_ones():
+    scores = pd.DataFrame({'artists': ['Zach Bryan', 'Taylor Swift'], 'ranking_score': [900.0, 100.0]})
+    matrix = build_decision_matrix(_NoGenres(), method='min_max', scores=scores)
+    # Zach Bryan now has the best chart score and Taylor Swift the worst
+    ranking = matrix.set_index('Artist')['Ranking_Score']
+    assert ranking['Zach Bryan'] == 100 and ranking['Taylor Swift'] == 0
+
+
+def test_unscored_candidates_keep_the_recorded_score():
+    scores = pd.DataFrame({'artists': ['Someone Else'], 'ranking_score': [1.0]})
+    live = build_decision_matrix(_NoGenres(), scores=scores)
+    recorded = build_decision_matrix(_NoGenres())
+    pd.testing.assert_frame_equal(live, recorded)
+    assert list(live['Artist']) == DECISION_CRITERIA['Artist']
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from distinct_counts import SegmentCounts, estimate
+
+
+def _events(n_attendees, n_events, seed=0):
+    rng = np.random.default_rng(seed)
+    attendees = rng.integers(10 ** 6, 10 ** 9, n_attendees)
+    picks = rng.integers(0, n_attendees, n_events)
+    return pd.DataFrame({
+        'attendee_id': attendees[picks],
+        'age_group': np.array(['18-24', '25-34', '35-44'])[picks % 3],
+        'campus': np.array(['North', 'South', ''], dtype=object)[picks % 5 % 3],
+        'genre': np.array(['pop', 'rock'])[picks % 2],
+    })
+
+
+def test_estimates_within_a_few_standard_errors():
+    events = _events(50_000, 200_000)
+    counts = SegmentCounts().update(events)
+    error = 4 * counts.relative_error()
+    exact = events['attendee_id'].nunique()
+    assert abs(counts.count() - exact) / exact < error
+    for age_group, group in events.groupby('age_group'):
+        exact = group['attendee_id'].nunique()
+        assert abs(counts.count({'age_group': [age_group]}) - exact) / exact < error
+    # A union of segments is estimated from the register maximum, not by adding counts
+    exact = events.loc[events['age_group'].isin(['18-24', '35-44']), 'attendee_id'].nunique()
+    assert abs(counts.count({'age_group': ['18-24', '35-44']}) - exact) / exact < error
+
+
+def test_blank_values_belong_to_no_segment():
+    counts = SegmentCounts().update(_events(1_000, 5_000))
+    assert sorted(counts.values('campus')) == ['North', 'South']
+
+
+def test_merge_equals_single_pass_and_float_ids_count_once():
+    events = _events(5_000, 20_000, seed=1)
+    whole = SegmentCounts().update(events)
+    floats = events.iloc[10_000:].assign(attendee_id=lambda chunk: chunk['attendee_id'].astype(float))
+    merged = SegmentCounts().update(events.iloc[:10_000]).merge(SegmentCounts().update(floats))
+    assert merged.count() == whole.count()
+    for dimension in ['age_group', 'genre']:
+        for value in whole.values(dimension):
+            assert merged.count({dimension: [value]}) == whole.count({dimension: [value]})
+
+
+def test_small_cardinalities_use_linear_counting():
+    registers = np.zeros(1 << 12, dtype=np.uint8)
+    assert estimate(registers) == 0
+    registers[:10] = 1
+    assert abs(estimate(registers) - 10) < 0.1
+
+
+def test_chunk_without_any_value_in_a_dimension():
+    events = _events(2_000, 6_000, seed=2)
+    missing = events.assign(campus=None, genre=np.nan)
+    counts = SegmentCounts().update(missing)
+    assert counts.values('campus') == [] and counts.values('genre') == []
+    assert counts.count() == SegmentCounts().update(events).count()
+    # A later chunk with values still fills the segments
+    counts.update(events.iloc[:100])
+    assert sorted(counts.values('campus')) == ['North', 'South']
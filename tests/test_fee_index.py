@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from fee_index import FeeIndex
+
+GENRES = ['pop', 'rock', 'country', 'indie']
+
+
+def _artists(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    minimum = rng.integers(1, 100, n) * 1_000
+    return pd.DataFrame({
+        'artist': [f"Artist {i}" for i in range(n)],
+        'minimum_fee': minimum,
+        'maximum_fee': minimum + rng.integers(0, 50, n) * 1_000,
+        'genres': [list(rng.choice(GENRES, rng.integers(1, 3), replace=False)) for _ in range(n)],
+    })
+
+
+def test_overlaps_match_brute_force():
+    artists = _artists()
+    index = FeeIndex(artists)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        low, high = np.sort(rng.integers(0, 160, 2) * 1_000)
+        expected = artists[(artists['minimum_fee'] <= high) & (artists['maximum_fee'] >= low)]
+        found = index.overlapping(low, high)
+        assert index.overlap_count(low, high) == len(expected)
+        assert sorted(found['artist']) == sorted(expected['artist'])
+        assert found['minimum_fee'].is_monotonic_increasing
+        genre = GENRES[rng.integers(len(GENRES))]
+        in_genre = expected[expected['genres'].map(lambda genres: genre in genres).astype(bool)]
+        assert sorted(index.overlapping(low, high, genre)['artist']) == sorted(in_genre['artist'])
+
+
+def test_touching_endpoints_overlap():
+    index = FeeIndex(pd.DataFrame({'artist': ['A', 'B'], 'minimum_fee': [10, 30], 'maximum_fee': [20, 40],
+                                   'genres': [['pop'], ['rock']]}))
+    assert index.overlap_count(20, 30) == 2
+    assert index.overlap_count(21, 29) == 0
+
+
+def test_cheapest_within_budget_by_genre():
+    artists = _artists()
+    index = FeeIndex(artists)
+    for genre in [None, 'rock']:
+        pool = artists if genre is None else artists[artists['genres'].map(lambda genres: genre in genres)]
+        expected = pool[pool['minimum_fee'] <= 30_000].sort_values('minimum_fee', kind='stable').head(10)
+        assert list(index.cheapest(30_000, 10, genre)['artist']) == list(expected['artist'])
+    assert index.cheapest(30_000, 10, 'polka').empty
+
+
+def test_unknown_genre_overlaps_nothing():
+    index = FeeIndex(_artists())
+    assert index.overlapping(0, 10 ** 9, 'polka').empty
+    assert len(index.overlapping(0, 10 ** 9)) == len(index)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from graph_layout import _exact_repulsion, _grid_repulsion, force_layout
+
+
+def _relative_error(approx, exact):
+    return np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+
+
+def test_quadtree_repulsion_matches_exact_on_uniform_layout():
+    positions = np.random.default_rng(0).uniform(-1, 1, (3000, 2))
+    error = _relative_error(_grid_repulsion(positions, 4.0 / 3000), _exact_repulsion(positions, 4.0 / 3000))
+    assert np.median(error) < 0.01
+    assert np.percentile(error, 95) < 0.05
+
+
+def test_quadtree_repulsion_matches_exact_on_clustered_layout():
+    rng = np.random.default_rng(1)
+    centers = rng.uniform(-1, 1, (20, 2))
+    positions = centers[rng.integers(0, 20, 3000)] + rng.normal(0, 0.05, (3000, 2))
+    error = _relative_error(_grid_repulsion(positions, 4.0 / 3000), _exact_repulsion(positions, 4.0 / 3000))
+    assert np.median(error) < 0.02
+    assert np.percentile(error, 95) < 0.1
+
+
+def test_force_layout_is_finite_and_scaled():
+    rng = np.random.default_rng(2)
+    source = np.repeat(np.arange(1200), 2)
+    target = rng.integers(0, 1200, len(source))
+    keep = source != target
+    positions = force_layout(1200, source[keep], target[keep], iterations=20)
+    assert positions.shape == (1200, 2)
+    assert np.isfinite(positions).all()
+    assert np.isclose(np.abs(positions).max(), 1.0)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from leaderboard import LeaderboardPager
+
+
+def _scores():
+    return pd.DataFrame({
+        'artists': ['a', 'b', 'c', 'd', 'e', 'f'],
+        'rank': [1, 2, 3, 4, 5, 6],
+        'ranking_score': [0.9, 0.5, 0.9, 0.1, 0.5, 0.9],
+        'frequency': [3, 3, 3, 3, 3, 3],
+    })
+
+
+def test_descending_keeps_ties_in_row_order():
+    rows, count = LeaderboardPager(_scores()).page(0, 10, sort_by='ranking_score', ascending=False)
+    assert count == 6
+    assert list(rows['artists']) == ['a', 'c', 'f', 'b', 'e', 'd']
+
+
+def test_descending_string_column():
+    rows, _ = LeaderboardPager(_scores()).page(0, 10, sort_by='artists', ascending=False)
+    assert list(rows['artists']) == ['f', 'e', 'd', 'c', 'b', 'a']
+
+
+def test_descending_filter_on_sort_column_is_stable():
+    rows, count = LeaderboardPager(_scores()).page(0, 10, sort_by='ranking_score', ascending=False,
+                                                   filter_column='ranking_score', low=0.5, high=1.0)
+    assert count == 5
+    assert list(rows['artists']) == ['a', 'c', 'f', 'b', 'e']
+
+
+def test_constant_column_filter_keeps_every_row():
+    pager = LeaderboardPager(_scores())
+    low, high = pager.value_range('frequency')
+    assert low == high == 3
+    rows, count = pager.page(0, 10, sort_by='rank', filter_column='frequency', low=low, high=high)
+    assert count == 6
+    assert list(rows['rank']) == [1, 2, 3, 4, 5, 6]
+
+
+def test_pages_cover_the_filtered_rows_once():
+    rng = np.random.default_rng(0)
+    scores = pd.DataFrame({'artists': [f"artist {i}" for i in range(103)], 'rank': np.arange(1, 104),
+                           'ranking_score': rng.integers(0, 10, 103) / 10})
+    pager = LeaderboardPager(scores)
+    seen = []
+    for page in range(5):
+        rows, count = pager.page(page, 25, sort_by='ranking_score', ascending=False,
+                                 filter_column='rank', low=10, high=90)
+        seen.extend(rows['rank'])
+    assert count == 81 and sorted(seen) == list(range(10, 91))
+    expected = scores[scores['rank'].between(10, 90)].sort_values('ranking_score', ascending=False, kind='stable')
+    assert seen == list(expected['rank'])
+
+
+def test_missing_values_sort_last_both_ways_and_stay_out_of_ranges():
+    scores = _scores()
+    scores['ranking_score'] = [0.9, np.nan, 0.2, np.nan, 0.5, 0.9]
+    pager = LeaderboardPager(scores)
+    rows, _ = pager.page(0, 10, sort_by='ranking_score', ascending=False)
+    assert list(rows['artists']) == ['a', 'f', 'e', 'c', 'b', 'd']
+    rows, _ = pager.page(0, 10, sort_by='ranking_score', ascending=True)
+    assert list(rows['artists']) == ['c', 'e', 'a', 'f', 'b', 'd']
+    assert pager.value_range('ranking_score') == (0.2, 0.9)
+    rows, count = pager.page(0, 10, sort_by='rank', filter_column='ranking_score', low=0.2, high=0.9)
+    assert count == 4 and list(rows['artists']) == ['a', 'c', 'e', 'f']
+
+
+def test_all_missing_column_has_no_range():
+    scores = _scores()
+    scores['ranking_score'] = np.nan
+    assert LeaderboardPager(scores).value_range('ranking_score') == (None, None)
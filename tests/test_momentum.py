@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from momentum import MomentumIndex
+from scoring import position_weight
+
+
+def _entries(n_days=90, n_artists=30, per_day=10, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=n_days)
+    # A few missing days, as in the real history
+    dates = dates[rng.random(n_days) > 0.1]
+    return pd.concat([
+        pd.DataFrame({'date': date.strftime('%Y-%m-%d'),
+                      'artists': [f"Artist {i}" for i in rng.choice(n_artists, per_day, replace=False)],
+                      'position': np.arange(1, per_day + 1)})
+        for date in dates
+    ], ignore_index=True)
+
+
+def _groupby_window(entries, end_date, days):
+    dates = pd.to_datetime(entries['date'])
+    end_date = pd.Timestamp(end_date)
+    # The window holds the `days` days ending at end_date; None means all history up to it
+    keep = dates <= end_date
+    if days is not None:
+        keep &= dates > end_date - pd.Timedelta(days=days)
+    inside = entries[keep]
+    return (inside.assign(rank_sum=position_weight(inside['position']))
+            .groupby('artists').agg(frequency=('position', 'size'), rank_sum=('rank_sum', 'sum')))
+
+
+def test_window_sums_match_a_direct_groupby():
+    entries = _entries()
+    index = MomentumIndex.from_entries(entries)
+    for end_date, days in [('2025-02-15', 30), ('2025-03-31', 7), ('2025-01-03', 30), ('2025-02-01', None),
+                           ('2026-01-01', 14)]:
+        window = index.window(end_date, days).set_index('artists').sort_index()
+        expected = _groupby_window(entries, end_date, days).sort_index()
+        assert list(window.index) == list(expected.index)
+        assert np.array_equal(window['frequency'], expected['frequency'])
+        assert np.allclose(window['rank_sum'], expected['rank_sum'])
+
+
+def test_artist_window_matches_the_leaderboard_row():
+    entries = _entries(seed=1)
+    index = MomentumIndex.from_entries(entries)
+    window = index.window('2025-03-01', 21).set_index('artists')
+    for artist in window.index[:5]:
+        frequency, rank_sum = index.artist_window(artist, '2025-03-01', 21)
+        assert frequency == window.loc[artist, 'frequency']
+        assert np.isclose(rank_sum, window.loc[artist, 'rank_sum'])
+
+
+def test_momentum_compares_with_the_preceding_window():
+    entries = _entries(seed=2)
+    index = MomentumIndex.from_entries(entries)
+    momentum = index.momentum('2025-03-15', 30).set_index('artists')
+    previous = index.window('2025-02-13', 30).set_index('artists')['ranking_score']
+    expected = momentum['ranking_score'] - previous.reindex(momentum.index).fillna(0.0)
+    assert np.allclose(momentum['score_change'], expected)
+
+
+def test_empty_history_has_no_index():
+    assert MomentumIndex.from_entries(_entries().iloc[:0]) is None
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from normalization import ColumnStats, ScoreNormalizer
+
+QUANTILES = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+
+def test_quantiles_match_numpy_while_exact():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 500, 3000).astype(float)
+    stats = ColumnStats(max_bins=4096)
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    for q in QUANTILES:
+        assert np.isclose(stats.quantile(q), np.quantile(values, q))
+    assert np.allclose(stats.percentile_of([-1, 0, 250, 499]),
+                       [np.mean(values <= x) for x in [-1, 0, 250, 499]])
+
+
+def test_merged_stats_equal_one_pass_and_ignore_missing():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=2000)
+    values[::50] = np.nan
+    whole = ColumnStats().update(values)
+    merged = ColumnStats().update(values[:700]).merge(ColumnStats().update(values[700:]))
+    assert whole.count == merged.count == np.count_nonzero(~np.isnan(values))
+    for q in QUANTILES:
+        assert np.isclose(whole.quantile(q), merged.quantile(q))
+        assert np.isclose(whole.quantile(q), np.nanquantile(values, q))
+
+
+def test_compressed_quantiles_stay_close():
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(size=50_000)
+    stats = ColumnStats(max_bins=256)
+    for chunk in np.array_split(values, 10):
+        stats.update(chunk)
+    assert len(stats.values) <= 256
+    assert stats.min == values.min() and stats.max == values.max()
+    # Merged bins shift a quantile by at most about one bin's share of the sample
+    for q in [0.1, 0.25, 0.5, 0.75, 0.9]:
+        assert abs(np.mean(values <= stats.quantile(q)) - q) < 2 / 256
+
+
+def test_normalized_columns_stay_in_unit_interval():
+    scores = pd.DataFrame({'ranking_score': np.linspace(0, 100, 201)})
+    normalizer = ScoreNormalizer.fit([scores.iloc[:100], scores.iloc[100:]], ['ranking_score'])
+    for method in ['min_max', 'rank_percentile', 'robust']:
+        normalized = normalizer.normalize('ranking_score', scores['ranking_score'], method)
+        assert np.all((normalized >= 0) & (normalized <= 1))
+        assert np.all(np.diff(normalized) >= 0)
+    assert np.allclose(normalizer.normalize('ranking_score', scores['ranking_score']), scores['ranking_score'] / 100)
@@ -0,0 +1,112 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from result_cache import ResultCache, disk_cached
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "results.sqlite"), lease_seconds=0.3, poll_interval=0.01)
+
+
+def test_expired_lease_of_a_dead_owner_is_taken_over(cache):
+    # A process that took the lease and died must not block the entry for good
+    assert cache._try_lease("key", "dead-owner")
+    assert not cache._try_lease("key", "someone-else")
+    time.sleep(0.35)
+    assert cache.get_or_compute("key", lambda: 42) == 42
+    assert cache.get("key") == (True, 42)
+
+
+def test_waiter_reads_the_value_stored_by_the_lease_holder(cache):
+    assert cache._try_lease("key", "holder")
+    timer = threading.Timer(0.1, lambda: cache.set("key", "computed elsewhere"))
+    timer.start()
+
+    def compute():
+        raise AssertionError("the waiter should not compute")
+
+    assert cache.get_or_compute("key", compute) == "computed elsewhere"
+    timer.join()
+
+
+def test_compute_runs_once_then_hits(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'rows': [1, 2, 3]}
+
+    assert cache.get_or_compute("key", compute) == {'rows': [1, 2, 3]}
+    assert cache.get_or_compute("key", compute) == {'rows': [1, 2, 3]}
+    assert len(calls) == 1
+
+
+def test_prune_drops_old_entries_then_the_oldest_beyond_the_size_budget(cache):
+    for i in range(5):
+        cache.set(f"key{i}", b"x" * 1000)
+    conn = cache._connection()
+    conn.execute("UPDATE results SET created = created - 100 WHERE key = 'key0'")
+    assert cache.prune(max_age=50) == 1
+    assert not cache.get("key0")[0]
+    # Each pickled value is a little over 1000 bytes, so 2500 bytes keeps the two newest
+    conn.execute("UPDATE results SET created = CAST(SUBSTR(key, 4) AS REAL)")
+    assert cache.prune(max_bytes=2500, max_age=time.time()) == 2
+    assert [cache.get(f"key{i}")[0] for i in range(1, 5)] == [False, False, True, True]
+
+
+def test_disk_cached_recomputes_when_a_data_file_changes(cache, tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n")
+    calls = []
+
+    @disk_cached(data_files=[str(path)], cache=cache)
+    def total(scale):
+        calls.append(scale)
+        return scale * sum(int(line) for line in path.read_text().split()[1:])
+
+    assert total(2) == 2 and total(2) == 2
+    path.write_text("a\n1\n2\n")
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert total(2) == 6
+    assert calls == [2, 2]
+
+
+def _load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_changed_code_or_version_misses_old_entries(cache, tmp_path):
+    (tmp_path / "helper_scale.py").write_text("FACTOR = 2\n")
+    source = tmp_path / "cached_job.py"
+    source.write_text("from helper_scale import FACTOR\n\ndef job(x):\n    return x * FACTOR\n")
+    sys.path.insert(0, str(tmp_path))
+    try:
+        module = _load_module(source, "cached_job")
+        assert disk_cached(cache=cache)(module.job)(3) == 6
+        # A helper module edited on deploy changes the key even though the cached function did not change
+        (tmp_path / "helper_scale.py").write_text("FACTOR = 10\n")
+        os.utime(tmp_path / "helper_scale.py", (time.time() + 5, time.time() + 5))
+        _load_module(tmp_path / "helper_scale.py", "helper_scale")
+        module = _load_module(source, "cached_job")
+        assert disk_cached(cache=cache)(module.job)(3) == 30
+        # Same code, different explicit version
+        calls = []
+        module.job = lambda x, job=module.job: calls.append(x) or job(x)
+        assert disk_cached(cache=cache, version=1)(module.job)(3) == 30
+        assert disk_cached(cache=cache, version=2)(module.job)(3) == 30
+        assert disk_cached(cache=cache, version=2)(module.job)(3) == 30
+        assert calls == [3, 3]
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("cached_job", None)
+        sys.modules.pop("helper_scale", None)
@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from setlist import DURATION_UNIT, order_songs, path_cost, plan_set, select_songs
+
+
+def _songs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'song': [f"Song {i}" for i in range(n)],
+        'duration_sec': rng.integers(150, 330, n),
+        'streams': rng.integers(1_000, 5_000_000, n),
+        'tempo': rng.uniform(70, 170, n),
+        'energy': rng.uniform(0, 1, n),
+        'valence': rng.uniform(0, 1, n),
+    })
+
+
+def test_knapsack_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        durations = rng.integers(1, 12, 10) * DURATION_UNIT
+        values = rng.uniform(0, 1, 10)
+        max_seconds = int(rng.integers(10, 40)) * DURATION_UNIT
+        chosen = select_songs(durations, values, max_seconds)
+        assert durations[chosen].sum() <= max_seconds
+        best = max(values[list(subset)].sum()
+                   for size in range(11) for subset in itertools.combinations(range(10), size)
+                   if durations[list(subset)].sum() <= max_seconds)
+        assert np.isclose(values[chosen].sum(), best)
+
+
+def test_two_opt_leaves_no_improving_reversal():
+    rng = np.random.default_rng(4)
+    n = 25
+    points = rng.uniform(0, 1, (n, 2))
+    distances = np.abs(points[:, None] - points[None]).sum(axis=2)
+    pop = rng.uniform(0, 1, n)
+    order = order_songs(distances, pop, hit_weight=1.0)
+    assert sorted(order) == list(range(n))
+    cost = path_cost(order, distances, pop, 1.0)
+    for i in range(n):
+        for j in range(i + 1, n):
+            reversed_order = order.copy()
+            reversed_order[i:j + 1] = reversed_order[i:j + 1][::-1]
+            assert path_cost(reversed_order, distances, pop, 1.0) >= cost - 1e-9
+
+
+def test_planned_set_fits_and_runs_back_to_back():
+    songs = _songs(60)
+    planned = plan_set(songs, 45)
+    assert planned['duration_sec'].sum() <= 45 * 60
+    assert planned['song'].is_unique and set(planned['song']) <= set(songs['song'])
+    assert np.array_equal(planned['start_sec'].to_numpy()[1:], planned['duration_sec'].cumsum().to_numpy()[:-1])
+
+
+def test_set_too_short_for_any_song_is_empty():
+    assert plan_set(_songs(5), 1).empty
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from snapshot_diff import diff_snapshots, summarize, top_movers
+
+
+def _snapshot(rows):
+    return pd.DataFrame(rows, columns=['artists', 'rank', 'ranking_score'])
+
+
+OLD = _snapshot([('A', 1, 10.0), ('B', 2, 8.0), ('C', 3, 6.0), ('D', 4, 4.0), ('E', 5, 2.0)])
+NEW = _snapshot([('C', 1, 12.0), ('A', 2, 9.0), ('B', 3, 7.0), ('F', 4, 5.0), ('E', 5, 2.0)])
+
+
+def test_hand_built_pair_is_classified():
+    diff = diff_snapshots(OLD, NEW).set_index('artists')
+    assert diff['status'].to_dict() == {'C': 'up', 'A': 'down', 'B': 'down', 'F': 'new', 'E': 'unchanged',
+                                        'D': 'dropped'}
+    assert diff.loc['C', 'rank_delta'] == 2 and diff.loc['B', 'rank_delta'] == -1
+    assert np.isnan(diff.loc['F', 'old_rank']) and np.isnan(diff.loc['D', 'new_rank'])
+    assert diff.loc['F', 'score_delta'] == 5.0 and diff.loc['D', 'score_delta'] == -4.0
+    assert summarize(diff_snapshots(OLD, NEW)) == {'unchanged': 1, 'new': 1, 'dropped': 1, 'up': 1, 'down': 2}
+
+
+def test_current_rank_first_and_dropped_artists_last():
+    diff = diff_snapshots(OLD, NEW)
+    assert list(diff['artists']) == ['C', 'A', 'B', 'F', 'E', 'D']
+
+
+def test_random_snapshots_match_a_brute_force_join():
+    rng = np.random.default_rng(0)
+    names = [f"Artist {i}" for i in range(60)]
+    old_names, new_names = rng.choice(names, 40, replace=False), rng.choice(names, 45, replace=False)
+    old = _snapshot([(name, rank, float(100 - rank)) for rank, name in enumerate(old_names, 1)])
+    new = _snapshot([(name, rank, float(100 - rank)) for rank, name in enumerate(new_names, 1)])
+    diff = diff_snapshots(old, new).set_index('artists')
+    old_rank, new_rank = dict(zip(old['artists'], old['rank'])), dict(zip(new['artists'], new['rank']))
+    for name in set(old_names) | set(new_names):
+        if name not in old_rank:
+            expected = 'new'
+        elif name not in new_rank:
+            expected = 'dropped'
+        else:
+            delta = old_rank[name] - new_rank[name]
+            expected = 'up' if delta > 0 else 'down' if delta < 0 else 'unchanged'
+        assert diff.loc[name, 'status'] == expected
+
+    movers = top_movers(diff_snapshots(old, new), n=5)
+    moved = [abs(old_rank[name] - new_rank[name]) for name in old_rank if name in new_rank
+             and old_rank[name] != new_rank[name]]
+    assert sorted(np.abs(movers['rank_delta']), reverse=True) == sorted(moved, reverse=True)[:5]
+    assert set(movers['status']) <= {'up', 'down'}
+    within = top_movers(diff_snapshots(old, new), n=50, within_rank=10)
+    assert ((within['new_rank'] <= 10) | (within['old_rank'] <= 10)).all()
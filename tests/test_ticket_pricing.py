@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from ticket_pricing import (REFERENCE_PRICES, SEATING_TIERS, _market_shocks, _tier_revenue, fit_demand_curve,
+                            optimize_tier_prices, price_lineups)
+
+AGE_GROUPS = ['13-17', '18-24', '25-34', '35-44', '45-54', '55+']
+
+
+def test_fit_recovers_constant_elasticity_curve():
+    prices = np.geomspace(50, 500, 20)
+    scale, elasticity = fit_demand_curve(prices, 4000 * (prices / 150) ** -1.7, 150)
+    assert np.isclose(scale, 4000)
+    assert np.isclose(elasticity, 1.7)
+
+
+def test_tier_revenue_matches_average_over_draws():
+    shocks = _market_shocks(0, 500, 0.35)
+    prices = np.array([[[100.0, 250.0, 600.0]]])
+    q_ref, elasticity, seats = np.array([[3000.0]]), np.array([[1.5]]), np.array([3356.0])
+    sold, sellout, revenue = _tier_revenue(prices, np.array([250.0]), q_ref, elasticity, seats, shocks)
+    demand = 3000.0 * (prices[0, 0] / 250.0) ** -1.5
+    shocked = demand[:, None] * shocks[0][None, :]
+    assert np.allclose(sold[0, 0], np.minimum(shocked, 3356.0).mean(axis=1))
+    assert np.allclose(sellout[0, 0], (shocked >= 3356.0).mean(axis=1))
+    assert np.allclose(revenue, prices * sold)
+
+
+def test_optimizer_matches_fine_brute_force_grid():
+    q_ref = np.array([[2500.0, 7000.0, 9000.0]])
+    elasticity = np.array([[1.8, 1.6, 1.5]])
+    prices, sold, _, revenue, seats = optimize_tier_prices(q_ref, elasticity)
+    assert (sold <= seats + 1e-9).all()
+    assert prices[0, 0] >= prices[0, 1] >= prices[0, 2]
+
+    grid = np.geomspace(30, 900, 300)
+    reference = np.array(list(REFERENCE_PRICES.values()))
+    _, _, grid_revenue = _tier_revenue(np.broadcast_to(grid, (1, 3, 300)), reference, q_ref, elasticity, seats,
+                                       _market_shocks(0, 2000, 0.35))
+    r = grid_revenue[0]
+    total = r[0][:, None, None] + r[1][None, :, None] + r[2][None, None, :]
+    ordered = (grid[:, None, None] >= grid[None, :, None]) & (grid[None, :, None] >= grid[None, None, :])
+    assert revenue.sum() >= np.where(ordered, total, -np.inf).max() * (1 - 1e-4)
+
+
+def test_net_margin_uses_lineup_fees_and_unknown_fees_stay_unknown():
+    music_prefs = pd.DataFrame({'Age_Group': AGE_GROUPS})
+    expected = np.full((2, len(AGE_GROUPS)), 2500.0)
+    fees = pd.DataFrame({'minimum_fee': [500000.0, 150000.0], 'maximum_fee': [600000.0, 150000.0]},
+                        index=['Headliner', 'Support'])
+    summary, tiers = price_lineups({'Known': ['Headliner', 'Support'], 'Unknown': ['Headliner', 'Mystery']},
+                                   expected, music_prefs, fees)
+    known = summary.set_index('lineup').loc['Known']
+    assert np.isclose(known['net_margin_high'], known['expected_revenue'] - 650000)
+    assert np.isclose(known['net_margin_low'], known['expected_revenue'] - 750000)
+    assert np.isnan(summary.set_index('lineup').loc['Unknown', 'net_margin_low'])
+    assert len(tiers) == 2 * len(SEATING_TIERS)
+    assert (tiers.groupby('lineup')['seats'].sum() <= sum(SEATING_TIERS.values())).all()